@@ -0,0 +1,125 @@
+"""
+Parse many scripts at once across a pool of worker processes.
+
+    python batch.py [--workers N] [--chunksize N] [--grammar PATH]
+                    [--cache DIR] file.sql ...
+
+Each worker builds the grammar once (or loads one saved with
+run.save_grammar) and reuses it for every script it is given.  With a cache
+directory, outcomes are also looked up in and saved to a cache.DiskCache
+there, so unchanged scripts are not parsed again.
+"""
+import argparse
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import run
+from cache import DEFAULT_MAX_BYTES, DiskCache, parse_sql_cached
+
+Outcome = namedtuple('Outcome', ['source', 'result', 'error'])
+Outcome.__doc__ = """
+The parse of one script: source is the path or text it came from, and exactly
+one of result and error is set.  error is a ParseException, a RecursionError
+for a script nested too deeply to parse, or an OSError or UnicodeDecodeError
+reading a file.
+"""
+
+
+_cache = None
+
+
+def init_worker(grammar_path=None, cache_dir=None, cache_max_bytes=DEFAULT_MAX_BYTES):
+    global _cache
+    if cache_dir is not None:
+        _cache = DiskCache(cache_dir, cache_max_bytes)
+    if grammar_path is not None:
+        run.load_grammar(grammar_path)
+    elif _cache is None:
+        run.get_grammar()
+
+
+def parse_text(text):
+    from pyparsing import ParseBaseException
+
+    try:
+        if _cache is None:
+            return run.parse_sql(text), None
+        return parse_sql_cached(text, _cache), None
+    except (ParseBaseException, RecursionError) as error:
+        return None, error
+
+
+def parse_path(path):
+    try:
+        with open(path) as script:
+            text = script.read()
+    except (OSError, ValueError) as error:
+        return None, error
+    return parse_text(text)
+
+
+def parse_in_pool(parse, sources, max_workers, chunksize, worker_args):
+    sources = list(sources)
+    with ProcessPoolExecutor(
+        max_workers, initializer=init_worker, initargs=worker_args
+    ) as pool:
+        outcomes = pool.map(parse, sources, chunksize=chunksize)
+        return [Outcome(source, *outcome) for source, outcome in zip(sources, outcomes)]
+
+
+def parse_files(
+    paths,
+    max_workers=None,
+    chunksize=1,
+    grammar_path=None,
+    cache_dir=None,
+    cache_max_bytes=DEFAULT_MAX_BYTES,
+):
+    """
+    Parse each file, returning an Outcome per path in the order given.
+    max_workers defaults to the number of CPUs; chunksize is how many files
+    are sent to a worker at a time, which is worth raising for many small
+    files.
+    """
+    worker_args = (grammar_path, cache_dir, cache_max_bytes)
+    return parse_in_pool(parse_path, paths, max_workers, chunksize, worker_args)
+
+
+def parse_texts(
+    texts,
+    max_workers=None,
+    chunksize=1,
+    grammar_path=None,
+    cache_dir=None,
+    cache_max_bytes=DEFAULT_MAX_BYTES,
+):
+    """
+    Like parse_files, for scripts already in memory
+    """
+    worker_args = (grammar_path, cache_dir, cache_max_bytes)
+    return parse_in_pool(parse_text, texts, max_workers, chunksize, worker_args)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--chunksize', type=int, default=1)
+    parser.add_argument('--grammar', help='path of a grammar saved by save_grammar')
+    parser.add_argument('--cache', help='directory to cache parse outcomes in')
+    parser.add_argument('files', nargs='+')
+    args = parser.parse_args(argv)
+
+    failed = 0
+    outcomes = parse_files(
+        args.files, args.workers, args.chunksize, args.grammar, args.cache
+    )
+    for outcome in outcomes:
+        if outcome.error is not None:
+            failed += 1
+            print(f'{outcome.source}: {outcome.error}')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,837 @@
+"""
+Rough parser timings.
+
+    python bench.py [--only NAME] [--json PATH] [--baseline PATH]
+                    [--generate [--seed N] [--statements N] [--columns N]
+                                [--depth N] [--calls N]]
+                    [file.sql ...]
+
+SQL files given on the command line are used as the corpus; with --generate,
+a synthetic corpus from corpus.py is; otherwise a small built-in sample is.
+With --json every timing is also written to PATH, and --baseline compares the
+timings against a file written by an earlier run.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+SAMPLE_SQL = """
+select
+    customer_id,
+    current_date as run_date,
+    datediff(day, first_order_at, last_order_at) as customer_age,
+    round(total_spend / 100, 2) as total_spend,
+    coalesce_flag,
+    regexp_replace(email, 'x', 'y', 1, 0, 'i') as cleaned_email,
+    to_decimal(amount, 38, 2) as amount,
+    trunc(created_at, 'day') as created_day,
+    case when 1 = 1 then lifetime_value else 0 end as ltv
+from analytics.core.customers;
+"""
+
+ANALYTICS_SQL = """
+select
+    customer_id,
+    region,
+    round(total_spend / 100, 2) as spend
+from analytics.core.customers
+where signup_date >= '2020-01-01' and region not in ('test', 'internal')
+order by spend desc nulls last, customer_id
+limit 100;
+
+select region, channel, trunc(tenure_days / 365) as tenure_years
+from analytics.core.customers
+where created_at::date > '2021-06-30' or region is null
+group by region, channel, tenure_years
+having tenure_years > 1
+order by region, channel;
+
+select order_id, customer_id, upper(status) || '_' || channel as status_key
+from analytics.core.orders
+where amount > 0
+qualify order_rank = 1
+order by order_id
+offset 50 rows fetch next 50 rows only;
+"""
+
+RESULTS = []
+current_benchmark = None
+
+
+def record(name, **metrics):
+    RESULTS.append(dict(benchmark=current_benchmark, name=name, **metrics))
+
+
+def best_of(func, repeat=5, number=1):
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number
+
+
+def peak_memory(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def retained_memory(func):
+    """
+    Bytes still allocated by func once it returns, i.e. the size of its result
+    """
+    tracemalloc.start()
+    try:
+        result = func()  # noqa: F841, kept alive while measuring
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def report(name, seconds, baseline=None):
+    line = f'{name:<40} {seconds * 1000:10.3f} ms'
+    if baseline:
+        line += f'  ({baseline / seconds:.1f}x)'
+    print(line)
+    record(name, seconds=seconds)
+
+
+def report_throughput(name, seconds, count, size, peak_bytes, unit='statements'):
+    print(
+        f'{name:<40} {count / seconds:10.0f} {unit}/s '
+        f'{size / seconds / 1e6:8.3f} MB/s {peak_bytes / 1e6:8.1f} MB peak'
+    )
+    metrics = {
+        'seconds': seconds,
+        f'{unit}_per_second': count / seconds,
+        'bytes_per_second': size / seconds,
+        'peak_bytes': peak_bytes,
+    }
+    record(name, **metrics)
+
+
+def bench_function_dispatch(sql_texts):
+    from functions import get_function_alternatives, get_function_expression
+    from run import EXPRESSION
+
+    alternatives = get_function_alternatives(EXPRESSION)
+    dispatch = get_function_expression(EXPRESSION)
+
+    def scan(expression):
+        return lambda: [list(expression.scanString(text)) for text in sql_texts]
+
+    def matches(expression):
+        return [(t.asList(), s) for found in scan(expression)() for t, s, _ in found]
+
+    assert matches(alternatives) == matches(dispatch)
+    before = best_of(scan(alternatives))
+    report('function calls: MatchFirst', before)
+    report('function calls: dispatch', best_of(scan(dispatch)), before)
+
+
+def nested_boolean(depth):
+    text = 'x > 1'
+    for level in range(depth):
+        text = f'({text} and (y + {level}) * z < w)'
+    return f'select {text} as b from t;'
+
+
+def nested_arithmetic(depth):
+    text = 'x'
+    for level in range(depth):
+        text = f'(({text} + {level}) * y)'
+    return f'select {text} as a from t;'
+
+
+def bench_packrat(sql_texts):
+    from run import parse_sql
+
+    for make_sql in (nested_boolean, nested_arithmetic):
+        for depth in (1, 2, 4, 8, 16):
+            sql = make_sql(depth)
+            name = f'{make_sql.__name__} depth {depth}'
+            before = best_of(lambda: parse_sql(sql), repeat=3)
+            report(name, before)
+            memoized = best_of(lambda: parse_sql(sql, memoize=True), repeat=3)
+            report(name + ' memoized', memoized, before)
+
+
+def bench_precedence(sql_texts):
+    from run import parse_sql
+
+    for make_sql in (nested_boolean, nested_arithmetic):
+        for depth in (4, 8, 16, 32, 64):
+            seconds = best_of(lambda: parse_sql(make_sql(depth)), repeat=3)
+            report(f'{make_sql.__name__} depth {depth}', seconds)
+            print(f'{"":<40} {seconds * 1000 / depth:10.3f} ms per level')
+
+
+def concat_chain(terms):
+    text = " || '_' || ".join(f'column_{number}::varchar' for number in range(terms))
+    return f'select {text} as key from t;'
+
+
+def bench_concat(sql_texts):
+    from run import parse_sql
+
+    for terms in (10, 100, 1000, 10000):
+        sql = concat_chain(terms)
+        seconds = best_of(lambda: parse_sql(sql), repeat=3)
+        report(f'|| chain of {terms} casts', seconds)
+        print(f'{"":<40} {seconds * 1e6 / terms:10.1f} us per term')
+
+
+STARTUP_SCRIPT = '''
+import sys, time
+start = time.perf_counter()
+import run
+imported = time.perf_counter()
+if len(sys.argv) > 1:
+    run.load_grammar(sys.argv[1])
+run.parse_sql('select 1;')
+print(imported - start, time.perf_counter() - imported)
+'''
+
+
+def bench_startup(sql_texts):
+    here = os.path.dirname(os.path.abspath(__file__))
+
+    def startup(*args):
+        command = [sys.executable, '-W', 'ignore', '-c', STARTUP_SCRIPT, *args]
+        runs = [
+            subprocess.run(command, cwd=here, capture_output=True, text=True)
+            for _ in range(5)
+        ]
+        return [min(float(r.stdout.split()[i]) for r in runs) for i in (0, 1)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'grammar.pickle')
+        import run
+
+        run.save_grammar(path)
+        for name, args in (('built', ()), ('loaded', (path,))):
+            import_time, first_parse = startup(*args)
+            report(f'import run ({name} grammar)', import_time)
+            report(f'time to first parse ({name} grammar)', first_parse)
+
+
+def bench_streaming(sql_texts):
+    import run
+
+    script = '\n'.join(sql_texts * max(1, 500 // len(sql_texts)))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'script.sql')
+        with open(path, 'w') as script_file:
+            script_file.write(script)
+
+        def parse_whole_file():
+            with open(path) as script_file:
+                run.parse_sql(script_file.read())
+
+        def stream_file():
+            with open(path) as script_file:
+                for statement in run.iter_statements(script_file):
+                    pass
+
+        print(f'{len(script) / 1e6:.1f} MB script')
+        for name, func in (
+            ('parse_sql', parse_whole_file),
+            ('iter_statements', stream_file),
+        ):
+            report(name, best_of(func, repeat=1))
+            print(f'{"":<40} {peak_memory(func) / 1e6:10.1f} MB peak')
+
+
+def bench_batch(sql_texts):
+    from batch import parse_texts
+
+    texts = sql_texts * max(1, 200 // len(sql_texts))
+    print(f'{len(texts)} scripts, {os.cpu_count()} CPUs')
+    workers = 1
+    single = None
+    while workers <= os.cpu_count():
+        seconds = best_of(lambda: parse_texts(texts, workers, chunksize=8), repeat=1)
+        report(f'{workers} worker(s)', seconds, single)
+        single = single or seconds
+        workers *= 2
+
+
+def bench_cache(sql_texts):
+    from cache import DiskCache, parse_sql_cached
+
+    # distinct texts, so the cold run misses every time
+    texts = [text + ' ' * number for number in range(50) for text in sql_texts]
+    with tempfile.TemporaryDirectory() as directory:
+        cache = DiskCache(directory)
+
+        def parse_all():
+            for text in texts:
+                parse_sql_cached(text, cache)
+
+        cold = best_of(parse_all, repeat=1)
+        report(f'{len(texts)} scripts, cold cache', cold)
+        report(f'{len(texts)} scripts, warm cache', best_of(parse_all), cold)
+
+
+def bench_ast(sql_texts):
+    from pyparsing import ParseResults
+
+    import run
+
+    script = '\n'.join(sql_texts * max(1, 200 // len(sql_texts)))
+    run.parse_sql('select 1;')
+
+    def count(tree, branch_type):
+        count = 0
+        stack = [tree]
+        while stack:
+            value = stack.pop()
+            count += 1
+            if isinstance(value, branch_type):
+                stack.extend(value)
+        return count
+
+    nodes = sum(1 for select in run.parse_ast(script) for node in select.walk())
+    print(f'{len(script) / 1e3:.0f} kB script, {nodes} nodes')
+    for name, parse, branch_type in (
+        ('ParseResults', run.parse_sql, ParseResults),
+        ('nodes', run.parse_ast, tuple),
+    ):
+        report(f'parse ({name})', best_of(lambda: parse(script), repeat=3))
+        size = retained_memory(lambda: parse(script))
+        print(f'{"":<40} {size / 1e6:10.2f} MB, {size / nodes:.0f} B per node')
+        tree = parse(script)
+        report(f'traverse ({name})', best_of(lambda: count(tree, branch_type)))
+
+
+def bench_lexer(sql_texts):
+    import run
+    from lexer import token_matching, tokenize
+
+    script = '\n'.join(sql_texts * max(1, 300 // len(sql_texts)))
+    statements = run.get_grammar()['STATEMENTS'].streamline()
+    expected = run.parse_sql(script).dump()
+    print(f'{len(script) / 1e6:.2f} MB script')
+    report('tokenize', best_of(lambda: tokenize(script), repeat=3))
+    before = best_of(lambda: run.parse_sql(script), repeat=3)
+    report('parse matching characters', before)
+    with token_matching(statements):
+        assert run.parse_sql(script).dump() == expected
+        after = best_of(lambda: run.parse_sql(script), repeat=3)
+        report('parse matching tokens', after, before)
+
+
+def wide_select(columns):
+    names = ', '.join(f'column_{number}' for number in range(columns))
+    return f'select {names} from t;'
+
+
+def bench_identifier(sql_texts):
+    from pyparsing import MatchFirst, Word, alphanums, alphas
+
+    import run
+    from hooks import grammar_elements, overrides
+    from identifiers import SNOWFLAKE_RESERVED_WORDS, UnreservedWord
+
+    lookahead = ~MatchFirst(run.KEYWORDS) + Word(alphas, alphanums + '_$')
+    sets = UnreservedWord(run.IDENTIFIER.reserved_words)
+    snowflake_sets = UnreservedWord(SNOWFLAKE_RESERVED_WORDS)
+    names = wide_select(1000)[len('select ') : -len(' from t;')].split(', ')
+
+    def match_all(identifier):
+        return lambda: [identifier.parseString(name) for name in names]
+
+    before = best_of(match_all(lookahead))
+    report('IDENTIFIER: keyword lookahead', before)
+    report('IDENTIFIER: reserved word set', best_of(match_all(sets)), before)
+    report(
+        'IDENTIFIER: all Snowflake reserved words',
+        best_of(match_all(snowflake_sets)),
+        before,
+    )
+
+    statements = run.get_grammar()['STATEMENTS'].streamline()
+    snowflake_words = [
+        (element, 'reserved_words', SNOWFLAKE_RESERVED_WORDS)
+        for element in grammar_elements(statements)
+        if isinstance(element, UnreservedWord)
+    ]
+    for columns in (100, 500, 1000):
+        sql = wide_select(columns)
+        seconds = best_of(lambda: run.parse_sql(sql), repeat=3)
+        report(f'{columns} columns', seconds)
+        with overrides(snowflake_words):
+            seconds = best_of(lambda: run.parse_sql(sql), repeat=3)
+        report(f'{columns} columns, all reserved words', seconds)
+
+
+def in_list_select(items):
+    values = ', '.join(str(number) for number in range(items))
+    return f'select customer_id in ({values}) as known from t;'
+
+
+def bench_wide(sql_texts):
+    import run
+    from hooks import grammar_elements, overrides
+    from precedence import OperatorPrecedence
+
+    statements = run.get_grammar()['STATEMENTS'].streamline()
+    no_stop = [
+        (element, 'stop', None)
+        for element in grammar_elements(statements)
+        if isinstance(element, OperatorPrecedence)
+    ]
+    for make_sql in (wide_select, in_list_select):
+        for items in (10, 100, 1000, 10000):
+            sql = make_sql(items)
+            name = f'{make_sql.__name__} {items}'
+            with overrides(no_stop):
+                before = best_of(lambda: run.parse_sql(sql), repeat=3)
+            report(name + ', trying operators', before)
+            seconds = best_of(lambda: run.parse_sql(sql), repeat=3)
+            report(name, seconds, before)
+            print(f'{"":<40} {seconds * 1e6 / items:10.1f} us per item')
+
+
+def bench_clauses(sql_texts):
+    from pyparsing import OneOrMore, Optional
+
+    import run
+
+    grammar = run.get_grammar()
+    dispatch = grammar['STATEMENTS'].streamline()
+    sequential = OneOrMore(
+        grammar['SELECT']
+        + Optional(grammar['DISTINCT'] | grammar['ALL'])
+        + (grammar['SPLAT'] | grammar['COLUMN_LIST'])
+        + Optional(grammar['FROM_CLAUSE'])
+        + Optional(grammar['WHERE_CLAUSE'])
+        + Optional(grammar['GROUP_BY_CLAUSE'])
+        + Optional(grammar['HAVING_CLAUSE'])
+        + Optional(grammar['QUALIFY_CLAUSE'])
+        + Optional(grammar['ORDER_BY_CLAUSE'])
+        + Optional(grammar['LIMIT_CLAUSE'] | grammar['FETCH_CLAUSE'])
+        + ';'
+    ).streamline()
+
+    def parse_all(statements, texts):
+        return lambda: [statements.parseString(text, parseAll=True) for text in texts]
+
+    for name, texts in (
+        ('corpus', sql_texts),
+        ('analytics queries', [ANALYTICS_SQL]),
+        ('no clauses', ['select a from t;\n' * 200]),
+    ):
+        assert [r.asList() for r in parse_all(dispatch, texts)()] == [
+            r.asList() for r in parse_all(sequential, texts)()
+        ]
+        before = best_of(parse_all(sequential, texts), repeat=3)
+        report(f'{name}: optional clauses in turn', before)
+        seconds = best_of(parse_all(dispatch, texts), repeat=3)
+        report(f'{name}: clause keyword dispatch', seconds, before)
+
+
+def bench_throughput(sql_texts):
+    import run
+    from corpus import CorpusGenerator
+    from statements import split_text
+
+    statements = sum(1 for text in sql_texts for _ in split_text(text))
+    size = sum(len(text.encode()) for text in sql_texts)
+
+    def parse_all():
+        for text in sql_texts:
+            run.parse_sql(text)
+
+    seconds = best_of(parse_all, repeat=3)
+    report_throughput('parse_sql', seconds, statements, size, peak_memory(parse_all))
+
+    generator = CorpusGenerator()
+    fragments = {
+        'IDENTIFIER': [generator.column_name() for _ in range(200)],
+        'ARITHMETIC_EXPRESSION': [generator.arithmetic(2) for _ in range(200)],
+        'BOOLEAN_EXPRESSION': [generator.boolean(2) for _ in range(200)],
+        'CASE_EXPRESSION': [generator.case(1) for _ in range(200)],
+        'FUNCTION_EXPRESSION': [
+            generator.function_call(signature)
+            for signatures in generator.signatures.values()
+            for signature in signatures
+        ],
+    }
+    for name, texts in fragments.items():
+        element = run.get_grammar()[name]
+        size = sum(len(text.encode()) for text in texts)
+
+        def parse_fragments():
+            for text in texts:
+                element.parseString(text, parseAll=True)
+
+        seconds = best_of(parse_fragments, repeat=3)
+        peak = peak_memory(parse_fragments)
+        report_throughput(name, seconds, len(texts), size, peak, unit='fragments')
+
+
+def break_script(text, how):
+    if how == 'paren':
+        return text.replace(')', '', 1)
+    if how == 'string':
+        return text.replace("'", '', 1)
+    if how == 'semicolon':
+        return text.rstrip()[:-1]
+    if how == 'select':
+        return text.replace('select', 'selet', 1)
+    return text
+
+
+def bench_prescan(sql_texts):
+    import run
+    from corpus import generate_corpus
+    from pyparsing import ParseBaseException
+
+    # half the scripts are valid; the rest have one structural mistake each
+    breakages = ['valid', 'paren', 'valid', 'string', 'valid', 'semicolon']
+    breakages += ['valid', 'select']
+    scripts = [
+        break_script(generate_corpus(5, seed=number), breakages[number % 8])
+        for number in range(80)
+    ]
+
+    def parse_all(scripts, prescan):
+        failures = 0
+        for script in scripts:
+            try:
+                run.parse_sql(script, prescan=prescan)
+            except ParseBaseException:
+                failures += 1
+        return failures
+
+    valid = scripts[::2]
+    broken = scripts[1::2]
+    assert parse_all(valid, True) == 0
+    assert parse_all(broken, False) == parse_all(broken, True) == len(broken)
+    for name, group in (('all', scripts), ('valid', valid), ('broken', broken)):
+        before = best_of(lambda: parse_all(group, False), repeat=3)
+        report(f'{len(group)} {name} scripts, grammar only', before)
+        after = best_of(lambda: parse_all(group, True), repeat=3)
+        report(f'{len(group)} {name} scripts, prescan first', after, before)
+
+
+def bench_incremental(sql_texts):
+    import random
+
+    import run
+    from incremental import IncrementalParser
+
+    lines = sum(text.count('\n') for text in sql_texts)
+    script = '\n'.join(sql_texts * max(1, 5000 // lines))
+    print(f'{script.count(chr(10))} lines, {len(script) / 1e3:.0f} kB')
+    full = best_of(lambda: run.parse_sql(script), repeat=1)
+    report('parse_sql, whole script', full)
+    parser = IncrementalParser(script)
+    generator = random.Random(0)
+    keystrokes = 200
+
+    def type_and_delete():
+        # type a character somewhere, then delete it again
+        for _ in range(keystrokes // 2):
+            pos = generator.randrange(len(parser.text))
+            parser.edit(pos, pos, ' ')
+            parser.edit(pos, pos + 1, '')
+
+    seconds = best_of(type_and_delete, repeat=3) / keystrokes
+    report('IncrementalParser.edit, per keystroke', seconds, full)
+
+
+def bench_mmap(sql_texts):
+    import run
+
+    script = '\n'.join(sql_texts * max(1, 1000 // len(sql_texts)))
+    largest = max(len(text.encode()) for text in sql_texts)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'script.sql')
+        with open(path, 'w') as script_file:
+            script_file.write(script)
+
+        def read_then_split():
+            with open(path) as script_file:
+                for statement in run.iter_statements(script_file.read()):
+                    pass
+
+        def memory_mapped():
+            for statement in run.parse_file(path):
+                pass
+
+        print(f'{len(script) / 1e6:.2f} MB file, largest statement {largest} bytes')
+        for name, func in (
+            ('read whole file, then iter_statements', read_then_split),
+            ('parse_file', memory_mapped),
+        ):
+            report(name, best_of(func, repeat=1))
+            peak = peak_memory(func)
+            print(f'{"":<40} {peak / 1e6:10.2f} MB peak')
+            record(name, peak_bytes=peak)
+
+
+def bench_budget(sql_texts):
+    from run import parse_sql
+
+    script = '\n'.join(sql_texts)
+    before = best_of(lambda: parse_sql(script))
+    report('no budget', before)
+    for name, limits in (
+        ('max_steps', {'max_steps': 10**9}),
+        ('max_seconds', {'max_seconds': 3600}),
+        ('max_steps and max_seconds', {'max_steps': 10**9, 'max_seconds': 3600}),
+    ):
+        report(name, best_of(lambda: parse_sql(script, **limits)), before)
+
+
+def query_log(sql_texts, variants=20, seed=0):
+    """
+    Each statement in sql_texts variants times, with different literals
+    """
+    import random
+    from statements import split_text
+    from templates import LITERAL
+
+    rng = random.Random(seed)
+
+    def vary(match):
+        if match.lastgroup == 'number':
+            return str(rng.randrange(10000))
+        if match.lastgroup == 'string':
+            return f"'value {rng.randrange(10000)}'"
+        return match.group()
+
+    statements = [text for sql in sql_texts for _, text in split_text(sql)]
+    return [
+        LITERAL.sub(vary, text) for _ in range(variants) for text in statements
+    ]
+
+
+def bench_templates(sql_texts):
+    from run import parse_sql
+    from templates import TemplateParser
+
+    log = query_log(sql_texts)
+
+    def parse_each():
+        for text in log:
+            parse_sql(text)
+
+    def parse_templates():
+        parser = TemplateParser()
+        for text in log:
+            parser.parse(text)
+        return parser
+
+    before = best_of(parse_each, repeat=3)
+    report(f'{len(log)} statements, parse_sql', before)
+    report(f'{len(log)} statements, TemplateParser', best_of(parse_templates), before)
+    print(f'{"":<40} {parse_templates().stats()}')
+
+
+def bench_format(sql_texts, files=10000):
+    from formatter import find_sql_files, format_files
+    from statements import split_statements
+
+    statements = [text for sql in sql_texts for _, text in split_statements(sql)]
+    with tempfile.TemporaryDirectory() as directory:
+        size = 0
+        for number in range(files):
+            folder = os.path.join(directory, str(number // 100))
+            os.makedirs(folder, exist_ok=True)
+            text = statements[number % len(statements)]
+            size += len(text.encode())
+            with open(os.path.join(folder, f'{number}.sql'), 'w') as script:
+                script.write(text)
+        paths = list(find_sql_files([directory]))
+        print(f'{len(paths)} files, {size / 1e6:.2f} MB, {os.cpu_count()} CPUs')
+        workers = 1
+        single = None
+        while workers <= os.cpu_count():
+            seconds = best_of(lambda: format_files(paths, workers, 64), repeat=1)
+            report(f'format --check, {workers} worker(s)', seconds, single)
+            print(f'{"":<40} {len(paths) / seconds:10.0f} files/s')
+            single = single or seconds
+            workers *= 2
+
+
+def bench_lineage(sql_texts):
+    import run
+    from lineage import extract_references
+    from nodes import FunctionCall, Identifier, TableRef
+
+    script = '\n'.join(sql_texts * max(1, 20 // len(sql_texts)))
+    run.parse_sql('select 1;')
+
+    def walk_ast():
+        references = []
+        for select in run.parse_ast(script):
+            tables, columns, functions = {}, {}, {}
+            for node in select.walk():
+                if type(node) is TableRef:
+                    tables[tuple(node)] = None
+                elif type(node) is Identifier:
+                    columns[node.name] = None
+                elif type(node) is FunctionCall:
+                    functions[node.name] = None
+            references.append((tuple(tables), tuple(columns), tuple(functions)))
+        return references
+
+    def walk_results():
+        # every string in the tree, as the cheapest walk of parse_sql's output
+        names = []
+        stack = [run.parse_sql(script)]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, str):
+                names.append(value)
+            else:
+                stack.extend(value)
+        return names
+
+    count = len(extract_references(script))
+    for name, extract in (
+        ('parse_sql then walk', walk_results),
+        ('parse_ast then walk', walk_ast),
+        ('extract_references', lambda: extract_references(script)),
+    ):
+        seconds = best_of(extract, repeat=3)
+        report_throughput(name, seconds, count, len(script), peak_memory(extract))
+
+
+IMPORT_SCRIPT = '''
+import sys, time
+start = time.perf_counter()
+__import__(sys.argv[1])
+print(time.perf_counter() - start)
+'''
+
+
+def bench_signatures(sql_texts):
+    import signatures
+
+    here = os.path.dirname(os.path.abspath(__file__))
+
+    def import_time(module_name):
+        command = [sys.executable, '-W', 'ignore', '-c', IMPORT_SCRIPT, module_name]
+        runs = [
+            subprocess.run(command, cwd=here, capture_output=True, text=True)
+            for _ in range(5)
+        ]
+        return min(float(run.stdout) for run in runs)
+
+    baseline = import_time('functions')
+    report('import functions', baseline)
+    report('import signatures', import_time('signatures'), baseline)
+    names = list(signatures.SIGNATURES)
+    lookups = best_of(lambda: [signatures.lookup(name) for name in names])
+    report(f'lookup all {len(names)} functions', lookups)
+    report("complete('regexp_')", best_of(lambda: signatures.complete('regexp_')))
+
+
+def compare(baseline_path):
+    """
+    Print how each timing compares with the same timing in an earlier run
+    """
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+    before = {
+        (result['benchmark'], result['name']): result['seconds']
+        for result in baseline['results']
+    }
+    print(f'\ncompared with {baseline_path}')
+    for result in RESULTS:
+        seconds = before.get((result['benchmark'], result['name']))
+        if seconds:
+            change = result['seconds'] / seconds - 1
+            label = f"{result['benchmark']}: {result['name']}"
+            print(f'{label:<60} {change:+8.1%}')
+
+
+BENCHMARKS = {
+    'function_dispatch': bench_function_dispatch,
+    'packrat': bench_packrat,
+    'precedence': bench_precedence,
+    'concat': bench_concat,
+    'startup': bench_startup,
+    'streaming': bench_streaming,
+    'batch': bench_batch,
+    'cache': bench_cache,
+    'ast': bench_ast,
+    'lexer': bench_lexer,
+    'identifier': bench_identifier,
+    'wide': bench_wide,
+    'clauses': bench_clauses,
+    'throughput': bench_throughput,
+    'prescan': bench_prescan,
+    'incremental': bench_incremental,
+    'mmap': bench_mmap,
+    'signatures': bench_signatures,
+    'budget': bench_budget,
+    'templates': bench_templates,
+    'format': bench_format,
+    'lineage': bench_lineage,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--only', choices=sorted(BENCHMARKS))
+    parser.add_argument('--json', help='write the timings to this file')
+    parser.add_argument('--baseline', help='timings written by an earlier run')
+    parser.add_argument('--generate', action='store_true')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--statements', type=int, default=100)
+    parser.add_argument('--columns', type=int, default=10)
+    parser.add_argument('--depth', type=int, default=2)
+    parser.add_argument('--calls', type=int, default=1)
+    parser.add_argument('files', nargs='*')
+    args = parser.parse_args(argv)
+
+    global current_benchmark
+    if args.generate:
+        from corpus import generate_corpus
+
+        corpus = {
+            name: getattr(args, name)
+            for name in ('seed', 'statements', 'columns', 'depth', 'calls')
+        }
+        sql_texts = [
+            generate_corpus(
+                args.statements, args.columns, args.depth, args.calls, args.seed
+            )
+        ]
+    else:
+        corpus = {'files': args.files}
+        sql_texts = [open(path).read() for path in args.files] or [SAMPLE_SQL]
+    for name, bench in BENCHMARKS.items():
+        if args.only in (None, name):
+            current_benchmark = name
+            bench(sql_texts)
+
+    if args.json:
+        import pyparsing
+
+        with open(args.json, 'w') as json_file:
+            json.dump(
+                {
+                    'python': sys.version.split()[0],
+                    'pyparsing': pyparsing.__version__,
+                    'corpus': corpus,
+                    'results': RESULTS,
+                },
+                json_file,
+                indent=2,
+            )
+    if args.baseline:
+        compare(args.baseline)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+Stop a parse that is taking too long, instead of letting it hang.
+
+A budget is a number of seconds, a number of steps, or both.  A step is a
+match attempt by an element with sub-elements (a sequence, alternatives, a
+repetition, a Forward, ...).  Leaf tokens are not counted: that keeps the
+overhead down, and a runaway parse keeps going through compound elements
+anyway.  Once the budget is used up the parse raises BudgetExceeded at the
+location it had reached.  BudgetExceeded is a ParseFatalException, so no
+alternative catches it and tries something else.
+"""
+from contextlib import contextmanager
+from time import perf_counter
+
+from pyparsing import ParseFatalException
+
+from hooks import wrap_parse
+
+# the clock is only read every this many steps
+CHECK_INTERVAL = 256
+
+
+class BudgetExceeded(ParseFatalException):
+    pass
+
+
+class ParseBudget:
+    """
+    Counts the steps of one parse against max_steps, and checks the time
+    against max_seconds every CHECK_INTERVAL steps.  Either limit can be None
+    for none.
+    """
+
+    def __init__(self, max_seconds=None, max_steps=None):
+        self.max_seconds = max_seconds
+        self.max_steps = max_steps
+        self.steps = 0
+        self.next_check = 0
+        self.start = perf_counter()
+
+    def seconds(self):
+        return perf_counter() - self.start
+
+    def check(self, instring, loc):
+        if self.max_steps is not None and self.steps > self.max_steps:
+            message = f'Parse budget exceeded: more than {self.max_steps} steps'
+            raise BudgetExceeded(instring, loc, message)
+        if self.max_seconds is not None and self.seconds() > self.max_seconds:
+            message = f'Parse budget exceeded: took over {self.max_seconds} seconds'
+            raise BudgetExceeded(instring, loc, message)
+        self.next_check = self.steps + CHECK_INTERVAL
+        if self.max_steps is not None:
+            self.next_check = min(self.next_check, self.max_steps + 1)
+
+
+def spend(budget):
+    def wrapper(element, parse):
+        if not element.recurse():
+            return parse
+
+        def budgeted_parse(instring, loc, *args, **kwargs):
+            budget.steps += 1
+            if budget.steps >= budget.next_check:
+                budget.check(instring, loc)
+            return parse(instring, loc, *args, **kwargs)
+
+        return budgeted_parse
+
+    return wrapper
+
+
+@contextmanager
+def budgeted(root, max_seconds=None, max_steps=None):
+    """
+    Enforce a budget, shared by every parse in the block, on the elements
+    reachable from root, yielding the ParseBudget.  Like hooks.wrap_parse,
+    this is not safe while another thread is parsing with the same grammar.
+    """
+    budget = ParseBudget(max_seconds, max_steps)
+    with wrap_parse(root, spend(budget)):
+        budget.start = perf_counter()
+        yield budget
@@ -0,0 +1,108 @@
+"""
+On-disk cache of parse outcomes, keyed on a hash of the SQL text and the
+grammar fingerprint, so scripts that have not changed since the last run (with
+a grammar that has not changed either) are not parsed again.
+
+Entries are zlib-compressed pickles written to a temporary file and renamed
+into place, so concurrent writers and readers, in any number of processes,
+only ever see complete entries.  Once the cache grows past max_bytes the least
+recently used entries are deleted.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import zlib
+
+import run
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+EVICT_EVERY = 256
+TEMPORARY_PREFIX = '.tmp'
+
+
+class DiskCache:
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.fingerprint = run.grammar_fingerprint().encode()
+        self.puts = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, sql_text):
+        digest = hashlib.sha256(self.fingerprint + b'\0' + sql_text.encode())
+        key = digest.hexdigest()
+        return os.path.join(self.directory, key[:2], key[2:])
+
+    def get(self, sql_text):
+        """
+        The (result, error) pair stored for sql_text, or None
+        """
+        path = self.path(sql_text)
+        try:
+            with open(path, 'rb') as entry:
+                outcome = pickle.loads(zlib.decompress(entry.read()))
+            os.utime(path)
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError):
+            return None
+        return outcome
+
+    def put(self, sql_text, result, error):
+        path = self.path(sql_text)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = zlib.compress(pickle.dumps((result, error), pickle.HIGHEST_PROTOCOL))
+        with tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(path), prefix=TEMPORARY_PREFIX, delete=False
+        ) as entry:
+            entry.write(data)
+        os.replace(entry.name, path)
+        self.puts += 1
+        if self.puts % EVICT_EVERY == 0:
+            self.evict()
+
+    def entries(self):
+        for dirpath, _, filenames in os.walk(self.directory):
+            for filename in filenames:
+                if filename.startswith(TEMPORARY_PREFIX):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield stat.st_mtime, stat.st_size, path
+
+    def evict(self):
+        """
+        Delete the least recently used entries until the cache fits in
+        max_bytes
+        """
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+
+def parse_sql_cached(sql_text, cache):
+    """
+    parse_sql, answered from cache when possible
+    """
+    from pyparsing import ParseBaseException
+
+    outcome = cache.get(sql_text)
+    if outcome is None:
+        try:
+            outcome = run.parse_sql(sql_text), None
+        except ParseBaseException as error:
+            outcome = None, error
+        cache.put(sql_text, *outcome)
+    result, error = outcome
+    if error is not None:
+        raise error
+    return result
@@ -0,0 +1,55 @@
+"""
+Optional clauses that each start with their own keyword, in a fixed order.
+
+A run of Optional clauses tries every clause in turn at each position, so a
+statement pays for all the clauses it does not use.  ClauseDispatch reads the
+word at the current position once and looks up the only clause that can start
+with it.
+"""
+import re
+
+from pyparsing import ParseResults
+
+from precedence import GrammarToken
+
+CLAUSE_WORD = re.compile(r'[A-Za-z_][A-Za-z0-9_$]*')
+
+
+class ClauseDispatch(GrammarToken):
+    """
+    Matches any of clauses, in order and each at most once.  clauses is a list
+    with a {keyword: element} dict for each position; elements that share a
+    position are alternatives to each other.  Once a clause's keyword is found
+    the clause must match, so an error in it is reported where it is.
+    """
+
+    default_name = 'clauses'
+
+    def __init__(self, clauses):
+        super().__init__()
+        self.clauses = {
+            keyword.lower(): (position, element)
+            for position, alternatives in enumerate(clauses)
+            for keyword, element in alternatives.items()
+        }
+        self.mayReturnEmpty = True
+
+    def parseImpl(self, instring, loc, doActions=True):
+        tokens = ParseResults([])
+        next_position = 0
+        while True:
+            start = self.preParse(instring, loc)
+            match = CLAUSE_WORD.match(instring, start)
+            if match is None:
+                return loc, tokens
+            clause = self.clauses.get(match.group().lower())
+            if clause is None or clause[0] < next_position:
+                return loc, tokens
+            position, element = clause
+            loc, clause_tokens = element._parse(instring, start, doActions)
+            tokens += clause_tokens
+            next_position = position + 1
+
+    def recurse(self):
+        elements = {id(element): element for _, element in self.clauses.values()}
+        return list(elements.values())
@@ -0,0 +1,144 @@
+"""
+Seeded generator of synthetic Snowflake SELECT statements for benchmarking.
+
+    python corpus.py [--seed N] [--statements N] [--columns N] [--depth N]
+                     [--calls N] > corpus.sql
+
+The same arguments always give the same text.  Every statement it generates
+parses with the grammar.
+"""
+import argparse
+import random
+import sys
+
+from signatures import FUNCTION_FAMILIES, SIGNATURES
+
+EXPRESSION_KINDS = ('arithmetic', 'boolean', 'case', 'column')
+ARITHMETIC_OPERATORS = ('+', '-', '*', '/', '%')
+COMPARISON_OPERATORS = ('=', '!=', '<>', '<', '>', '<=', '>=')
+
+
+def function_signatures():
+    """
+    Name list -> [Signature] of the functions first listed in it
+    """
+    signatures = {family: [] for family in FUNCTION_FAMILIES}
+    for signature in SIGNATURES.values():
+        signatures[signature.families[0]].append(signature)
+    return signatures
+
+
+class CorpusGenerator:
+    """
+    Builds statements with columns expressions each (cycling through
+    arithmetic, boolean, CASE and plain columns, nested depth levels deep),
+    plus calls_per_family function-call columns for every non-empty name list
+    in functions.py
+    """
+
+    def __init__(self, seed=0, columns=10, depth=2, calls_per_family=1):
+        self.random = random.Random(seed)
+        self.columns = columns
+        self.depth = depth
+        self.calls_per_family = calls_per_family
+        self.signatures = function_signatures()
+
+    def column_name(self):
+        return f'column_{self.random.randrange(1000)}'
+
+    def leaf(self):
+        choice = self.random.random()
+        if choice < 0.6:
+            return self.column_name()
+        if choice < 0.8:
+            return str(self.random.randrange(1000))
+        if choice < 0.9:
+            return f'{self.random.randrange(100)}.{self.random.randrange(100)}'
+        return f"'value {self.random.randrange(100)}'"
+
+    def arithmetic(self, depth):
+        if depth == 0:
+            return self.leaf()
+        op = self.random.choice(ARITHMETIC_OPERATORS)
+        inner = self.arithmetic(depth - 1)
+        if self.random.random() < 0.5:
+            return f'({inner} {op} {self.leaf()})'
+        return f'({self.leaf()} {op} -{inner})'
+
+    def boolean(self, depth):
+        if depth == 0:
+            if self.random.random() < 0.2:
+                negated = self.random.choice(['', 'not '])
+                return f'{self.column_name()} is {negated}null'
+            op = self.random.choice(COMPARISON_OPERATORS)
+            return f'{self.leaf()} {op} {self.leaf()}'
+        inner = self.boolean(depth - 1)
+        choice = self.random.random()
+        if choice < 0.2:
+            return f'not ({inner})'
+        connective = 'and' if choice < 0.6 else 'or'
+        return f'({inner} {connective} {self.boolean(0)})'
+
+    def case(self, depth):
+        if depth == 0:
+            condition = self.boolean(0)
+        else:
+            condition = f'{self.case(depth - 1)} = {self.random.randrange(10)}'
+        whens = f'when {condition} then {self.column_name()}'
+        if self.random.random() < 0.5:
+            whens += f' when {self.boolean(0)} then {self.random.randrange(10)}'
+        return f'case {whens} else {self.random.randrange(10)} end'
+
+    def expression(self, kind, depth=None):
+        depth = self.depth if depth is None else depth
+        if kind == 'column':
+            return self.column_name()
+        return getattr(self, kind)(depth)
+
+    def function_call(self, signature):
+        name = signature.name
+        count = self.random.randint(signature.min_args, signature.max_args)
+        if signature.optional_parens and count == 0:
+            return name.lower()
+        args = ', '.join(self.leaf() for _ in range(count))
+        return f'{name.lower()}({args})'
+
+    def statement(self):
+        columns = []
+        for number in range(self.columns):
+            kind = EXPRESSION_KINDS[number % len(EXPRESSION_KINDS)]
+            columns.append(self.expression(kind))
+        for signatures in self.signatures.values():
+            if signatures:
+                for _ in range(self.calls_per_family):
+                    columns.append(self.function_call(self.random.choice(signatures)))
+        columns = [
+            f'{column} as alias_{number}' if self.random.random() < 0.3 else column
+            for number, column in enumerate(columns)
+        ]
+        database = f'database_{self.random.randrange(3)}'
+        table = f'table_{self.random.randrange(50)}'
+        return f"select {', '.join(columns)} from {database}.schema_1.{table};"
+
+
+def generate_corpus(statements=100, columns=10, depth=2, calls_per_family=1, seed=0):
+    generator = CorpusGenerator(seed, columns, depth, calls_per_family)
+    return '\n'.join(generator.statement() for _ in range(statements)) + '\n'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--statements', type=int, default=100)
+    parser.add_argument('--columns', type=int, default=10)
+    parser.add_argument('--depth', type=int, default=2)
+    parser.add_argument('--calls', type=int, default=1, help='calls per name list')
+    args = parser.parse_args(argv)
+    text = generate_corpus(
+        args.statements, args.columns, args.depth, args.calls, args.seed
+    )
+    sys.stdout.write(text)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
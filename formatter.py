@@ -0,0 +1,332 @@
+"""
+Rewrite Snowflake SQL in one canonical layout.
+
+    python formatter.py [--check] [--workers N] [--chunksize N]
+                        [--grammar PATH] path ...
+
+Paths are .sql files, or directories to search for them.  Each file is parsed
+into nodes.py nodes by a pool of worker processes (as in batch.py) and written
+out again with keywords and function names in lower case, one column per line,
+and only the parentheses the operator precedence needs.  With --check no file
+is changed: the ones that would be are listed, and the exit status is 1 if
+there are any.
+"""
+import argparse
+import os
+import sys
+
+import run
+from batch import parse_in_pool
+from nodes import BinaryOp, Case, Cast, FunctionCall, Identifier, InList, Literal
+from nodes import Star, UnaryOp
+from signatures import lookup
+
+INDENT = '    '
+
+# smaller binds tighter, as in grammar.BOOLEAN_OPERATORS
+CAST_PRECEDENCE = 1
+BINARY_PRECEDENCE = {
+    '*': 3,
+    '/': 3,
+    '%': 3,
+    '+': 4,
+    '-': 4,
+    '||': 5,
+    '=': 6,
+    '!=': 6,
+    '<>': 6,
+    '<': 6,
+    '>': 6,
+    '<=': 6,
+    '>=': 6,
+    'and': 10,
+    'or': 11,
+}
+IN_PRECEDENCE = 7
+UNARY_PRECEDENCE = {'-': 2, '+': 2, 'is null': 8, 'is not null': 8, 'not': 9}
+POSTFIX_OPERATORS = frozenset(['is null', 'is not null'])
+# comparisons do not chain (a < b < c does not parse), so neither operand can
+# be another comparison without parentheses
+NON_ASSOCIATIVE_OPERATORS = frozenset(['=', '!=', '<>', '<', '>', '<=', '>='])
+LOOSEST = 12
+
+# QUOTED_SQL_STRING turns these escapes back into whitespace, and keeps any
+# other backslash as it is
+STRING_ESCAPES = str.maketrans({'\n': '\\n', '\r': '\\r', '\t': '\\t', '\f': '\\f'})
+
+
+def precedence(node):
+    if type(node) is BinaryOp:
+        return BINARY_PRECEDENCE[node.op]
+    if type(node) is UnaryOp:
+        return UNARY_PRECEDENCE[node.op]
+    if type(node) is Cast:
+        return CAST_PRECEDENCE
+    if type(node) is InList:
+        return IN_PRECEDENCE
+    return 0
+
+
+class SqlWriter:
+    """
+    Writes nodes as SQL into a list of parts, joined once by getvalue
+    """
+
+    def __init__(self):
+        self.parts = []
+        self.writers = {
+            BinaryOp: self.binary_op,
+            UnaryOp: self.unary_op,
+            Cast: self.cast,
+            InList: self.in_list,
+            Identifier: self.identifier,
+            Literal: self.literal,
+            FunctionCall: self.function_call,
+            Case: self.inline_case,
+        }
+
+    def getvalue(self):
+        return ''.join(self.parts)
+
+    def statements(self, selects):
+        for number, select in enumerate(selects):
+            if number:
+                self.parts.append('\n')
+            self.select(select)
+
+    def select(self, node):
+        write = self.parts.append
+        write('select')
+        if node.quantifier is not None:
+            write(' ' + node.quantifier)
+        if len(node.columns) == 1 and type(node.columns[0]) is Star:
+            write(' *')
+        else:
+            for number, column in enumerate(node.columns):
+                write(',\n' + INDENT if number else '\n' + INDENT)
+                self.column(column)
+        if node.table is not None:
+            write('\nfrom ')
+            write('.'.join(name for name in node.table if name is not None))
+        self.clauses(node)
+        write(';\n')
+
+    def clauses(self, node):
+        write = self.parts.append
+        if node.where is not None:
+            write('\nwhere ')
+            self.expression(node.where)
+        if node.group_by is not None:
+            write('\ngroup by ')
+            self.expressions(node.group_by)
+        if node.having is not None:
+            write('\nhaving ')
+            self.expression(node.having)
+        if node.qualify is not None:
+            write('\nqualify ')
+            self.expression(node.qualify)
+        if node.order_by is not None:
+            write('\norder by ')
+            for number, item in enumerate(node.order_by):
+                if number:
+                    write(', ')
+                self.expression(item.expression)
+                if item.direction is not None:
+                    write(' ' + item.direction)
+                if item.nulls is not None:
+                    write(' nulls ' + item.nulls)
+        if node.limit is not None:
+            write('\nlimit ' + node.limit.count)
+            if node.limit.offset is not None:
+                write(' offset ' + node.limit.offset)
+
+    def expressions(self, nodes):
+        for number, node in enumerate(nodes):
+            if number:
+                self.parts.append(', ')
+            self.expression(node)
+
+    def column(self, node):
+        if type(node.expression) is Case:
+            self.case(node.expression, INDENT)
+        else:
+            self.expression(node.expression)
+        if node.alias is not None:
+            self.parts.append(' as ' + node.alias.name)
+
+    def expression(self, node, limit=LOOSEST):
+        """
+        Write node, in parentheses if it binds more loosely than limit allows
+        """
+        if precedence(node) > limit:
+            self.parts.append('(')
+            self.writers[type(node)](node)
+            self.parts.append(')')
+        else:
+            self.writers[type(node)](node)
+
+    def binary_op(self, node):
+        level = BINARY_PRECEDENCE[node.op]
+        # a comparison needs parentheses around either operand at its level;
+        # other operators are left associative, so only the right one does
+        if node.op in NON_ASSOCIATIVE_OPERATORS:
+            self.expression(node.left, level - 1)
+        else:
+            self.expression(node.left, level)
+        self.parts.append(f' {node.op} ')
+        self.expression(node.right, level - 1)
+
+    def unary_op(self, node):
+        level = UNARY_PRECEDENCE[node.op]
+        if node.op in POSTFIX_OPERATORS:
+            self.expression(node.operand, level)
+            self.parts.append(' ' + node.op)
+            return
+        operand = node.operand
+        if node.op == 'not':
+            self.parts.append('not ')
+        elif type(operand) is UnaryOp and operand.op in ('-', '+'):
+            # '--' would start a comment
+            self.parts.append(node.op + ' ')
+        else:
+            self.parts.append(node.op)
+        self.expression(operand, level)
+
+    def cast(self, node):
+        self.expression(node.operand, CAST_PRECEDENCE)
+        self.parts.append('::' + node.type)
+
+    def in_list(self, node):
+        write = self.parts.append
+        self.expression(node.operand, IN_PRECEDENCE)
+        write(' not in (' if node.negated else ' in (')
+        self.expressions(node.items)
+        write(')')
+
+    def identifier(self, node):
+        self.parts.append(node.name)
+
+    def literal(self, node):
+        if node.kind == 'string':
+            self.parts.append("'" + node.value.translate(STRING_ESCAPES) + "'")
+        elif node.kind == 'boolean':
+            self.parts.append('true' if node.value else 'false')
+        else:
+            self.parts.append(node.value)
+
+    def function_call(self, node):
+        write = self.parts.append
+        write(node.name.lower())
+        if not node.args and lookup(node.name).optional_parens:
+            return
+        write('(')
+        self.expressions(node.args)
+        write(')')
+
+    def case(self, node, indent):
+        write = self.parts.append
+        write('case')
+        for condition, result in node.whens:
+            write(f'\n{indent}{INDENT}when ')
+            self.expression(condition)
+            write(' then ')
+            self.expression(result)
+        if node.else_ is not None:
+            write(f'\n{indent}{INDENT}else ')
+            self.expression(node.else_)
+        write(f'\n{indent}end')
+
+    def inline_case(self, node):
+        write = self.parts.append
+        write('case')
+        for condition, result in node.whens:
+            write(' when ')
+            self.expression(condition)
+            write(' then ')
+            self.expression(result)
+        if node.else_ is not None:
+            write(' else ')
+            self.expression(node.else_)
+        write(' end')
+
+
+def format_selects(selects):
+    writer = SqlWriter()
+    writer.statements(selects)
+    return writer.getvalue()
+
+
+def format_sql(sql_text):
+    """
+    sql_text in the canonical layout
+    """
+    return format_selects(run.parse_ast(sql_text))
+
+
+def format_path(path):
+    """
+    (the formatted text if it differs from the file's, error) for the file
+    at path, where error is a ParseException, a RecursionError for a file
+    nested too deeply, or an OSError or UnicodeDecodeError reading it
+    """
+    from pyparsing import ParseBaseException
+
+    try:
+        with open(path) as script:
+            text = script.read()
+        formatted = format_sql(text)
+    except (OSError, ValueError, ParseBaseException, RecursionError) as error:
+        return None, error
+    return (formatted if formatted != text else None), None
+
+
+def find_sql_files(paths):
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.endswith('.sql'):
+                    yield os.path.join(dirpath, filename)
+
+
+def format_files(paths, max_workers=None, chunksize=16, grammar_path=None):
+    """
+    A batch.Outcome per file, whose result is its formatted text if that is
+    different, or None if the file is already formatted
+    """
+    return parse_in_pool(format_path, paths, max_workers, chunksize, (grammar_path,))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--check', action='store_true')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--chunksize', type=int, default=16)
+    parser.add_argument('--grammar', help='path of a grammar saved by save_grammar')
+    parser.add_argument('paths', nargs='+')
+    args = parser.parse_args(argv)
+
+    failed = changed = 0
+    outcomes = format_files(
+        list(find_sql_files(args.paths)), args.workers, args.chunksize, args.grammar
+    )
+    for outcome in outcomes:
+        if outcome.error is not None:
+            failed += 1
+            print(f'{outcome.source}: {outcome.error}')
+        elif outcome.result is not None:
+            changed += 1
+            if args.check:
+                print(f'would reformat {outcome.source}')
+            else:
+                with open(outcome.source, 'w') as script:
+                    script.write(outcome.result)
+                print(f'reformatted {outcome.source}')
+    return 1 if failed or (args.check and changed) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,21 @@
-from pyparsing import CaselessKeyword, Optional
+import re
+
+from pyparsing import (
+    CaselessKeyword,
+    Literal,
+    Optional,
+    ParseException,
+    ParseFatalException,
+    ParseResults,
+    alphanums,
+)
+
+from precedence import GrammarToken
+from signatures import SIGNATURES, arity_error
+
+
+FUNCTION_NAME_CHARS = alphanums + '_$'
+FUNCTION_NAME = re.compile(r'[A-Za-z][A-Za-z0-9_$]*')
 
 
 def or_equals(expressions):
@@ -24,7 +41,13 @@ def make_nullary_function_with_optional_arg(func_name, EXPRESSION):
 
 
 def make_n_ary_function(func_name, arity, EXPRESSION, num_optional=0):
-    func_expression = CaselessKeyword(func_name) + '('
+    return CaselessKeyword(func_name) + make_n_ary_arguments(
+        arity, EXPRESSION, num_optional
+    )
+
+
+def make_n_ary_arguments(arity, EXPRESSION, num_optional=0):
+    func_expression = Literal('(')
     for arg_num in range(1, arity + 1):
         arg_name = 'arg_' + str(arg_num)
         func_expression += EXPRESSION(arg_name)
@@ -57,6 +80,10 @@ CONTEXT_FUNCTION_NAMES = [
     'CURRENT_WAREHOUSE',
 ]
 
+NULLARY_FUNCTION_NAMES = ['PI']
+
+NULLARY_ONE_OPTIONAL_FUNCTION_NAMES = ['RANDOM']
+
 UNARY_FUNCTION_NAMES = [
     'BITAND_AGG',
     'BITNOT',
@@ -400,10 +427,8 @@ def make_quaternary_function_expression(EXPRESSION):
     return or_equals([make_n_ary_function(f, 4, EXPRESSION) for f in func_names])
 
 
-def get_function_expression(EXPRESSION):
-    def func_expression_for(names, arity, num_optional):
-        return or_equals([make_n_ary_function(f, arity, EXPRESSION) for f in names])
-
+def get_function_alternatives(EXPRESSION):
+    # One MatchFirst over every function; kept for comparison with the dispatch
     return (
         # Nullary Function Expressions
         make_context_function_expression(EXPRESSION)
@@ -426,3 +451,91 @@ def get_function_expression(EXPRESSION):
         # Quaternary Function Expressions
         | make_quaternary_function_expression(EXPRESSION)
     )
+
+
+class FunctionDispatch(GrammarToken):
+    """
+    Matches a function call by reading the function name once and looking up
+    its signature, then parsing a generic argument list and checking the
+    number of arguments against the signature.  Accepts the same calls as
+    get_function_alternatives without building an argument list per arity.
+    """
+
+    default_name = 'function call'
+
+    def __init__(self, signatures, EXPRESSION):
+        super().__init__()
+        self.signatures = signatures
+        self.expression = EXPRESSION
+        self.empty = Literal('()')
+        self.open = Literal('(')
+        self.comma = Literal(',')
+        self.close = Literal(')')
+
+    def signature_at(self, instring, loc):
+        """
+        The signature of the function named at loc and where its name ends,
+        or (None, loc) if no function is named there
+        """
+        match = FUNCTION_NAME.match(instring, loc)
+        if match is None or (loc > 0 and instring[loc - 1] in FUNCTION_NAME_CHARS):
+            return None, loc
+        return self.signatures.get(match.group().upper()), match.end()
+
+    def parseImpl(self, instring, loc, doActions=True):
+        signature, name_end = self.signature_at(instring, loc)
+        if signature is None:
+            raise ParseException(instring, loc, self.errmsg, self)
+        tokens = ParseResults([signature.name])
+        loc = name_end
+        if signature.max_args == 0:
+            # the nullary alternatives matched an empty list as one '()' token
+            try:
+                loc, parens = self.empty._parse(instring, loc, doActions)
+            except ParseException:
+                pass
+            else:
+                tokens += parens
+                return loc, tokens
+        try:
+            loc, paren = self.open._parse(instring, loc, doActions)
+        except ParseException:
+            if signature.optional_parens:
+                return loc, tokens
+            raise
+        tokens += paren
+        arg_locs = []
+        if not instring.startswith(')', self.close.preParse(instring, loc)):
+            while True:
+                arg_locs.append(self.expression.preParse(instring, loc))
+                loc, arg = self.expression._parse(instring, loc, doActions)
+                tokens += arg
+                try:
+                    loc, comma = self.comma._parse(instring, loc, doActions)
+                except ParseException:
+                    break
+                tokens += comma
+        loc, paren = self.close._parse(instring, loc, doActions)
+        self.check_arity(instring, loc - 1, signature, arg_locs)
+        tokens += paren
+        return loc, tokens
+
+    def check_arity(self, instring, close_loc, signature, arg_locs):
+        """
+        Raise a ParseFatalException at the first extra argument, or at the
+        closing parenthesis if there are too few, rather than backtracking
+        into a less helpful error
+        """
+        message = arity_error(signature, len(arg_locs))
+        if message is not None:
+            loc = close_loc
+            if len(arg_locs) > signature.max_args:
+                loc = arg_locs[signature.max_args]
+            raise ParseFatalException(instring, loc, message, self)
+
+    def recurse(self):
+        return [self.expression, self.empty, self.open, self.comma, self.close]
+
+
+def get_function_expression(EXPRESSION):
+    return FunctionDispatch(SIGNATURES, EXPRESSION)
@@ -0,0 +1,271 @@
+"""
+see https://github.com/mozilla/moz-sql-parser/blob/dev/moz_sql_parser/sql_parser.py
+"""
+import re
+
+from pyparsing import (
+    CaselessKeyword,
+    Word,
+    Keyword,
+    Literal,
+    alphanums,
+    nums,
+    alphas,
+    OneOrMore,
+    delimitedList,
+    Group,
+    Optional,
+    pyparsing_common,
+    oneOf,
+    StringEnd,
+    Suppress,
+    Combine,
+    ZeroOrMore,
+    QuotedString,
+    Forward,
+    opAssoc,
+    Regex,
+)
+
+from clauses import ClauseDispatch
+from functions import get_function_expression
+from identifiers import UnreservedWord
+from precedence import ExpressionList, OperatorPrecedence
+
+EXPRESSION = Forward()
+
+FUNCTION_EXPRESSION = get_function_expression(EXPRESSION)
+
+
+SELECT = CaselessKeyword('select')
+FROM = CaselessKeyword('from')
+WHERE = CaselessKeyword('where')
+IS = CaselessKeyword('is')
+NOT = CaselessKeyword('not')
+NULL = CaselessKeyword('null')
+CASE = CaselessKeyword('case')
+END = CaselessKeyword('end')
+WHEN = CaselessKeyword('when')
+THEN = CaselessKeyword('then')
+ELSE = CaselessKeyword('else')
+SPLAT = Keyword('*')
+AS = CaselessKeyword('as')
+DISTINCT = CaselessKeyword('distinct')
+ALL = CaselessKeyword('ALL')
+IN = CaselessKeyword('in')
+GROUP = CaselessKeyword('group')
+BY = CaselessKeyword('by')
+HAVING = CaselessKeyword('having')
+QUALIFY = CaselessKeyword('qualify')
+ORDER = CaselessKeyword('order')
+ASC = CaselessKeyword('asc')
+DESC = CaselessKeyword('desc')
+NULLS = CaselessKeyword('nulls')
+FIRST = CaselessKeyword('first')
+LAST = CaselessKeyword('last')
+LIMIT = CaselessKeyword('limit')
+OFFSET = CaselessKeyword('offset')
+FETCH = CaselessKeyword('fetch')
+NEXT = CaselessKeyword('next')
+ROW = CaselessKeyword('row')
+ROWS = CaselessKeyword('rows')
+ONLY = CaselessKeyword('only')
+
+# Words that cannot be identifiers.  SPLAT is not a word, so it is not here.
+# Snowflake does not reserve LIMIT or FETCH, but they are here so that a
+# column without a FROM clause does not take them for its alias.
+KEYWORDS = [
+    SELECT,
+    FROM,
+    WHERE,
+    IS,
+    NOT,
+    NULL,
+    CASE,
+    END,
+    WHEN,
+    THEN,
+    ELSE,
+    AS,
+    DISTINCT,
+    ALL,
+    IN,
+    GROUP,
+    HAVING,
+    QUALIFY,
+    ORDER,
+    LIMIT,
+    FETCH,
+]
+
+IDENTIFIER = UnreservedWord(keyword.match for keyword in KEYWORDS)
+
+## Expressions
+QUOTED_SQL_STRING = QuotedString("'")
+
+## Define Numbers
+DIGIT = Word(nums, asKeyword=True)
+INTEGER = DIGIT('integer')
+REAL_NUMBER = (DIGIT + '.' + DIGIT)('real_number')
+NUMBER = REAL_NUMBER | INTEGER
+
+## Operator Expressions
+## Unary, arithmetic, comparison, IS NULL and logical operators all go through a
+## single precedence table (tightest first), parsed in one pass by
+## OperatorPrecedence.  The narrower expressions use a prefix of the table.
+
+TRUE = CaselessKeyword('true')
+FALSE = CaselessKeyword('false')
+AND = CaselessKeyword('and')
+OR = CaselessKeyword('or')
+
+OPERAND = Forward()
+
+## What can follow an expression but cannot start an operator, so the
+## operators need not be tried after an operand that is followed by it
+END_OF_EXPRESSION = (
+    r'\s*(?:[,;)]|$|(?:as|from|when|then|else|end|where|group|having|qualify'
+    r'|order|asc|desc|nulls|limit|offset|fetch)\b)'
+)
+
+## What an operator starts with, so that a function call or CASE expression on
+## its own can be told from one that operators apply to
+START_OF_OPERATOR = r'\s*(?:::|\|\||[-+*/%=!<>]|(?:not|in|is|and|or)\b)'
+
+## As in Snowflake, a cast binds tighter than anything else (so -x::int is
+## -(x::int)), and || binds looser than + and - but tighter than comparisons.
+DATA_TYPE = Word(alphas, alphanums + '_') + Optional('(' + delimitedList(DIGIT) + ')')
+CAST_OPERATOR = Literal('::') + DATA_TYPE
+CONCAT_OPERATOR = Literal('||')
+
+ARITHMETIC_OPERATORS = [
+    (CAST_OPERATOR, 1, opAssoc.LEFT),
+    (oneOf('- +'), 1, opAssoc.RIGHT),
+    (oneOf('* / %'), 2, opAssoc.LEFT),
+    (oneOf('+ -'), 2, opAssoc.LEFT),
+    (CONCAT_OPERATOR, 2, opAssoc.LEFT),
+]
+ARITHMETIC_EXPRESSION = OperatorPrecedence(
+    OPERAND, ARITHMETIC_OPERATORS, stop=END_OF_EXPRESSION
+)
+
+COMPARISON_OPERATOR = oneOf('= != <> > < <= >=')
+IN_LIST = Suppress('(') + ExpressionList(EXPRESSION) + Suppress(')')
+IN_OPERATOR = Optional(NOT) + IN + IN_LIST
+## Comparisons do not chain, and a comparison must compare something
+COMPARISON_OPERATORS = ARITHMETIC_OPERATORS + [
+    (COMPARISON_OPERATOR, 2, None),
+    (IN_OPERATOR, 1, opAssoc.LEFT),
+    (IS + Optional(NOT) + NULL, 1, opAssoc.LEFT),
+]
+COMPARISON_EXPRESSION = OperatorPrecedence(
+    OPERAND,
+    COMPARISON_OPERATORS,
+    stop=END_OF_EXPRESSION,
+    required=len(ARITHMETIC_OPERATORS),
+)
+
+## NOT, AND and OR take comparisons, true, false and identifiers, which are
+## told apart as the whole table is parsed rather than parsed as alternatives
+BOOLEAN_OPERATORS = [
+    (NOT, 1, opAssoc.RIGHT),
+    (AND, 2, opAssoc.LEFT),
+    (OR, 2, opAssoc.LEFT),
+]
+BOOLEAN_ATOM = TRUE | FALSE | IDENTIFIER
+BOOLEAN_EXPRESSION = OperatorPrecedence(
+    OPERAND,
+    COMPARISON_OPERATORS + BOOLEAN_OPERATORS,
+    stop=END_OF_EXPRESSION,
+    required=len(ARITHMETIC_OPERATORS),
+    logical=len(COMPARISON_OPERATORS),
+    atom=BOOLEAN_ATOM,
+)
+
+## Any expression, boolean or not, through the whole table
+VALUE_EXPRESSION = OperatorPrecedence(
+    OPERAND, COMPARISON_OPERATORS + BOOLEAN_OPERATORS, stop=END_OF_EXPRESSION
+)
+
+CASE_EXPRESSION = (
+    CASE
+    + OneOrMore(WHEN + BOOLEAN_EXPRESSION + THEN + (IDENTIFIER | NUMBER))
+    + Optional(ELSE + (IDENTIFIER | NUMBER))
+    + END
+)
+
+OPERAND << (
+    FUNCTION_EXPRESSION
+    | CASE_EXPRESSION
+    | TRUE
+    | FALSE
+    | NUMBER
+    | IDENTIFIER
+    | QUOTED_SQL_STRING
+)
+## End Expressions
+
+
+TABLE_NAME = IDENTIFIER('table')
+SCHEMA_NAME = IDENTIFIER('schema')
+DATABASE_NAME = IDENTIFIER('database')
+TABLE_OBJECT = (
+    DATABASE_NAME + '.' + SCHEMA_NAME + '.' + TABLE_NAME
+    | SCHEMA_NAME + '.' + TABLE_NAME
+    | TABLE_NAME
+)
+ALIAS = Optional(AS) + IDENTIFIER('alias_name')
+## A function call or CASE expression on its own keeps its tokens flat, as it
+## did before operators could apply to it; anything else goes through the
+## operator table, which groups an operand of several tokens.  (A Forward,
+## so that naming the expression below does not copy the elements inside.)
+LONE_OPERAND = Forward()
+LONE_OPERAND << (FUNCTION_EXPRESSION | CASE_EXPRESSION) + ~Regex(
+    START_OF_OPERATOR, re.IGNORECASE
+)
+EXPRESSION << (LONE_OPERAND | VALUE_EXPRESSION)('expression')
+
+COLUMN = Group(EXPRESSION + Optional(ALIAS))
+COLUMN_LIST = ExpressionList(COLUMN)('column_list')
+FROM_CLAUSE = FROM + TABLE_OBJECT
+
+## The clauses after FROM each start with their own keyword, which
+## SELECT_CLAUSES looks up rather than trying every clause in turn
+WHERE_CLAUSE = WHERE + EXPRESSION
+GROUP_BY_CLAUSE = GROUP + BY + ExpressionList(EXPRESSION)
+HAVING_CLAUSE = HAVING + EXPRESSION
+QUALIFY_CLAUSE = QUALIFY + EXPRESSION
+ORDER_ITEM = Group(EXPRESSION + Optional(ASC | DESC) + Optional(NULLS + (FIRST | LAST)))
+ORDER_BY_CLAUSE = ORDER + BY + ExpressionList(ORDER_ITEM)
+LIMIT_CLAUSE = LIMIT + DIGIT + Optional(OFFSET + DIGIT)
+FETCH_CLAUSE = (
+    Optional(OFFSET + DIGIT + Optional(ROW | ROWS))
+    + FETCH
+    + Optional(FIRST | NEXT)
+    + DIGIT
+    + Optional(ROW | ROWS)
+    + Optional(ONLY)
+)
+SELECT_CLAUSES = ClauseDispatch(
+    [
+        {'where': WHERE_CLAUSE},
+        {'group': GROUP_BY_CLAUSE},
+        {'having': HAVING_CLAUSE},
+        {'qualify': QUALIFY_CLAUSE},
+        {'order': ORDER_BY_CLAUSE},
+        {'limit': LIMIT_CLAUSE, 'offset': FETCH_CLAUSE, 'fetch': FETCH_CLAUSE},
+    ]
+)
+
+SELECT_STATEMENT = (
+    SELECT
+    + Optional(DISTINCT | ALL)
+    + (SPLAT | COLUMN_LIST)
+    + Optional(FROM_CLAUSE)
+    + SELECT_CLAUSES
+    + ';'
+)
+
+STATEMENT_DEF = SELECT_STATEMENT('select_statement')
+
+STATEMENTS = OneOrMore(STATEMENT_DEF)
@@ -0,0 +1,53 @@
+"""
+Temporarily replace how the elements of one grammar parse, without touching
+pyparsing's class-level state (so other grammars in the process are unaffected)
+"""
+from contextlib import contextmanager
+
+
+def grammar_elements(root):
+    elements = {}
+    stack = [root]
+    while stack:
+        element = stack.pop()
+        if id(element) not in elements:
+            elements[id(element)] = element
+            stack.extend(element.recurse())
+    return list(elements.values())
+
+
+@contextmanager
+def overrides(assignments):
+    """
+    Set each (obj, name, value) in assignments as an instance attribute for
+    the duration of the block, then put back whatever was there before
+    """
+    assignments = list(assignments)
+    missing = object()
+    previous = [vars(obj).get(name, missing) for obj, name, _ in assignments]
+    for obj, name, value in assignments:
+        setattr(obj, name, value)
+    try:
+        yield
+    finally:
+        for (obj, name, _), value in zip(reversed(assignments), reversed(previous)):
+            if value is missing:
+                delattr(obj, name)
+            else:
+                setattr(obj, name, value)
+
+
+@contextmanager
+def wrap_parse(root, wrapper):
+    """
+    For the duration of the block, every element reachable from root parses
+    through wrapper(element, parse), where parse is the element's current
+    _parse.  Elements are shared, so this is not safe while another thread is
+    parsing with the same grammar.
+    """
+    elements = grammar_elements(root)
+    assignments = [
+        (element, '_parse', wrapper(element, element._parse)) for element in elements
+    ]
+    with overrides(assignments):
+        yield elements
@@ -0,0 +1,131 @@
+"""
+Identifiers that are not reserved words, checked with one regular expression
+match and a set lookup rather than by trying every keyword first.
+"""
+import re
+
+from pyparsing import ParseException, ParseResults
+
+from precedence import GrammarToken
+
+IDENTIFIER_NAME = re.compile(r'[A-Za-z][A-Za-z0-9_$]*')
+
+# https://docs.snowflake.com/en/sql-reference/reserved-keywords
+SNOWFLAKE_RESERVED_WORDS = frozenset(
+    [
+        'ACCOUNT',
+        'ALL',
+        'ALTER',
+        'AND',
+        'ANY',
+        'AS',
+        'BETWEEN',
+        'BY',
+        'CASE',
+        'CAST',
+        'CHECK',
+        'COLUMN',
+        'CONNECT',
+        'CONNECTION',
+        'CONSTRAINT',
+        'CREATE',
+        'CROSS',
+        'CURRENT',
+        'CURRENT_DATE',
+        'CURRENT_TIME',
+        'CURRENT_TIMESTAMP',
+        'CURRENT_USER',
+        'DATABASE',
+        'DELETE',
+        'DISTINCT',
+        'DROP',
+        'ELSE',
+        'EXISTS',
+        'FALSE',
+        'FOLLOWING',
+        'FOR',
+        'FROM',
+        'FULL',
+        'GRANT',
+        'GROUP',
+        'GSCLUSTER',
+        'HAVING',
+        'ILIKE',
+        'IN',
+        'INCREMENT',
+        'INNER',
+        'INSERT',
+        'INTERSECT',
+        'INTO',
+        'IS',
+        'ISSUE',
+        'JOIN',
+        'LATERAL',
+        'LEFT',
+        'LIKE',
+        'LOCALTIME',
+        'LOCALTIMESTAMP',
+        'MINUS',
+        'NATURAL',
+        'NOT',
+        'NULL',
+        'OF',
+        'ON',
+        'OR',
+        'ORDER',
+        'ORGANIZATION',
+        'QUALIFY',
+        'REGEXP',
+        'REVOKE',
+        'RIGHT',
+        'RLIKE',
+        'ROW',
+        'ROWS',
+        'SAMPLE',
+        'SCHEMA',
+        'SELECT',
+        'SET',
+        'SOME',
+        'START',
+        'TABLE',
+        'TABLESAMPLE',
+        'THEN',
+        'TO',
+        'TRIGGER',
+        'TRUE',
+        'TRY_CAST',
+        'UNION',
+        'UNIQUE',
+        'UPDATE',
+        'USING',
+        'VALUES',
+        'VIEW',
+        'WHEN',
+        'WHENEVER',
+        'WHERE',
+        'WITH',
+    ]
+)
+
+
+class UnreservedWord(GrammarToken):
+    """
+    Matches the same names as Word(alphas, alphanums + '_$'), except those in
+    reserved_words (compared case-insensitively).  The cost of the check does
+    not depend on how many words are reserved.
+    """
+
+    default_name = 'identifier'
+
+    def __init__(self, reserved_words):
+        super().__init__()
+        self.reserved_words = frozenset(word.upper() for word in reserved_words)
+        # like the ~keyword + Word(...) it replaces, a named identifier is a
+        # one-item list
+        self.saveAsList = True
+
+    def parseImpl(self, instring, loc, doActions=True):
+        match = IDENTIFIER_NAME.match(instring, loc)
+        if match is None or match.group().upper() in self.reserved_words:
+            raise ParseException(instring, loc, self.errmsg, self)
+        return match.end(), ParseResults([match.group()])
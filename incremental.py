@@ -0,0 +1,70 @@
+"""
+Keep a script parsed while it is being edited, for editor integrations.
+
+Each edit only re-parses the statements from the one containing the start of
+the edit up to the first statement boundary that is back where it was before
+the edit (shifted by the change in length).  Every other Statement is reused,
+so the cost of an edit depends on the size of the statements it touches, not
+the size of the script.
+"""
+from bisect import bisect_right
+
+from run import parse_statement
+from statements import statement_end
+
+
+class IncrementalParser:
+    def __init__(self, text=''):
+        self.text = text
+        self.statements = []
+        self.reparse(0, 0, 0)
+
+    def edit(self, start, end, replacement):
+        """
+        Replace text[start:end] with replacement, returning the Statements
+        that had to be parsed again
+        """
+        if not 0 <= start <= end <= len(self.text):
+            raise ValueError(f'edit range {start}:{end} is outside the text')
+        self.text = self.text[:start] + replacement + self.text[end:]
+        first = max(0, bisect_right(self.offsets(), start) - 1)
+        return self.reparse(first, end, len(replacement) - (end - start))
+
+    def offsets(self):
+        return [statement.offset for statement in self.statements]
+
+    def reparse(self, first, old_end, delta):
+        """
+        Parse statements from self.statements[first] onwards until one starts
+        where an unedited old statement (one starting at or after old_end)
+        has moved to, then reuse the rest
+        """
+        old = self.statements
+        pos = old[first].offset if old else 0
+        new_end = old_end + delta
+        reparsed = []
+        reused = []
+        following = first + 1
+        while True:
+            while following < len(old) and old[following].offset + delta < pos:
+                following += 1
+            if (
+                pos >= new_end
+                and following < len(old)
+                and old[following].offset >= old_end
+                and old[following].offset + delta == pos
+            ):
+                reused = [
+                    statement._replace(offset=statement.offset + delta)
+                    for statement in old[following:]
+                ]
+                break
+            end = statement_end(self.text, pos)
+            if end == -1:
+                if self.text[pos:].strip():
+                    reparsed.append(parse_statement(self.text[pos:], pos))
+                break
+            reparsed.append(parse_statement(self.text[pos:end], pos))
+            pos = end
+        self.statements = old[:first] + reparsed + reused
+        return reparsed
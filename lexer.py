@@ -0,0 +1,152 @@
+"""
+Split Snowflake SQL into tokens with one regular expression, in a single pass.
+
+tokenize gives the tokens of a text.  token_matching makes the leaf elements
+of a grammar (words, identifiers, numbers, strings, keywords and literals)
+match by looking up the token that starts where they are tried, rather than
+scanning the characters again for every alternative.
+"""
+import re
+from collections import namedtuple
+from contextlib import contextmanager
+
+from pyparsing import Keyword, Literal, ParseException, QuotedString, Word, nums
+
+from hooks import grammar_elements, overrides
+from identifiers import IDENTIFIER_NAME, UnreservedWord
+
+Lexeme = namedtuple('Lexeme', ['kind', 'text', 'start', 'end'])
+
+# Strings are what QuotedString("'") matches: no escapes and no line breaks.
+# Numbers are runs of digits only: the grammar builds decimals from digits and
+# '.', and a word character straight after the digits makes it an error.
+TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<whitespace>\s+)
+    | (?P<comment>--[^\n]*|//[^\n]*|/\*.*?\*/)
+    | (?P<string>'[^'\n\r]*')
+    | (?P<quoted_identifier>"(?:[^"]|"")*")
+    | (?P<number>\d+(?![A-Za-z0-9_$]))
+    | (?P<word>[A-Za-z_][A-Za-z0-9_$]*)
+    | (?P<operator>::|\|\||<=|>=|<>|!=|=>|->|[-+*/%=<>(),.;:\[\]{}|^&~@])
+    | (?P<error>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+SKIPPED_KINDS = frozenset(['whitespace', 'comment'])
+
+
+def tokenize(text):
+    """
+    The tokens of text, without whitespace and comments.  Characters that
+    start no token (and unterminated strings and comments) are 'error' tokens.
+    """
+    return [
+        Lexeme(match.lastgroup, match.group(), match.start(), match.end())
+        for match in TOKEN_PATTERN.finditer(text)
+        if match.lastgroup not in SKIPPED_KINDS
+    ]
+
+
+def token_index():
+    """
+    A function giving the tokens of a text by start position.  It keeps them
+    for the most recent text it was given, so a parse tokenizes its input
+    only once.
+    """
+    last = (None, None)
+
+    def tokens_by_start(text):
+        nonlocal last
+        last_text, tokens = last
+        if text is not last_text:
+            tokens = {token.start: token for token in tokenize(text)}
+            last = (text, tokens)
+        return tokens
+
+    return tokens_by_start
+
+
+def own_value(element):
+    """
+    The value element gives for the whole text of a token, from its own
+    parseImpl, which token_matching replaces on the instance
+    """
+    parse_impl = type(element).parseImpl
+    return lambda text: parse_impl(element, text, 0)[1]
+
+
+def token_parser(element, tokens_by_start):
+    """
+    A parseImpl for element that matches the token at loc (looked up with
+    tokens_by_start), or None if element is not a leaf that can be matched
+    that way.  Strings and identifiers give the same value as they would
+    from the characters.  A literal that is several tokens, like '()', matches them if
+    nothing comes between them.
+    """
+    if isinstance(element, QuotedString) and element.quote_char == "'":
+        kind, accepts, value = 'string', None, own_value(element)
+        joined = False
+    elif isinstance(element, UnreservedWord):
+        kind, value, joined = 'word', own_value(element), False
+
+        def accepts(text):
+            return (
+                IDENTIFIER_NAME.fullmatch(text) is not None
+                and text.upper() not in element.reserved_words
+            )
+
+    elif isinstance(element, Word) and element.initChars <= set(nums):
+        kind, accepts, value = 'number', None, None
+        joined = False
+    elif isinstance(element, Word):
+        kind, value, joined = 'word', None, False
+
+        def accepts(text):
+            return text[0] in element.initChars and set(text) <= element.bodyChars
+
+    elif isinstance(element, Keyword) and element.caseless:
+        kind, value, joined = None, lambda text: element.match, False
+
+        def accepts(text):
+            return text.upper() == element.caselessmatch
+
+    elif isinstance(element, (Keyword, Literal)):
+        kind, value, joined = None, None, True
+
+        def accepts(text):
+            return text == element.match
+
+    else:
+        return None
+
+    def parse_token(instring, loc, doActions=True):
+        tokens = tokens_by_start(instring)
+        token = tokens.get(loc)
+        if token is None or (kind is not None and token.kind != kind):
+            raise ParseException(instring, loc, element.errmsg, element)
+        text, end = token.text, token.end
+        if joined:
+            while len(text) < len(element.match) and end in tokens:
+                text, end = text + tokens[end].text, tokens[end].end
+        if accepts is not None and not accepts(text):
+            raise ParseException(instring, loc, element.errmsg, element)
+        return end, text if value is None else value(text)
+
+    return parse_token
+
+
+@contextmanager
+def token_matching(root):
+    """
+    For the duration of the block, the leaf elements reachable from root
+    match whole tokens.  Like hooks.wrap_parse, this changes shared elements.
+    """
+    assignments = []
+    tokens_by_start = token_index()
+    for element in grammar_elements(root):
+        parse_token = token_parser(element, tokens_by_start)
+        if parse_token is not None:
+            assignments.append((element, 'parseImpl', parse_token))
+    with overrides(assignments):
+        yield
@@ -0,0 +1,131 @@
+"""
+Collect the tables, columns and functions SELECT statements refer to.
+
+    python lineage.py file.sql ...
+
+extract_references parses a script with parse actions that note each table
+reference, column reference and function call as it is matched, and return
+no tokens in its place, so no results tree is built for a statement: all that
+is kept of it is a References of plain tuples.  Like run.parse_ast, the
+actions are installed on the shared grammar for the duration of the call, so
+this is not safe to run while another thread parses.
+"""
+import argparse
+import sys
+from collections import namedtuple
+
+from pyparsing import ParseResults
+
+import run
+from hooks import grammar_elements, overrides
+from precedence import OperatorPrecedence
+
+References = namedtuple('References', ['tables', 'columns', 'functions'])
+References.__doc__ = """
+What one statement refers to, each in the order first seen and without
+repeats: tables are (database, schema, table) tuples with None for the parts
+that are not given, columns are identifier names, and functions are function
+names as the signature registry spells them.
+"""
+
+
+class ReferenceCollector:
+    """
+    Parse actions that note references while the grammar parses, and turn
+    them into a References at the end of each statement
+    """
+
+    def __init__(self):
+        self.references = []
+        self.tables = []
+        self.columns = []
+        self.functions = []
+
+    def table(self, instring, loc, tokens):
+        names = [token for token in tokens if token != '.']
+        self.tables.append((*[None] * (3 - len(names)), *names))
+        return []
+
+    def column(self, instring, loc, tokens):
+        self.columns.append(tokens[0])
+        return []
+
+    def function(self, instring, loc, tokens):
+        self.functions.append(tokens[0])
+        return []
+
+    def statement(self, instring, loc, tokens):
+        self.references.append(
+            References(
+                tuple(dict.fromkeys(self.tables)),
+                tuple(dict.fromkeys(self.columns)),
+                tuple(dict.fromkeys(self.functions)),
+            )
+        )
+        self.tables.clear()
+        self.columns.clear()
+        self.functions.clear()
+        return []
+
+    def actions(self):
+        return {
+            'TABLE_OBJECT': self.table,
+            'IDENTIFIER': self.column,
+            'FUNCTION_EXPRESSION': self.function,
+            'STATEMENT_DEF': self.statement,
+        }
+
+
+def drop_operation(tokens):
+    return ParseResults([])
+
+
+def reference_collectors(grammar, collector):
+    """
+    The attribute overrides (for hooks.overrides) that make the grammar report
+    references to collector instead of building results.  As with
+    nodes.node_builders, the grammar must already be streamlined.
+    """
+    assignments = [
+        (grammar[name], 'parseAction', [action])
+        for name, action in collector.actions().items()
+    ]
+    for element in grammar_elements(grammar['STATEMENTS']):
+        if isinstance(element, OperatorPrecedence):
+            assignments.append((element, 'group', drop_operation))
+    return assignments
+
+
+def extract_references(sql_text):
+    """
+    A References for each statement in sql_text, raising a ParseException as
+    parse_sql does if it does not parse
+    """
+    grammar = run.get_grammar()
+    statements = grammar['STATEMENTS'].streamline()
+    collector = ReferenceCollector()
+    with overrides(reference_collectors(grammar, collector)):
+        statements.parseString(sql_text, parseAll=True)
+    return tuple(collector.references)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('paths', nargs='+')
+    args = parser.parse_args(argv)
+
+    for path in args.paths:
+        with open(path) as script:
+            references = extract_references(script.read())
+        for number, (tables, columns, functions) in enumerate(references, 1):
+            print(f'{path}:{number}')
+            for table in tables:
+                print('    table    ' + '.'.join(name for name in table if name))
+            for column in columns:
+                print('    column   ' + column)
+            for function in functions:
+                print('    function ' + function)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+Load test the parse service in service.py.
+
+    python loadtest.py [--host HOST] [--port N | --unix PATH] [--serve]
+                       [--workers N] [--queue-size N] [--concurrency N]
+                       [--requests N] [--seed N] [file.sql ...]
+
+Each request is one statement, taken in turn from the SQL files given, or from
+a corpus.py corpus if there are none.  --concurrency clients each keep one
+connection open and send their next request as soon as the last is answered.
+With --serve, a service is started in this process on a temporary Unix socket
+instead of connecting to a running one.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from corpus import generate_corpus
+from service import (
+    DEFAULT_PORT,
+    ParseService,
+    http_request,
+    percentile,
+    start_server,
+)
+from statements import split_statements
+
+
+def load_statements(paths, seed):
+    if not paths:
+        return generate_corpus(statements=200, seed=seed).splitlines()
+    statements = []
+    for path in paths:
+        with open(path) as script:
+            statements.extend(text for _, text in split_statements(script))
+    return statements
+
+
+async def open_connection(args):
+    if args.unix:
+        return await asyncio.open_unix_connection(args.unix)
+    return await asyncio.open_connection(args.host, args.port)
+
+
+async def client(args, statements, next_request, latencies, statuses):
+    reader, writer = await open_connection(args)
+    try:
+        while True:
+            number = next(next_request)
+            if number >= args.requests:
+                return
+            body = statements[number % len(statements)].encode()
+            start = time.perf_counter()
+            status, _ = await http_request(reader, writer, 'POST', '/parse', body)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] += 1
+    finally:
+        writer.close()
+
+
+async def load_test(args, statements):
+    latencies = []
+    statuses = Counter()
+    next_request = iter(range(sys.maxsize))
+    start = time.perf_counter()
+    clients = [
+        client(args, statements, next_request, latencies, statuses)
+        for _ in range(args.concurrency)
+    ]
+    await asyncio.gather(*clients)
+    seconds = time.perf_counter() - start
+
+    latencies.sort()
+    print(f'{len(latencies)} requests in {seconds:.2f} s')
+    print(f'{len(latencies) / seconds:10.1f} requests/s')
+    for name, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('max', 1)):
+        print(f'{name:>10} {percentile(latencies, fraction) * 1000:10.3f} ms')
+    print('statuses  ', dict(sorted(statuses.items())))
+
+    reader, writer = await open_connection(args)
+    try:
+        _, metrics = await http_request(reader, writer, 'GET', '/metrics')
+    finally:
+        writer.close()
+    print('service   ', metrics)
+
+
+async def serve_and_load_test(args, statements):
+    with tempfile.TemporaryDirectory() as directory:
+        args.unix = os.path.join(directory, 'service.sock')
+        service = ParseService(args.workers, args.queue_size)
+        server = await start_server(service, path=args.unix)
+        try:
+            await load_test(args, statements)
+        finally:
+            server.close()
+            await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix', help='connect to a Unix socket at this path')
+    parser.add_argument('--serve', action='store_true')
+    parser.add_argument('--workers', type=int, help='workers for --serve')
+    parser.add_argument('--queue-size', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('files', nargs='*')
+    args = parser.parse_args(argv)
+
+    statements = load_statements(args.files, args.seed)
+    if args.serve:
+        asyncio.run(serve_and_load_test(args, statements))
+    else:
+        asyncio.run(load_test(args, statements))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,282 @@
+"""
+A compact typed syntax tree, as an alternative to ParseResults.
+
+run.parse_ast builds these nodes with parse actions while it parses, so the
+tree is never held as ParseResults first.  Nodes are named tuples (with no
+instance __dict__) and keep their children in tuples, so each is a small
+fixed-size object that is cheap to walk.
+"""
+from collections import namedtuple
+
+from pyparsing import ParseResults
+
+from hooks import grammar_elements
+from precedence import OperatorPrecedence
+
+
+class Node:
+    """
+    Base of the node types, which are named tuples compared by type as well as
+    by value, so Identifier('a') != Alias('a') != ('a',)
+    """
+
+    __slots__ = ()
+
+    def __eq__(self, other):
+        return type(self) is type(other) and tuple.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((type(self), tuple(self)))
+
+    def children(self):
+        """
+        The nodes directly below this one, in source order
+        """
+        stack = list(reversed(self))
+        while stack:
+            value = stack.pop()
+            if isinstance(value, Node):
+                yield value
+            elif isinstance(value, tuple):
+                stack.extend(reversed(value))
+
+    def walk(self):
+        """
+        This node and every node below it, depth first in source order
+        """
+        stack = [self]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, tuple):
+                if isinstance(value, Node):
+                    yield value
+                stack.extend(reversed(value))
+
+
+def node_type(name, fields, defaults=None):
+    base = namedtuple(name, fields, defaults=defaults)
+    return type(name, (Node, base), {'__slots__': ()})
+
+
+# quantifier is None, 'distinct' or 'all'; table is None without a FROM, and
+# each clause after it is None when it is not given
+SELECT_CLAUSES = ('where', 'group_by', 'having', 'qualify', 'order_by', 'limit')
+Select = node_type(
+    'Select',
+    ['quantifier', 'columns', 'table', *SELECT_CLAUSES],
+    defaults=[None] * len(SELECT_CLAUSES),
+)
+Star = node_type('Star', [])
+Column = node_type('Column', ['expression', 'alias'])
+Alias = node_type('Alias', ['name'])
+TableRef = node_type('TableRef', ['database', 'schema', 'table'])
+Identifier = node_type('Identifier', ['name'])
+# kind is 'number' (value is its text), 'string' or 'boolean'
+Literal = node_type('Literal', ['value', 'kind'])
+FunctionCall = node_type('FunctionCall', ['name', 'args'])
+# op is lower case, and several words for postfix operators ('is not null')
+UnaryOp = node_type('UnaryOp', ['op', 'operand'])
+BinaryOp = node_type('BinaryOp', ['op', 'left', 'right'])
+# whens is a tuple of (condition, result) pairs
+Case = node_type('Case', ['whens', 'else_'])
+# type is lower case, with any parameters: 'varchar', 'number(38, 2)'
+Cast = node_type('Cast', ['operand', 'type'])
+# operand [NOT] IN (items)
+InList = node_type('InList', ['operand', 'negated', 'items'])
+# direction is None, 'asc' or 'desc', and nulls is None, 'first' or 'last'
+OrderItem = node_type('OrderItem', ['expression', 'direction', 'nulls'])
+# count and offset are the text of numbers; offset is None when not given
+Limit = node_type('Limit', ['count', 'offset'])
+
+# What a clause's action gives make_select: the Select field it sets, and its
+# value.  Not a node, since it is never part of the tree.
+Clause = namedtuple('Clause', ['name', 'value'])
+
+
+## Parse actions.  They are installed directly in parseAction, so they are
+## called with all three arguments rather than through pyparsing's arity check.
+
+
+def make_select(instring, loc, tokens):
+    quantifier = None
+    columns = None
+    table = None
+    clauses = {}
+    for token in tokens:
+        if isinstance(token, Clause):
+            clauses[token.name] = token.value
+        elif isinstance(token, TableRef):
+            table = token
+        elif token == '*':
+            # the statement has its own copy of SPLAT, so no action runs on it
+            columns = (Star(),)
+        elif isinstance(token, ParseResults):
+            columns = tuple(token)
+        elif token.lower() in ('distinct', 'all'):
+            quantifier = token.lower()
+    return Select(quantifier, columns, table, **clauses)
+
+
+def make_column(instring, loc, tokens):
+    expression, *alias = tokens[0]
+    return Column(expression, alias[0] if alias else None)
+
+
+def make_where(instring, loc, tokens):
+    return Clause('where', tokens[-1])
+
+
+def make_group_by(instring, loc, tokens):
+    return Clause('group_by', tuple(tokens[-1]))
+
+
+def make_having(instring, loc, tokens):
+    return Clause('having', tokens[-1])
+
+
+def make_qualify(instring, loc, tokens):
+    return Clause('qualify', tokens[-1])
+
+
+def make_order_by(instring, loc, tokens):
+    return Clause('order_by', tuple(tokens[-1]))
+
+
+def make_order_item(instring, loc, tokens):
+    expression, *words = tokens[0]
+    words = [word.lower() for word in words]
+    direction = words[0] if words[:1] in (['asc'], ['desc']) else None
+    nulls = words[-1] if 'nulls' in words else None
+    return OrderItem(expression, direction, nulls)
+
+
+def make_limit(instring, loc, tokens):
+    """
+    A Limit from LIMIT count [OFFSET offset], or from
+    [OFFSET offset ROWS] FETCH FIRST count ROWS ONLY
+    """
+    numbers = [token for token in tokens if token.isdigit()]
+    if tokens[0].lower() == 'offset':
+        return Clause('limit', Limit(numbers[1], numbers[0]))
+    offset = numbers[1] if len(numbers) > 1 else None
+    return Clause('limit', Limit(numbers[0], offset))
+
+
+def make_alias(instring, loc, tokens):
+    return Alias(tokens[-1])
+
+
+def make_table_ref(instring, loc, tokens):
+    names = [token for token in tokens if token != '.']
+    return TableRef(*[None] * (3 - len(names)), *names)
+
+
+def make_identifier(instring, loc, tokens):
+    return Identifier(tokens[0])
+
+
+def make_number(instring, loc, tokens):
+    return Literal(''.join(tokens), 'number')
+
+
+def make_string(instring, loc, tokens):
+    return Literal(tokens[0], 'string')
+
+
+def make_boolean(instring, loc, tokens):
+    return Literal(tokens[0].lower() == 'true', 'boolean')
+
+
+def make_function_call(instring, loc, tokens):
+    args = tuple(token for token in tokens[1:] if isinstance(token, Node))
+    return FunctionCall(tokens[0], args)
+
+
+def make_case(instring, loc, tokens):
+    whens = []
+    else_ = None
+    for i, token in enumerate(tokens):
+        if not isinstance(token, str):
+            continue
+        if token == 'when':
+            whens.append((tokens[i + 1], tokens[i + 3]))
+        elif token == 'else':
+            else_ = tokens[i + 1]
+    return Case(tuple(whens), else_)
+
+
+def make_cast(operand, type_tokens):
+    name, *params = type_tokens
+    if params:
+        name += '(' + ', '.join(params[1:-1]) + ')'
+    return Cast(operand, name.lower())
+
+
+def make_operation(tokens):
+    """
+    The node for one operator application grouped by OperatorPrecedence:
+    a prefix operator and its operand, an operand and the words of a postfix
+    operator (or '::' and a data type, or [NOT] IN and a list), or a chain of
+    binary operators (folded to the left)
+    """
+    first = tokens[0]
+    if isinstance(first, str):
+        return UnaryOp(first.lower(), tokens[1])
+    rest = tokens[1:]
+    if rest[0] == '::':
+        return make_cast(first, rest[1:])
+    if rest[-2].lower() == 'in':
+        return InList(first, len(rest) == 3, tuple(rest[-1]))
+    if all(isinstance(token, str) for token in rest):
+        return UnaryOp(' '.join(rest).lower(), first)
+    node = first
+    for i in range(0, len(rest), 2):
+        node = BinaryOp(rest[i].lower(), node, rest[i + 1])
+    return node
+
+
+def group_operation(tokens):
+    return ParseResults([make_operation(tokens)])
+
+
+NODE_ACTIONS = {
+    'STATEMENT_DEF': make_select,
+    'COLUMN': make_column,
+    'ALIAS': make_alias,
+    'TABLE_OBJECT': make_table_ref,
+    'IDENTIFIER': make_identifier,
+    'INTEGER': make_number,
+    'REAL_NUMBER': make_number,
+    'QUOTED_SQL_STRING': make_string,
+    'TRUE': make_boolean,
+    'FALSE': make_boolean,
+    'FUNCTION_EXPRESSION': make_function_call,
+    'CASE_EXPRESSION': make_case,
+    'WHERE_CLAUSE': make_where,
+    'GROUP_BY_CLAUSE': make_group_by,
+    'HAVING_CLAUSE': make_having,
+    'QUALIFY_CLAUSE': make_qualify,
+    'ORDER_ITEM': make_order_item,
+    'ORDER_BY_CLAUSE': make_order_by,
+    'LIMIT_CLAUSE': make_limit,
+    'FETCH_CLAUSE': make_limit,
+}
+
+
+def node_builders(grammar):
+    """
+    The attribute overrides (for hooks.overrides) that make the grammar build
+    nodes instead of plain results.  The grammar must already be streamlined,
+    since streamlining can merge elements these actions are attached to.
+    """
+    assignments = [
+        (grammar[name], 'parseAction', [action])
+        for name, action in NODE_ACTIONS.items()
+    ]
+    for element in grammar_elements(grammar['STATEMENTS']):
+        if isinstance(element, OperatorPrecedence):
+            assignments.append((element, 'group', group_operation))
+    return assignments
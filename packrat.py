@@ -0,0 +1,79 @@
+"""
+Opt-in memoized (packrat) parsing with a bounded cache.  pyparsing's own
+packrat mode is switched on for every grammar in the process; this only
+memoizes the grammar being parsed, and only for the duration of one parse.
+"""
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from hooks import wrap_parse
+
+DEFAULT_CACHE_SIZE = 4096
+
+
+class ParseCache:
+    """
+    Least-recently-used cache of (element, text, location) -> parse outcome.  A
+    max_size of None means the cache is unbounded.
+    """
+
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self.entries[key] = value
+        if self.max_size is not None and len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+
+def memoize(cache):
+    # imported here so that importing run (which imports this) stays cheap
+    from pyparsing import ParseBaseException
+
+    def wrapper(element, parse):
+        element_id = id(element)
+
+        def memoized_parse(instring, loc, do_actions=True, callPreParse=True):
+            # the text is part of the key, so a parse of some other text (say
+            # from a parse action) never gets this one's results
+            key = (element_id, instring, loc, do_actions, callPreParse)
+            value = cache.get(key)
+            if value is None:
+                try:
+                    value = parse(instring, loc, do_actions, callPreParse)
+                except ParseBaseException as exc:
+                    cache.set(key, exc.__class__(*exc.args))
+                    raise
+                cache.set(key, (value[0], value[1].copy()))
+                return value
+            if isinstance(value, Exception):
+                raise value
+            return value[0], value[1].copy()
+
+        return memoized_parse
+
+    return wrapper
+
+
+@contextmanager
+def memoized(root, cache_size=DEFAULT_CACHE_SIZE):
+    cache = ParseCache(cache_size)
+    with wrap_parse(root, memoize(cache)):
+        yield cache
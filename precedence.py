@@ -0,0 +1,268 @@
+"""
+Precedence-climbing operator expressions.
+
+Takes the same operator table as pyparsing's infixNotation and builds results
+the same shape (parentheses suppressed, each operator application grouped,
+an operand of several tokens grouped as one), but parses in a single
+left-to-right pass: each operand is parsed once and each operator is tried
+once after it, so there is no lookahead or re-parsing of shared prefixes and
+parse time grows linearly with nesting depth.  Where the optional stop pattern
+matches after an operand (say at a ',' or ')'), no operator is tried at all,
+so a plain column or list item costs one operand.
+
+Besides opAssoc.LEFT and opAssoc.RIGHT, a binary operator's associativity can
+be None: the operator does not chain, so once applied, neither it nor a
+tighter operator can follow (a < b < c does not parse, as in SQL).
+
+GrammarToken is the base of these and the grammar's other elements written in
+Python (function calls, clauses, identifiers).
+"""
+import re
+
+from pyparsing import Literal, ParseException, ParseResults, Suppress, Token, opAssoc
+
+
+class GrammarToken(Token):
+    """
+    A Token whose parseImpl is written in Python, parsing with the elements
+    recurse() gives.  It is named default_name in messages, and is not empty
+    unless the subclass says so after calling __init__.
+    """
+
+    default_name = 'token'
+
+    def __init__(self):
+        super().__init__()
+        self.mayReturnEmpty = False
+        self.mayIndexError = False
+        self.errmsg = 'Expected ' + self.default_name
+
+    def _generateDefaultName(self):
+        return self.default_name
+
+    def streamline(self):
+        if not self.streamlined:
+            super().streamline()
+            for element in self.recurse():
+                element.streamline()
+        return self
+
+
+class OperatorPrecedence(GrammarToken):
+    """
+    If required is given, the expression must be a condition: an application
+    of operators[required] or a looser operator, or an operand that atom (if
+    given) matches.  Parentheses do not change what an expression is.  If
+    logical is also given, the operands of operators[logical] and looser
+    operators must be conditions too.  Both are checked as the expression is
+    parsed, so telling a condition apart costs no backtracking.
+    """
+
+    default_name = 'expression'
+
+    def __init__(
+        self,
+        operand,
+        operators,
+        lpar='(',
+        rpar=')',
+        stop=None,
+        required=None,
+        logical=None,
+        atom=None,
+    ):
+        super().__init__()
+        self.operand = operand
+        self.required = required
+        self.logical = logical
+        self.atom = atom
+        self.stop = None if stop is None else re.compile(stop, re.IGNORECASE)
+        self.operators = [
+            (Literal(op) if isinstance(op, str) else op, arity, assoc)
+            for op, arity, assoc in operators
+        ]
+        self.lpar = Suppress(lpar)
+        self.rpar = Suppress(rpar)
+
+    def parseImpl(self, instring, loc, doActions=True):
+        end, tokens, condition = self.climb(
+            instring, loc, doActions, len(self.operators) - 1
+        )
+        if self.required is not None and not condition:
+            raise ParseException(instring, loc, 'Expected condition', self)
+        return end, tokens
+
+    def climb(self, instring, loc, doActions, max_level):
+        """
+        Parse an expression using only operators at or tighter than
+        self.operators[max_level]; operators are listed tightest first.
+        Returns the end of the expression, its tokens and whether it is a
+        condition.
+        """
+        loc, tokens, condition = self.parse_prefixed(
+            instring, loc, doActions, max_level
+        )
+        return self.apply_operators(
+            instring, loc, doActions, tokens, condition, max_level
+        )
+
+    def apply_operators(self, instring, loc, doActions, tokens, condition, max_level):
+        """
+        Apply the postfix and binary operators up to max_level that follow
+        the operand parsed into tokens.  Consecutive left-associative
+        operators at the same level are collected into one flat group, as
+        infixNotation does.  Groups are built from lists of the operands'
+        results, so that their results names are not merged into the group.
+        """
+        min_level = 0
+        chain_level = None
+        chain = None
+        while self.stop is None or not self.stop.match(instring, loc):
+            match = self.match_operator(instring, loc, doActions, min_level, max_level)
+            if match is None:
+                break
+            level, op_loc, op_items, rhs_condition = match
+            if self.is_logical(level) and not (condition and rhs_condition):
+                raise ParseException(instring, loc, 'Expected condition', self)
+            loc = op_loc
+            condition = self.is_condition(level)
+            _, arity, assoc = self.operators[level]
+            if arity == 2 and assoc == opAssoc.LEFT and level == chain_level:
+                chain.extend(op_items)
+                continue
+            if chain_level is not None:
+                tokens = self.group(ParseResults(chain))
+                chain_level = None
+            if arity == 2 and assoc == opAssoc.LEFT:
+                chain = list(tokens) + op_items
+                chain_level = level
+            else:
+                tokens = self.group(ParseResults(list(tokens) + op_items))
+            min_level = level + 1 if arity == 2 and assoc is None else level
+        if chain_level is not None:
+            tokens = self.group(ParseResults(chain))
+        return loc, tokens, condition
+
+    def is_condition(self, level):
+        return self.required is not None and level >= self.required
+
+    def is_logical(self, level):
+        return self.logical is not None and level >= self.logical
+
+    def group(self, tokens):
+        """
+        Results for one operator application: its tokens as a nested list.
+        Can be replaced on an instance to build something else from them.
+        """
+        return ParseResults([tokens])
+
+    def match_operator(self, instring, loc, doActions, min_level, max_level):
+        """
+        Find the tightest postfix or binary operator that can follow an
+        operand at loc: its level, end, the items of the operator and its
+        right-hand operand, and whether that operand is a condition.
+        """
+        for level in range(min_level, max_level + 1):
+            op, arity, assoc = self.operators[level]
+            if arity == 1 and assoc == opAssoc.RIGHT:
+                continue
+            rhs_condition = True
+            try:
+                op_loc, op_tokens = op._parse(instring, loc, doActions)
+                op_items = list(op_tokens)
+                if arity == 2:
+                    rhs_level = level if assoc == opAssoc.RIGHT else level - 1
+                    op_loc, rhs, rhs_condition = self.climb(
+                        instring, op_loc, doActions, rhs_level
+                    )
+                    op_items.extend(rhs)
+            except ParseException:
+                continue
+            return level, op_loc, op_items, rhs_condition
+        return None
+
+    def parse_prefixed(self, instring, loc, doActions, max_level):
+        for level in range(max_level + 1):
+            op, arity, assoc = self.operators[level]
+            if arity != 1 or assoc != opAssoc.RIGHT:
+                continue
+            try:
+                op_loc, op_tokens = op._parse(instring, loc, doActions)
+                op_loc, operand, condition = self.climb(
+                    instring, op_loc, doActions, level
+                )
+            except ParseException:
+                continue
+            if self.is_logical(level) and not condition:
+                raise ParseException(instring, op_loc, 'Expected condition', self)
+            tokens = self.group(ParseResults(list(op_tokens) + list(operand)))
+            return op_loc, tokens, self.is_condition(level)
+        return self.parse_operand(instring, loc, doActions)
+
+    def parse_operand(self, instring, loc, doActions):
+        """
+        Parse an operand, or else a parenthesized expression, as
+        infixNotation does.  An operand's tokens are grouped if there are
+        several of them, so that it is one item in an operator's group.
+        """
+        try:
+            operand_loc, tokens = self.operand._parse(instring, loc, doActions)
+        except ParseException as error:
+            try:
+                loc, _ = self.lpar._parse(instring, loc, doActions)
+            except ParseException:
+                raise error from None
+            loc, tokens, condition = self.climb(
+                instring, loc, doActions, len(self.operators) - 1
+            )
+            loc, _ = self.rpar._parse(instring, loc, doActions)
+            return loc, tokens, condition
+        if len(tokens) > 1:
+            tokens = ParseResults([tokens])
+        return operand_loc, tokens, self.is_atom(instring, loc, operand_loc)
+
+    def is_atom(self, instring, loc, end):
+        """
+        Whether atom matches exactly the operand from loc to end
+        """
+        if self.atom is None:
+            return False
+        try:
+            atom_end, _ = self.atom._parse(instring, loc, False)
+        except ParseException:
+            return False
+        return atom_end == end
+
+    def recurse(self):
+        operators = [op for op, _, _ in self.operators]
+        atom = [] if self.atom is None else [self.atom]
+        return [self.operand, self.lpar, self.rpar] + operators + atom
+
+
+class ExpressionList(GrammarToken):
+    """
+    Expressions separated by commas, grouped as Group(delimitedList(expression))
+    would group them.  The group is built by extending one list, because adding
+    each item's results (and so merging their results names) into the group
+    takes time that grows with the length of the list.
+    """
+
+    default_name = 'expression list'
+
+    def __init__(self, expression, delimiter=','):
+        super().__init__()
+        self.expression = expression
+        self.delimiter = Suppress(delimiter)
+
+    def parseImpl(self, instring, loc, doActions=True):
+        items = []
+        while True:
+            loc, tokens = self.expression._parse(instring, loc, doActions)
+            items.extend(tokens)
+            try:
+                loc, _ = self.delimiter._parse(instring, loc, doActions)
+            except ParseException:
+                return loc, ParseResults([ParseResults(items)])
+
+    def recurse(self):
+        return [self.expression, self.delimiter]
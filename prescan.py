@@ -0,0 +1,102 @@
+"""
+Catch the common structural mistakes in a script in one linear pass, before
+running the grammar: unbalanced parentheses, unterminated strings, statements
+that do not start with select, and a missing final ';'.
+
+    python prescan.py file.sql ...
+
+A script with none of these problems can still fail to parse, but one with
+any of them certainly will, and the pre-scan finds them much faster and says
+exactly where they are.
+"""
+import re
+import sys
+from collections import namedtuple
+
+SPECIAL = re.compile(r"[();']")
+STATEMENT_START = re.compile(r'\s*select(?![A-Za-z0-9_$])', re.IGNORECASE)
+LEADING_SPACE = re.compile(r'\s*')
+
+Problem = namedtuple('Problem', ['loc', 'message'])
+Problem.__doc__ = """
+A structural error at character offset loc of the script
+"""
+
+
+def check_start(text, start, problems):
+    if not STATEMENT_START.match(text, start):
+        loc = LEADING_SPACE.match(text, start).end()
+        problems.append(Problem(loc, "Expected statement to start with 'select'"))
+
+
+def find_problems(text):
+    """
+    Every structural problem in text, in order of position
+    """
+    problems = []
+    open_parens = []
+    start = 0
+    match = SPECIAL.search(text)
+    while match is not None:
+        loc = match.start()
+        char = match.group()
+        if char == "'":
+            end = text.find("'", loc + 1)
+            if end == -1:
+                problems.append(Problem(loc, 'Unterminated string'))
+                return problems
+            match = SPECIAL.search(text, end + 1)
+            continue
+        if char == '(':
+            open_parens.append(loc)
+        elif char == ')':
+            if open_parens:
+                open_parens.pop()
+            else:
+                problems.append(Problem(loc, "Unmatched ')'"))
+        else:
+            check_start(text, start, problems)
+            problems.extend(Problem(paren, "Unclosed '('") for paren in open_parens)
+            open_parens = []
+            start = loc + 1
+        match = SPECIAL.search(text, loc + 1)
+    problems.extend(Problem(paren, "Unclosed '('") for paren in open_parens)
+    if text[start:].strip():
+        check_start(text, start, problems)
+        problems.append(Problem(len(text), "Expected ';' at end of statement"))
+    elif start == 0:
+        problems.append(Problem(len(text), 'Expected a statement'))
+    return sorted(problems)
+
+
+def check(text):
+    """
+    Raise a ParseException for the first problem in text, if there is one
+    """
+    problems = find_problems(text)
+    if problems:
+        from pyparsing import ParseException
+
+        loc, message = problems[0]
+        raise ParseException(text, loc, message)
+
+
+def line_and_column(text, loc):
+    line = text.count('\n', 0, loc) + 1
+    return line, loc - text.rfind('\n', 0, loc)
+
+
+def main(argv=None):
+    failed = 0
+    for path in sys.argv[1:] if argv is None else argv:
+        with open(path) as script:
+            text = script.read()
+        for loc, message in find_problems(text):
+            failed += 1
+            line, column = line_and_column(text, loc)
+            print(f'{path}:{line}:{column}: {message}')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
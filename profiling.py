@@ -0,0 +1,173 @@
+"""
+Count how often each named grammar element is tried, matches and fails, and
+how long it takes.
+
+    python profiling.py [--json PATH] [--sort KEY] file.sql ...
+
+Elements are named after their variables in grammar.py, and the function calls
+FUNCTION_EXPRESSION matches are also counted by the functions.py name list
+their function is in.  Instrumentation is only installed inside profiled(), so
+parsing outside it costs nothing extra.
+"""
+import argparse
+import json
+import sys
+from contextlib import contextmanager
+from time import perf_counter
+
+import run
+from functions import FunctionDispatch
+from hooks import wrap_parse
+
+SORT_KEYS = ('self_seconds', 'seconds', 'attempts', 'failures')
+
+
+class ElementStats:
+    __slots__ = ('attempts', 'successes', 'failures', 'seconds', 'self_seconds')
+
+    def __init__(self):
+        self.attempts = 0
+        self.successes = 0
+        self.failures = 0
+        # seconds includes time in other named elements tried from this one,
+        # self_seconds does not
+        self.seconds = 0.0
+        self.self_seconds = 0.0
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Profile:
+    def __init__(self):
+        self.stats = {}
+
+    def sorted(self, key='self_seconds'):
+        return sorted(
+            self.stats.items(), key=lambda item: getattr(item[1], key), reverse=True
+        )
+
+    def report(self, key='self_seconds', file=None):
+        print(
+            f'{"element":<48} {"tried":>9} {"matched":>9} {"failed":>9} '
+            f'{"total ms":>10} {"self ms":>10}',
+            file=file,
+        )
+        for name, stats in self.sorted(key):
+            if stats.attempts:
+                print(
+                    f'{name:<48} {stats.attempts:9} {stats.successes:9} '
+                    f'{stats.failures:9} {stats.seconds * 1000:10.3f} '
+                    f'{stats.self_seconds * 1000:10.3f}',
+                    file=file,
+                )
+
+    def as_dict(self, key='self_seconds'):
+        return {name: stats.as_dict() for name, stats in self.sorted(key)}
+
+    def dump(self, path, key='self_seconds'):
+        with open(path, 'w') as json_file:
+            json.dump(self.as_dict(key), json_file, indent=2)
+
+
+def element_names(grammar):
+    """
+    Name each grammar element by the first grammar.py variable holding it
+    """
+    names = {}
+    for name, value in grammar.items():
+        if hasattr(value, 'recurse'):
+            names.setdefault(id(value), name)
+    return names
+
+
+@contextmanager
+def profiled(root=None):
+    """
+    Profile the named elements reachable from root (by default the whole
+    grammar) while the block runs, yielding the Profile that collects the
+    counts.  Like hooks.wrap_parse, this is not safe while another thread is
+    parsing with the same grammar.
+    """
+    from pyparsing import ParseBaseException
+
+    grammar = run.get_grammar()
+    if root is None:
+        root = grammar['STATEMENTS']
+    names = element_names(grammar)
+    profile = Profile()
+    # time spent in named elements tried from each element being timed
+    child_seconds = []
+
+    def timed(stats, parse):
+        def profiled_parse(instring, loc, *args, **kwargs):
+            stats.attempts += 1
+            child_seconds.append(0.0)
+            start = perf_counter()
+            try:
+                result = parse(instring, loc, *args, **kwargs)
+            except ParseBaseException:
+                stats.failures += 1
+                raise
+            finally:
+                elapsed = perf_counter() - start
+                stats.seconds += elapsed
+                stats.self_seconds += elapsed - child_seconds.pop()
+                if child_seconds:
+                    child_seconds[-1] += elapsed
+            stats.successes += 1
+            return result
+
+        return profiled_parse
+
+    def by_family(dispatch, parse):
+        """
+        Time each call dispatch matches by the first name list its function
+        is in, as '<name list> arguments'
+        """
+        family_parses = {}
+
+        def family_parse(instring, loc, *args, **kwargs):
+            start = dispatch.preParse(instring, loc)
+            signature, _ = dispatch.signature_at(instring, start)
+            if signature is None:
+                return parse(instring, loc, *args, **kwargs)
+            family = signature.families[0]
+            if family not in family_parses:
+                stats = profile.stats.setdefault(f'{family} arguments', ElementStats())
+                family_parses[family] = timed(stats, parse)
+            return family_parses[family](instring, loc, *args, **kwargs)
+
+        return family_parse
+
+    def instrument(element, parse):
+        if isinstance(element, FunctionDispatch):
+            parse = by_family(element, parse)
+        name = names.get(id(element))
+        if name is None:
+            return parse
+        return timed(profile.stats.setdefault(name, ElementStats()), parse)
+
+    with wrap_parse(root.streamline(), instrument):
+        yield profile
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--json', help='write the counts to this file')
+    parser.add_argument('--sort', choices=SORT_KEYS, default='self_seconds')
+    parser.add_argument('files', nargs='+')
+    args = parser.parse_args(argv)
+
+    with profiled() as profile:
+        for path in args.files:
+            with open(path) as script:
+                run.parse_sql(script.read())
+    if args.json:
+        profile.dump(args.json, args.sort)
+    else:
+        profile.report(args.sort)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,160 +1,217 @@
 """
-see https://github.com/mozilla/moz-sql-parser/blob/dev/moz_sql_parser/sql_parser.py
-"""
-from pyparsing import (
-    CaselessKeyword,
-    Word,
-    Keyword,
-    alphanums,
-    nums,
-    alphas,
-    OneOrMore,
-    delimitedList,
-    Group,
-    Optional,
-    pyparsing_common,
-    oneOf,
-    StringEnd,
-    Combine,
-    ZeroOrMore,
-    QuotedString,
-    Forward,
-    infixNotation,
-    opAssoc,
-)
-
-from functions import get_function_expression
-
-EXPRESSION = Forward()
-
-FUNCTION_EXPRESSION = get_function_expression(EXPRESSION)
-
-
-SELECT = CaselessKeyword('select')
-FROM = CaselessKeyword('from')
-WHERE = CaselessKeyword('where')
-IS = CaselessKeyword('is')
-NOT = CaselessKeyword('not')
-NULL = CaselessKeyword('null')
-CASE = CaselessKeyword('case')
-END = CaselessKeyword('end')
-WHEN = CaselessKeyword('when')
-THEN = CaselessKeyword('then')
-ELSE = CaselessKeyword('else')
-SPLAT = Keyword('*')
-AS = CaselessKeyword('as')
-DISTINCT = CaselessKeyword('distinct')
-ALL = CaselessKeyword('ALL')
-
-KEYWORD = (
-    SELECT
-    | FROM
-    | WHERE
-    | IS
-    | NOT
-    | NULL
-    | CASE
-    | END
-    | WHEN
-    | THEN
-    | ELSE
-    | SPLAT
-    | AS
-    | DISTINCT
-    | ALL
-)
-
-IDENTIFIER = ~KEYWORD + Word(alphas, alphanums + "_$")
-
-## Expressions
-QUOTED_SQL_STRING = QuotedString("'")
-
-## Define Numbers
-DIGIT = Word(nums, asKeyword=True)
-INTEGER = DIGIT('integer')
-REAL_NUMBER = (DIGIT + '.' + DIGIT)('real_number')
-NUMBER = REAL_NUMBER | INTEGER
-
-## Simple Arithmetic Expressions
-## See https://github.com/pyparsing/pyparsing/blob/master/examples/simpleArith.py
-
-ARITHMETIC_OPERAND = NUMBER | IDENTIFIER
-ARITHMETIC_EXPRESSION = infixNotation(
-    ARITHMETIC_OPERAND,
-    [
-        (oneOf('- +'), 1, opAssoc.RIGHT),
-        (oneOf('* / %'), 2, opAssoc.LEFT),
-        (oneOf('+ -'), 2, opAssoc.LEFT),
-    ],
-)
-
-
-COMPARISON_OPERAND = ARITHMETIC_EXPRESSION
-COMPARISON_OPERATOR = oneOf('= != <> > < <= >=')
-COMPARISON_EXPRESSION = (COMPARISON_OPERAND + IS + Optional(NOT) + NULL) | (
-    COMPARISON_OPERAND + COMPARISON_OPERATOR + COMPARISON_OPERAND
-)
-
-BOOLEAN_OPERAND = (
-    CaselessKeyword('true')
-    | CaselessKeyword('false')
-    | COMPARISON_EXPRESSION
-    | IDENTIFIER
-)
-BOOLEAN_EXPRESSION = infixNotation(
-    BOOLEAN_OPERAND,
-    [
-        (CaselessKeyword('not'), 1, opAssoc.RIGHT),
-        (CaselessKeyword('and'), 2, opAssoc.LEFT),
-        (CaselessKeyword('or'), 2, opAssoc.LEFT),
-    ],
-)
-
-CASE_EXPRESSION = (
-    CASE
-    + OneOrMore(WHEN + BOOLEAN_EXPRESSION + THEN + (IDENTIFIER | NUMBER))
-    + Optional(ELSE + (IDENTIFIER | NUMBER))
-    + END
-)
-## End Expressions
+Parse Snowflake SQL.
 
-
-TABLE_NAME = IDENTIFIER('table')
-SCHEMA_NAME = IDENTIFIER('schema')
-DATABASE_NAME = IDENTIFIER('database')
-TABLE_OBJECT = (
-    DATABASE_NAME + '.' + SCHEMA_NAME + '.' + TABLE_NAME
-    | SCHEMA_NAME + '.' + TABLE_NAME
-    | TABLE_NAME
-)
-ALIAS = Optional(AS) + IDENTIFIER('alias_name')
-EXPRESSION << (
-    FUNCTION_EXPRESSION
-    | IDENTIFIER
-    | CASE_EXPRESSION
-    | BOOLEAN_EXPRESSION
-    | COMPARISON_EXPRESSION
-    | ARITHMETIC_EXPRESSION
-    | QUOTED_SQL_STRING
-)('expression')
-
-COLUMN = Group(EXPRESSION + Optional(ALIAS))
-COLUMN_LIST = Group(delimitedList(COLUMN))('column_list')
-FROM_CLAUSE = FROM + TABLE_OBJECT
-
-SELECT_STATEMENT = (
-    SELECT
-    + Optional(DISTINCT | ALL)
-    + (SPLAT | COLUMN_LIST)
-    + Optional(FROM_CLAUSE)
-    + ';'
+The grammar is defined in grammar.py and is only built the first time it is
+needed, either by parse_sql or by reading one of its elements from this module
+(run.IDENTIFIER, run.STATEMENTS, ...), so importing run does not import
+pyparsing.  A built grammar can be saved with save_grammar and loaded by later
+processes with load_grammar, which is quicker than building it again.
+"""
+import os
+from contextlib import ExitStack
+
+from hooks import overrides
+from packrat import DEFAULT_CACHE_SIZE, memoized
+from statements import Statement, split_statements, statement_spans
+
+GRAMMAR_MODULES = (
+    'grammar',
+    'clauses',
+    'functions',
+    'identifiers',
+    'precedence',
+    'signatures',
+    'signature_table',
 )
 
-STATEMENT_DEF = SELECT_STATEMENT('select_statement')
-
-STATEMENTS = OneOrMore(STATEMENT_DEF)
-
-
-def parse_sql(sql_text):
-    parsed = STATEMENTS.parseString(sql_text, parseAll=True)
-    return parsed
+_grammar = None
+
+
+def get_grammar():
+    """
+    The grammar elements by name, built once per process
+    """
+    global _grammar
+    if _grammar is None:
+        import grammar
+
+        _grammar = {
+            name: value for name, value in vars(grammar).items() if name.isupper()
+        }
+    return _grammar
+
+
+def __getattr__(name):
+    elements = get_grammar() if name.isupper() else {}
+    try:
+        return elements[name]
+    except KeyError:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def grammar_fingerprint():
+    """
+    Changes whenever the grammar source or the pyparsing version does.  A
+    checksum rather than a cryptographic hash, to keep load_grammar cheap.
+    """
+    import zlib
+    import pyparsing
+
+    checksum = zlib.crc32(pyparsing.__version__.encode())
+    here = os.path.dirname(os.path.abspath(__file__))
+    for module_name in GRAMMAR_MODULES:
+        with open(os.path.join(here, module_name + '.py'), 'rb') as source:
+            checksum = zlib.crc32(source.read(), checksum)
+    return format(checksum, '08x')
+
+
+def optional_not_matched():
+    from pyparsing import Opt
+
+    return getattr(Opt, '_Opt__optionalNotMatched')
+
+
+def save_grammar(path):
+    """
+    Save the grammar at path for load_grammar.  It is written to a temporary
+    file beside path and moved into place, so a process loading path never
+    reads a partly written grammar, and a failed save leaves path as it was.
+    """
+    import pickle
+    import tempfile
+
+    class GrammarPickler(pickle.Pickler):
+        # Optional tells "no default given" apart from a default by identity
+        # with a private sentinel, so the sentinel must unpickle as itself
+        def reducer_override(self, obj):
+            if obj is optional_not_matched():
+                return optional_not_matched, ()
+            return NotImplemented
+
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile(
+        dir=directory, prefix='.grammar-', delete=False
+    ) as grammar_file:
+        try:
+            pickle.dump(grammar_fingerprint(), grammar_file)
+            GrammarPickler(grammar_file, pickle.HIGHEST_PROTOCOL).dump(get_grammar())
+        except BaseException:
+            grammar_file.close()
+            os.unlink(grammar_file.name)
+            raise
+    os.replace(grammar_file.name, path)
+
+
+def load_grammar(path):
+    """
+    Use the grammar saved at path.  If there is none, or it was saved from
+    different grammar source, build the grammar and save it there instead.
+    """
+    import pickle
+
+    global _grammar
+    try:
+        with open(path, 'rb') as grammar_file:
+            if pickle.load(grammar_file) == grammar_fingerprint():
+                _grammar = pickle.load(grammar_file)
+                return _grammar
+    except (OSError, EOFError, pickle.UnpicklingError):
+        pass
+    save_grammar(path)
+    return get_grammar()
+
+
+def parse_sql(
+    sql_text,
+    memoize=False,
+    cache_size=DEFAULT_CACHE_SIZE,
+    prescan=False,
+    max_seconds=None,
+    max_steps=None,
+):
+    """
+    With memoize, each grammar element remembers its result at each location
+    for the rest of this call, keeping at most cache_size results (None for no
+    limit).  With prescan, structural problems (see prescan.py) are reported
+    before the grammar is run.  With max_seconds or max_steps, the parse
+    raises budget.BudgetExceeded once it has run for that long or tried that
+    many matches.
+
+    memoize, max_seconds and max_steps wrap how the elements of the shared
+    grammar parse for the duration of the call, so with any of them this is
+    not safe to run while another thread parses.
+    """
+    if prescan:
+        from prescan import check
+
+        check(sql_text)
+    statements = get_grammar()['STATEMENTS']
+    with ExitStack() as stack:
+        if memoize:
+            stack.enter_context(memoized(statements, cache_size))
+        if max_seconds is not None or max_steps is not None:
+            from budget import budgeted
+
+            stack.enter_context(budgeted(statements, max_seconds, max_steps))
+        return statements.parseString(sql_text, parseAll=True)
+
+
+def parse_ast(sql_text):
+    """
+    Parse sql_text into a tuple of nodes.Select, one per statement.  The nodes
+    are built by parse actions installed on the shared grammar for the
+    duration of the call, so like memoize this is not safe to run while
+    another thread parses.
+    """
+    from nodes import node_builders
+
+    grammar = get_grammar()
+    statements = grammar['STATEMENTS'].streamline()
+    with overrides(node_builders(grammar)):
+        return tuple(statements.parseString(sql_text, parseAll=True))
+
+
+def parse_statement(text, offset=0):
+    """
+    Parse the text of one statement, which starts at offset in its script,
+    into a Statement.  A statement nested too deeply to parse gets the
+    RecursionError as its error, like one that does not parse.
+    """
+    from pyparsing import ParseBaseException
+
+    try:
+        result = get_grammar()['STATEMENT_DEF'].parseString(text, parseAll=True)
+    except (ParseBaseException, RecursionError) as error:
+        return Statement(offset, text, None, error)
+    return Statement(offset, text, result, None)
+
+
+def iter_statements(file_or_text):
+    """
+    Parse a script (a string or a text file) one statement at a time, yielding
+    a Statement for each as soon as it is parsed.  Unlike parse_sql, a bad
+    statement does not stop the statements after it from being parsed, and a
+    file is read incrementally rather than all at once.
+    """
+    for offset, text in split_statements(file_or_text):
+        yield parse_statement(text, offset)
+
+
+def parse_file(path, encoding='utf-8'):
+    """
+    Like iter_statements for the file at path, but the file is memory-mapped
+    and split on the mapped bytes, so only one statement at a time is ever
+    decoded.  The encoding must be one (like UTF-8) in which ';' and "'" are
+    never part of another character.
+    """
+    import mmap
+
+    with open(path, 'rb') as script:
+        if os.fstat(script.fileno()).st_size == 0:
+            return
+        with mmap.mmap(script.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            offset = 0
+            for start, end in statement_spans(mapped, b';', b"'"):
+                text = mapped[start:end].decode(encoding)
+                yield parse_statement(text, offset)
+                offset += len(text)
@@ -0,0 +1,367 @@
+"""
+A long-running local parse service, so tools can parse without each paying for
+building the grammar.
+
+    python service.py [--host HOST] [--port N | --unix PATH] [--workers N]
+                      [--queue-size N] [--timeout SECONDS] [--grammar PATH]
+
+It speaks just enough HTTP/1.1 for a client library or curl:
+
+    POST /parse     the body is the SQL; 200 with {"result": [...]}, or 422
+                    with {"error": {"message", "loc", "line", "column"}}
+                    (just {"message"} if it is nested too deeply to parse)
+    GET /metrics    request counts, queue depth and latency percentiles
+
+Parsing happens in worker processes that build (or load, with --grammar) the
+grammar before the service accepts requests.  At most --queue-size requests
+wait for a worker; more are turned away with 503 straight away.  A parse that
+takes longer than --timeout gets 504, and its worker is killed and replaced,
+since a parse cannot be interrupted any other way.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import batch
+import run
+
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 10 * 1024 * 1024
+REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    422: 'Unprocessable Entity',
+    500: 'Internal Server Error',
+    503: 'Service Unavailable',
+    504: 'Gateway Timeout',
+}
+# what each parse response status is counted as in the metrics
+OUTCOMES = {
+    200: 'parsed',
+    422: 'failed',
+    500: 'crashed',
+    503: 'rejected',
+    504: 'timed_out',
+}
+
+
+def parse_request(text):
+    """
+    Parse text in a worker, returning (status, JSON-ready response)
+    """
+    from pyparsing import ParseBaseException
+
+    try:
+        return 200, {'result': run.parse_sql(text).asList()}
+    except ParseBaseException as error:
+        message = {
+            'message': error.msg,
+            'loc': error.loc,
+            'line': error.lineno,
+            'column': error.col,
+        }
+        return 422, {'error': message}
+    except RecursionError:
+        return 422, {'error': {'message': 'The SQL is nested too deeply to parse'}}
+
+
+def serve_worker(connection, grammar_path, handler):
+    batch.init_worker(grammar_path)
+    connection.send(None)
+    while True:
+        try:
+            text = connection.recv()
+        except EOFError:
+            return
+        connection.send(handler(text))
+
+
+class Worker:
+    """
+    A worker process and the end of the pipe the service talks to it over
+    """
+
+    def __init__(self, grammar_path=None, handler=parse_request):
+        self.connection, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=serve_worker, args=(child, grammar_path, handler), daemon=True
+        )
+        self.process.start()
+        child.close()
+
+    async def receive(self, executor):
+        # a thread waits on the pipe, so a worker that is killed mid-parse
+        # wakes it with EOFError instead of blocking the event loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.connection.recv)
+
+    async def parse(self, text, executor):
+        self.connection.send(text)
+        return await self.receive(executor)
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+def percentile(values, fraction):
+    """
+    The nearest-rank percentile of values, which must be sorted
+    """
+    if not values:
+        return None
+    index = max(0, min(len(values) - 1, round(fraction * len(values)) - 1))
+    return values[index]
+
+
+class Metrics:
+    """
+    Counts of request outcomes, and the latencies of the last window requests
+    """
+
+    def __init__(self, window=10000):
+        self.counts = Counter()
+        self.latencies = deque(maxlen=window)
+
+    def record(self, outcome, seconds):
+        self.counts[outcome] += 1
+        self.latencies.append(seconds)
+
+    def snapshot(self):
+        latencies = sorted(self.latencies)
+        milliseconds = {
+            name: None if value is None else value * 1000
+            for name, value in (
+                ('p50', percentile(latencies, 0.5)),
+                ('p90', percentile(latencies, 0.9)),
+                ('p99', percentile(latencies, 0.99)),
+                ('max', latencies[-1] if latencies else None),
+            )
+        }
+        return {'requests': dict(self.counts), 'latency_ms': milliseconds}
+
+
+class ParseService:
+    """
+    Hands parse requests to a pool of worker processes through a bounded
+    queue.  start() must be awaited before parse() and close() after.
+    """
+
+    def __init__(
+        self,
+        workers=None,
+        queue_size=100,
+        timeout=10.0,
+        grammar_path=None,
+        handler=parse_request,
+    ):
+        self.num_workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.grammar_path = grammar_path
+        self.handler = handler
+        self.queue = asyncio.Queue(queue_size)
+        self.metrics = Metrics()
+        self.workers = []
+        self.tasks = []
+        # room for a thread per worker, and for the threads of killed workers
+        # until they see the end of their pipes
+        self.executor = ThreadPoolExecutor(2 * self.num_workers)
+
+    async def start_worker(self):
+        worker = Worker(self.grammar_path, self.handler)
+        await worker.receive(self.executor)
+        return worker
+
+    async def start(self):
+        workers = [self.start_worker() for _ in range(self.num_workers)]
+        self.workers = list(await asyncio.gather(*workers))
+        self.tasks = [
+            asyncio.create_task(self.run_worker(number))
+            for number in range(self.num_workers)
+        ]
+
+    async def close(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        for worker in self.workers:
+            worker.kill()
+        self.executor.shutdown()
+
+    async def run_worker(self, number):
+        while True:
+            text, future = await self.queue.get()
+            if future.cancelled():
+                continue
+            try:
+                response = await asyncio.wait_for(
+                    self.workers[number].parse(text, self.executor), self.timeout
+                )
+            except (asyncio.TimeoutError, EOFError, OSError) as error:
+                timed_out = isinstance(error, asyncio.TimeoutError)
+                self.workers[number].kill()
+                self.workers[number] = await self.start_worker()
+                if timed_out:
+                    message = f'Parsing took longer than {self.timeout} seconds'
+                    response = 504, {'error': {'message': message}}
+                else:
+                    response = 500, {'error': {'message': 'Worker process died'}}
+            if not future.cancelled():
+                future.set_result(response)
+
+    async def parse(self, text):
+        """
+        (status, JSON-ready response) for parsing text
+        """
+        start = time.perf_counter()
+        if self.queue.full():
+            response = 503, {'error': {'message': 'Too many requests queued'}}
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self.queue.put_nowait((text, future))
+            response = await future
+        self.metrics.record(OUTCOMES[response[0]], time.perf_counter() - start)
+        return response
+
+    def snapshot(self):
+        metrics = self.metrics.snapshot()
+        metrics['queued'] = self.queue.qsize()
+        metrics['workers'] = self.num_workers
+        return metrics
+
+    async def route(self, method, target, body):
+        if target == '/parse':
+            if method != 'POST':
+                return 405, {'error': {'message': 'Use POST'}}
+            try:
+                text = body.decode('utf-8')
+            except UnicodeDecodeError:
+                return 400, {'error': {'message': 'The body must be UTF-8'}}
+            return await self.parse(text)
+        if target == '/metrics':
+            if method != 'GET':
+                return 405, {'error': {'message': 'Use GET'}}
+            return 200, self.snapshot()
+        return 404, {'error': {'message': f'No such path {target}'}}
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = await read_headers(reader)
+                length = int(headers.get('content-length', 0))
+                try:
+                    method, target, version = request_line.decode().split()
+                except ValueError:
+                    await write_response(writer, 400, {}, keep_alive=False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await write_response(writer, 413, {}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length)
+                status, response = await self.route(method, target, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                keep_alive = keep_alive and version != 'HTTP/1.0'
+                await write_response(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def read_headers(reader):
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            return headers
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+
+async def write_response(writer, status, response, keep_alive=True):
+    body = json.dumps(response).encode()
+    connection = 'keep-alive' if keep_alive else 'close'
+    head = (
+        f'HTTP/1.1 {status} {REASONS[status]}\r\n'
+        'Content-Type: application/json\r\n'
+        f'Content-Length: {len(body)}\r\n'
+        f'Connection: {connection}\r\n\r\n'
+    )
+    writer.write(head.encode() + body)
+    await writer.drain()
+
+
+async def http_request(reader, writer, method, target, body=b''):
+    """
+    Send one request over an open connection to the service, returning
+    (status, decoded JSON response)
+    """
+    writer.write(
+        f'{method} {target} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n'.encode()
+        + body
+    )
+    await writer.drain()
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('The service closed the connection')
+    headers = await read_headers(reader)
+    response = await reader.readexactly(int(headers['content-length']))
+    return int(status_line.split()[1]), json.loads(response)
+
+
+async def start_server(service, host='127.0.0.1', port=DEFAULT_PORT, path=None):
+    """
+    Start service and serve it on host and port, or on the Unix socket at
+    path, returning the asyncio Server
+    """
+    await service.start()
+    if path is not None:
+        return await asyncio.start_unix_server(service.handle_connection, path)
+    return await asyncio.start_server(service.handle_connection, host, port)
+
+
+async def serve(args):
+    service = ParseService(args.workers, args.queue_size, args.timeout, args.grammar)
+    server = await start_server(service, args.host, args.port, args.unix)
+    address = args.unix or f'http://{args.host}:{args.port}'
+    print(f'serving on {address} with {service.num_workers} workers', flush=True)
+    try:
+        await server.serve_forever()
+    finally:
+        server.close()
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix', help='serve on a Unix socket at this path')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--queue-size', type=int, default=100)
+    parser.add_argument('--timeout', type=float, default=10.0)
+    parser.add_argument('--grammar', help='path of a grammar saved by save_grammar')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,272 @@
+# Generated by signatures.py from the name lists in functions.py.
+# Do not edit; run python signatures.py instead.
+
+SIGNATURE_ROWS = (
+    ('CURRENT_CLIENT', 0, 0, True, ('CONTEXT_FUNCTION_NAMES',)),
+    ('CURRENT_DATE', 0, 0, True, ('CONTEXT_FUNCTION_NAMES',)),
+    ('CURRENT_TIME', 0, 0, True, ('CONTEXT_FUNCTION_NAMES',)),
+    ('CURRENT_TIMESTAMP', 0, 0, True, ('CONTEXT_FUNCTION_NAMES',)),
+    ('CURRENT_VERSION', 0, 0, True, ('CONTEXT_FUNCTION_NAMES',)),
+    ('LOCALTIME', 0, 0, True, ('CONTEXT_FUNCTION_NAMES',)),
+    ('LOCALTIMESTAMP', 0, 0, True, ('CONTEXT_FUNCTION_NAMES',)),
+    ('CURRENT_ROLE', 0, 0, True, ('CONTEXT_FUNCTION_NAMES',)),
+    ('CURRENT_SESSION', 0, 0, True, ('CONTEXT_FUNCTION_NAMES',)),
+    ('CURRENT_STATEMENT', 0, 0, True, ('CONTEXT_FUNCTION_NAMES',)),
+    ('CURRENT_TRANSACTION', 0, 0, True, ('CONTEXT_FUNCTION_NAMES',)),
+    ('CURRENT_USER', 0, 0, True, ('CONTEXT_FUNCTION_NAMES',)),
+    ('LAST_QUERY_ID', 0, 0, True, ('CONTEXT_FUNCTION_NAMES',)),
+    ('LAST_TRANSACTION', 0, 0, True, ('CONTEXT_FUNCTION_NAMES',)),
+    ('CURRENT_DATABASE', 0, 0, True, ('CONTEXT_FUNCTION_NAMES',)),
+    ('CURRENT_SCHEMA', 0, 0, True, ('CONTEXT_FUNCTION_NAMES',)),
+    ('CURRENT_SCHEMAS', 0, 0, True, ('CONTEXT_FUNCTION_NAMES',)),
+    ('CURRENT_WAREHOUSE', 0, 0, True, ('CONTEXT_FUNCTION_NAMES',)),
+    ('PI', 0, 0, False, ('NULLARY_FUNCTION_NAMES',)),
+    ('RANDOM', 0, 1, False, ('NULLARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('BITAND_AGG', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('BITNOT', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('BITOR_AGG', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('BITXOR_AGG', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('SIGN', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('CBRT', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('EXP', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('FACTORIAL', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('SQRT', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('SQUARE', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('LN', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('ACOS', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('ACOSH', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('ASIN', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('ASINH', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('ATAN', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('ATAN2', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('ATANH', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('COS', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('COSH', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('COT', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('DEGREES', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('RADIANS', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('SIN', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('SINH', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('TAN', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('TANH', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('ASCII', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('BIT_LENGTH', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('CHR', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('CHAR', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('LENGTH', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('LOWER', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('OCTET_LENGTH', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('REVERSE', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('RTRIMMED_LENGTH', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('SPACE', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('UNICODE', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('UPPER', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('HEX_DECODE_BINARY', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('HEX_DECODE_STRING', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('TRY_HEX_DECODE_BINARY', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('TRY_HEX_DECODE_STRING', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('MD5', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('MD5_HEX', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('MD5_BINARY', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('MD5_NUMBER', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('SHA1', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('SHA1_HEX', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('SHA1_BINARY', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('DAYNAME', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('HOUR', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('MINUTE', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('SECOND', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('MONTHNAME', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('YEAR', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('YEAROFWEEK', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('YEAROFWEEKISO', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('DAY', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('DAYOFMONTH', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('DAYOFWEEK', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('DAYOFWEEKISO', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('DAYOFYEAR', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('WEEK', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('WEEKOFYEAR', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('WEEKISO', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('MONTH', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('QUARTER', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('CHECK_JSON', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('CHECK_XML', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('PARSE_JSON', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('PARSE_XML', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('STRIP_NULL_VALUE', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('ARRAY_COMPACT', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('ARRAY_SIZE', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('AS_ARRAY', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('AS_BINARY', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('AS_CHAR', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('AS_VARCHAR', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('AS_DATE', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('AS_DOUBLE', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('AS_REAL', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('AS_INTEGER', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('AS_OBJECT', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('AS_TIME', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('AS_TIMESTAMP_LTZ', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('AS_TIMESTAMP_NTZ', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('AS_TIMESTAMP_TZ', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('TO_ARRAY', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('TO_JSON', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('TO_OBJECT', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('TO_VARIANT', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('TO_XML', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('IS_ARRAY', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('IS_BINARY', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('IS_BOOLEAN', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('IS_CHAR', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('IS_VARCHAR', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('IS_DATE', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('IS_DATE_VALUE', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('IS_DECIMAL', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('IS_DOUBLE', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('IS_REAL', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('IS_INTEGER', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('IS_NULL_VALUE', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('IS_OBJECT', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('IS_TIME', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('IS_TIMESTAMP_LTZ', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('IS_TIMESTAMP_NTZ', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('IS_TIMESTAMP_TZ', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('TYPEOF', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('TRY_TO_DOUBLE', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('TO_BOOLEAN', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('TRY_TO_BOOLEAN', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('TRY_TO_DATE', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('TRY_TO_TIME', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('TRY_TO_TIMESTAMP', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('TRY_TO_TIMESTAMP_LTZ', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('TRY_TO_TIMESTAMP_NTZ', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('TRY_TO_TIMESTAMP_TZ', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('SYSTEM$ABORT_SESSION', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('SYSTEM$ABORT_TRANSACTION', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('SYSTEM$CANCEL_ALL_QUERIES', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('SYSTEM$CANCEL_QUERY', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('SYSTEM$LAST_CHANGE_COMMIT_TIME', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('SYSTEM$PIPE_FORCE_RESUME', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('SYSTEM$PIPE_STATUS', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('SYSTEM$TYPEOF', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('SEQ1', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('SEQ2', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('SEQ4', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('SEQ8', 1, 1, False, ('UNARY_FUNCTION_NAMES',)),
+    ('CEIL', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('FLOOR', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('ROUND', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('TRUNCATE', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    (
+        'TRUNC',
+        1,
+        2,
+        False,
+        ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES', 'BINARY_FUNCTION_NAMES'),
+    ),
+    ('INITCAP', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('LTRIM', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('PARSE_URL', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('REPEAT', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('RTRIM', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('TRIM', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('BASE64_DECODE_BINARY', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('BASE64_DECODE_STRING', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('HEX_ENCODE', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('TRY_BASE64_DECODE_BINARY', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('TRY_BASE64_DECODE_STRING', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('SHA2', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('SHA2_HEX', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('SHA2_BINARY', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('LAST_DAY', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('TO_DATE', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('TO_TIME', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('TO_TIMESTAMP_LTZ', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('TO_TIMESTAMP_NTZ', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('TO_TIMESTAMP_TZ', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('TO_CHAR', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('TO_VARCHAR', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('TO_BINARY', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('TRY_TO_BINARY', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('TO_DOUBLE', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('SYSTEM$WAIT', 1, 2, False, ('UNARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('BASE64_ENCODE', 1, 3, False, ('UNARY_TWO_OPTIONAL_FUNCTION_NAMES',)),
+    ('AS_DECIMAL', 1, 3, False, ('UNARY_TWO_OPTIONAL_FUNCTION_NAMES',)),
+    ('AS_NUMBER', 1, 3, False, ('UNARY_TWO_OPTIONAL_FUNCTION_NAMES',)),
+    ('TO_DECIMAL', 1, 4, False, ('UNARY_THREE_OPTIONAL_FUNCTION_NAMES',)),
+    ('TO_NUMBER', 1, 4, False, ('UNARY_THREE_OPTIONAL_FUNCTION_NAMES',)),
+    ('TO_NUMERIC', 1, 4, False, ('UNARY_THREE_OPTIONAL_FUNCTION_NAMES',)),
+    ('TRY_TO_DECIMAL', 1, 4, False, ('UNARY_THREE_OPTIONAL_FUNCTION_NAMES',)),
+    ('TRY_TO_NUMBER', 1, 4, False, ('UNARY_THREE_OPTIONAL_FUNCTION_NAMES',)),
+    ('TRY_TO_NUMERIC', 1, 4, False, ('UNARY_THREE_OPTIONAL_FUNCTION_NAMES',)),
+    ('BITAND', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('BITOR', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('BITSHIFTLEFT', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('BITSHIFTRIGHT', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('BITXOR', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('MOD', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('POW', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('POWER', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('LOG', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('CONCAT', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('CONTAINS', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('EDITDISTANCE', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('ENDSWITH', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('LEFT', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('RIGHT', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('SPLIT', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('STARTSWITH', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('DATE_PART', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('NEXT_DAY', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('PREVIOUS_DAY', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('ADD_MONTHS', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('DATE_TRUNC', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('ARRAY_APPEND', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('ARRAY_CAT', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('ARRAY_CONTAINS', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('ARRAY_POSITION', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('ARRAY_PREPEND', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('ARRAY_TO_STRING', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('ARRAYS_OVERLAP', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('OBJECT_AGG', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('GET', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('GET_PATH', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('GET_DDL', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('RANDSTR', 2, 2, False, ('BINARY_FUNCTION_NAMES',)),
+    ('CHARINDEX', 2, 3, False, ('BINARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('ILIKE', 2, 3, False, ('BINARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('LIKE', 2, 3, False, ('BINARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('LPAD', 2, 3, False, ('BINARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('PARSE_IP', 2, 3, False, ('BINARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('REPLACE', 2, 3, False, ('BINARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('RPAD', 2, 3, False, ('BINARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('SUBSTR', 2, 3, False, ('BINARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('SUBSTRING', 2, 3, False, ('BINARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('REGEXP_LIKE', 2, 3, False, ('BINARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('RLIKE', 2, 3, False, ('BINARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('CONVERT_TIMEZONE', 2, 3, False, ('BINARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('XMLGET', 2, 3, False, ('BINARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('REGEXP_COUNT', 2, 4, False, ('BINARY_TWO_OPTIONAL_FUNCTION_NAMES',)),
+    ('REGEXP_SUBSTR', 2, 5, False, ('BINARY_THREE_OPTIONAL_FUNCTION_NAMES',)),
+    ('REGEXP_INSTR', 2, 6, False, ('BINARY_FOUR_OPTIONAL_FUNCTION_NAMES',)),
+    ('REGEXP_REPLACE', 2, 6, False, ('BINARY_FOUR_OPTIONAL_FUNCTION_NAMES',)),
+    ('SPLIT_PART', 3, 3, False, ('TRINARY_FUNCTION_NAMES',)),
+    ('TRANSLATE', 3, 3, False, ('TRINARY_FUNCTION_NAMES',)),
+    ('DATE_FROM_PARTS', 3, 3, False, ('TRINARY_FUNCTION_NAMES',)),
+    ('DATEADD', 3, 3, False, ('TRINARY_FUNCTION_NAMES',)),
+    ('DATEDIFF', 3, 3, False, ('TRINARY_FUNCTION_NAMES',)),
+    ('TIMEADD', 3, 3, False, ('TRINARY_FUNCTION_NAMES',)),
+    ('TIMEDIFF', 3, 3, False, ('TRINARY_FUNCTION_NAMES',)),
+    ('TIMESTAMPADD', 3, 3, False, ('TRINARY_FUNCTION_NAMES',)),
+    ('TIMESTAMPDIFF', 3, 3, False, ('TRINARY_FUNCTION_NAMES',)),
+    ('ARRAY_INSERT', 3, 3, False, ('TRINARY_FUNCTION_NAMES',)),
+    ('ARRAY_SLICE', 3, 3, False, ('TRINARY_FUNCTION_NAMES',)),
+    ('NORMAL', 3, 3, False, ('TRINARY_FUNCTION_NAMES',)),
+    ('UNIFORM', 3, 3, False, ('TRINARY_FUNCTION_NAMES',)),
+    ('ZIPF', 3, 3, False, ('TRINARY_FUNCTION_NAMES',)),
+    ('TIME_FROM_PARTS', 3, 4, False, ('TRINARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('OBJECT_INSERT', 3, 4, False, ('TRINARY_ONE_OPTIONAL_FUNCTION_NAMES',)),
+    ('HAVERSINE', 4, 4, False, ('QUATERNARY_FUNCTION_NAMES',)),
+    ('INSERT', 4, 4, False, ('QUATERNARY_FUNCTION_NAMES',)),
+)
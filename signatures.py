@@ -0,0 +1,149 @@
+"""
+Function signatures, precomputed from the name lists in functions.py.
+
+    python signatures.py
+
+rewrites signature_table.py after a name list changes.  Loading the table
+needs neither pyparsing nor functions.py, so editors and linters can use it for
+arity checks and completion without building the grammar.
+"""
+import os
+import sys
+from bisect import bisect_left
+from collections import namedtuple
+
+from signature_table import SIGNATURE_ROWS
+
+TABLE_PATH = os.path.join(os.path.dirname(__file__), 'signature_table.py')
+
+Signature = namedtuple(
+    'Signature', ['name', 'min_args', 'max_args', 'optional_parens', 'families']
+)
+Signature.__doc__ = """
+A function that takes min_args to max_args arguments; one with optional_parens
+can also be called without an argument list.  families are the functions.py
+name lists it was generated from.
+"""
+
+# name list -> (min args, max args, optional parens), in the order the grammar
+# used to register them
+FUNCTION_FAMILIES = {
+    'CONTEXT_FUNCTION_NAMES': (0, 0, True),
+    'NULLARY_FUNCTION_NAMES': (0, 0, False),
+    'NULLARY_ONE_OPTIONAL_FUNCTION_NAMES': (0, 1, False),
+    'UNARY_FUNCTION_NAMES': (1, 1, False),
+    'UNARY_ONE_OPTIONAL_FUNCTION_NAMES': (1, 2, False),
+    'UNARY_TWO_OPTIONAL_FUNCTION_NAMES': (1, 3, False),
+    'UNARY_THREE_OPTIONAL_FUNCTION_NAMES': (1, 4, False),
+    'BINARY_FUNCTION_NAMES': (2, 2, False),
+    'BINARY_ONE_OPTIONAL_FUNCTION_NAMES': (2, 3, False),
+    'BINARY_TWO_OPTIONAL_FUNCTION_NAMES': (2, 4, False),
+    'BINARY_THREE_OPTIONAL_FUNCTION_NAMES': (2, 5, False),
+    'BINARY_FOUR_OPTIONAL_FUNCTION_NAMES': (2, 6, False),
+    'TRINARY_FUNCTION_NAMES': (3, 3, False),
+    'TRINARY_ONE_OPTIONAL_FUNCTION_NAMES': (3, 4, False),
+    'QUATERNARY_FUNCTION_NAMES': (4, 4, False),
+}
+
+SIGNATURES = {row[0].upper(): Signature(*row) for row in SIGNATURE_ROWS}
+SORTED_NAMES = sorted(SIGNATURES)
+
+
+def lookup(name):
+    """
+    The Signature of the function called name (in any case), or None
+    """
+    return SIGNATURES.get(name.upper())
+
+
+def complete(prefix):
+    """
+    The Signatures of the functions whose names start with prefix, by name
+    """
+    prefix = prefix.upper()
+    signatures = []
+    index = bisect_left(SORTED_NAMES, prefix)
+    while index < len(SORTED_NAMES) and SORTED_NAMES[index].startswith(prefix):
+        signatures.append(SIGNATURES[SORTED_NAMES[index]])
+        index += 1
+    return signatures
+
+
+def arity_error(signature, count):
+    """
+    Why a call to signature with count arguments is wrong, or None if it is not
+    """
+    if signature.min_args <= count <= signature.max_args:
+        return None
+    if signature.max_args == 0:
+        expected = 'no arguments'
+    elif signature.min_args == signature.max_args:
+        plural = '' if signature.min_args == 1 else 's'
+        expected = f'{signature.min_args} argument{plural}'
+    else:
+        expected = f'{signature.min_args} to {signature.max_args} arguments'
+    return f'{signature.name} takes {expected}, got {count}'
+
+
+def build_rows(name_lists):
+    """
+    Signature rows for name_lists, a mapping of FUNCTION_FAMILIES names to
+    function names.  A function in more than one list takes any argument count
+    allowed by one of them, and keeps the spelling of its first list.
+    """
+    rows = {}
+    for family, (min_args, max_args, optional_parens) in FUNCTION_FAMILIES.items():
+        for name in name_lists[family]:
+            key = name.upper()
+            if key not in rows:
+                rows[key] = (name, min_args, max_args, optional_parens, (family,))
+                continue
+            first, low, high, parens, families = rows[key]
+            rows[key] = (
+                first,
+                min(low, min_args),
+                max(high, max_args),
+                parens or optional_parens,
+                families + (family,),
+            )
+    return tuple(rows.values())
+
+
+def function_name_lists():
+    import functions
+
+    return {family: getattr(functions, family) for family in FUNCTION_FAMILIES}
+
+
+def format_table(rows):
+    lines = [
+        '# Generated by signatures.py from the name lists in functions.py.',
+        '# Do not edit; run python signatures.py instead.',
+        '',
+        'SIGNATURE_ROWS = (',
+    ]
+    for row in rows:
+        line = f'    {row!r},'
+        if len(line) > 88:
+            lines.append('    (')
+            lines.extend(f'        {value!r},' for value in row)
+            lines.append('    ),')
+        else:
+            lines.append(line)
+    lines.append(')')
+    return '\n'.join(lines) + '\n'
+
+
+def generate_table():
+    return format_table(build_rows(function_name_lists()))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    path = argv[0] if argv else TABLE_PATH
+    with open(path, 'w') as table:
+        table.write(generate_table())
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Split SQL scripts into statements on ';' without parsing them.  Semicolons
+inside quoted strings do not end a statement.
+"""
+from collections import namedtuple
+
+CHUNK_SIZE = 1 << 16
+
+Statement = namedtuple('Statement', ['offset', 'text', 'result', 'error'])
+Statement.__doc__ = """
+One statement of a script: offset is where its text starts in the script,
+and exactly one of result (the parse results) and error (the ParseException,
+whose loc is relative to text, or a RecursionError) is set.
+"""
+
+
+def statement_end(text, pos, semicolon=';', quote="'"):
+    """
+    Index just past the ';' ending the statement that starts at pos, or -1 if
+    text ends first (or inside an unterminated string).  Works on str, bytes
+    and mmap objects, given bytes separators for the latter two.
+    """
+    end = text.find(semicolon, pos)
+    while end != -1:
+        quote_start = text.find(quote, pos, end)
+        if quote_start == -1:
+            return end + 1
+        quote_end = text.find(quote, quote_start + 1)
+        if quote_end == -1:
+            return -1
+        pos = quote_end + 1
+        if end < pos:
+            end = text.find(semicolon, pos)
+    return -1
+
+
+def statement_spans(text, semicolon=';', quote="'"):
+    """
+    Yield (start, end) for each statement in text, including a final statement
+    without its ';' unless it is only whitespace.  Like statement_end, works on
+    str, bytes and mmap objects.
+    """
+    start = 0
+    while True:
+        end = statement_end(text, start, semicolon, quote)
+        if end == -1:
+            break
+        yield start, end
+        start = end
+    if text[start:].strip():
+        yield start, len(text)
+
+
+def split_text(text, offset=0):
+    """
+    Yield (offset, statement_text) for each statement in text, including a
+    final statement without its ';' unless it is only whitespace
+    """
+    for start, end in statement_spans(text):
+        yield offset + start, text[start:end]
+
+
+def chunk_ends(chunk, in_string, semicolon=';', quote="'"):
+    """
+    The index just past each ';' in chunk that ends a statement, and whether
+    chunk ends inside a quoted string, given whether it starts inside one
+    """
+    ends = []
+    pos = 0
+    end = chunk.find(semicolon)
+    while True:
+        if in_string:
+            quote_end = chunk.find(quote, pos)
+            if quote_end == -1:
+                return ends, True
+            in_string = False
+            pos = quote_end + 1
+            if end != -1 and end < pos:
+                end = chunk.find(semicolon, pos)
+        elif end == -1:
+            return ends, chunk.count(quote, pos) % 2 == 1
+        else:
+            quote_start = chunk.find(quote, pos, end)
+            if quote_start == -1:
+                ends.append(end + 1)
+                pos = end + 1
+                end = chunk.find(semicolon, pos)
+            else:
+                in_string = True
+                pos = quote_start + 1
+
+
+def split_statements(file_or_text, chunk_size=CHUNK_SIZE):
+    """
+    Like split_text, but also accepts a file opened in text mode, which is
+    read chunk_size characters at a time so only the statement being split
+    is held in memory.  Each chunk is scanned once, carrying over whether it
+    ends inside a string, and the chunks of a statement are joined once it
+    ends.
+    """
+    if isinstance(file_or_text, str):
+        yield from split_text(file_or_text)
+        return
+    parts = []
+    offset = 0
+    in_string = False
+    while True:
+        chunk = file_or_text.read(chunk_size)
+        if not chunk:
+            break
+        ends, in_string = chunk_ends(chunk, in_string)
+        start = 0
+        for end in ends:
+            parts.append(chunk[start:end])
+            text = ''.join(parts)
+            yield offset, text
+            offset += len(text)
+            parts = []
+            start = end
+        parts.append(chunk[start:])
+    yield from split_text(''.join(parts), offset)
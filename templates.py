@@ -0,0 +1,159 @@
+"""
+Parse statements that differ only in their literals once per template.
+
+    python templates.py [--max-templates N] file.sql ...
+
+Query logs are mostly the same few statements with different numbers and
+strings.  TemplateParser replaces each number with 0 and each string with ''
+(and collapses whitespace) in one regular expression pass, parses the
+resulting template the first time it is seen, and keeps the result in a
+least-recently-used cache.  Later statements with the same template get the
+cached result with their own literals put back, the same as
+parse_sql(text).asList() would give.
+"""
+import argparse
+import hashlib
+import re
+import sys
+import time
+
+import run
+from packrat import ParseCache
+from statements import split_statements
+
+DEFAULT_MAX_TEMPLATES = 10000
+NUMBER_PLACEHOLDER = '0'
+STRING_PLACEHOLDER = "''"
+
+# Words are matched (and left alone) so digits inside them are not taken for
+# numbers.  Numbers and strings are matched exactly as the grammar's DIGIT and
+# QUOTED_SQL_STRING match them, so a template parses the same way as the
+# statements it stands for.  The grammar only uses whitespace to separate
+# tokens, so runs of it become one space.
+LITERAL = re.compile(
+    r"""
+    (?P<space>\s+)
+    | (?P<word>[A-Za-z_$][A-Za-z0-9_$]*)
+    | (?P<string>'[^'\n\r]*')
+    | (?P<number>\d+(?![A-Za-z0-9_$]))
+    """,
+    re.VERBOSE,
+)
+
+# cached for a template that does not parse
+FAILED = object()
+
+
+def normalize(sql_text):
+    """
+    (template, literals): sql_text with its literals replaced by placeholders
+    and its whitespace collapsed, and the text of each literal replaced, in
+    order
+    """
+    literals = []
+
+    def replace(match):
+        kind = match.lastgroup
+        if kind == 'space':
+            return ' '
+        if kind == 'word':
+            return match.group()
+        literals.append(match.group())
+        return NUMBER_PLACEHOLDER if kind == 'number' else STRING_PLACEHOLDER
+
+    return LITERAL.sub(replace, sql_text).strip(), literals
+
+
+def fill(tokens, literals, string_value):
+    """
+    tokens (nested lists of strings) with each placeholder token replaced by
+    the value of the next of literals
+    """
+    filled = []
+    for token in tokens:
+        if isinstance(token, list):
+            filled.append(fill(token, literals, string_value))
+        elif token == NUMBER_PLACEHOLDER:
+            filled.append(next(literals))
+        elif token == '':
+            filled.append(string_value(next(literals)))
+        else:
+            filled.append(token)
+    return filled
+
+
+class TemplateParser:
+    """
+    Parses SQL through a cache of at most max_templates template results
+    """
+
+    def __init__(self, max_templates=DEFAULT_MAX_TEMPLATES):
+        self.cache = ParseCache(max_templates)
+
+    def string_value(self, text):
+        # what QUOTED_SQL_STRING gives for text, escapes and all
+        return run.QUOTED_SQL_STRING.parseImpl(text, 0)[1]
+
+    def parse(self, sql_text):
+        """
+        The same as parse_sql(sql_text).asList(), including the exception
+        raised if it does not parse
+        """
+        template, literals = normalize(sql_text)
+        key = hashlib.blake2b(template.encode(), digest_size=16).digest()
+        tokens = self.cache.get(key)
+        if tokens is None:
+            from pyparsing import ParseBaseException
+
+            try:
+                tokens = run.parse_sql(template).asList()
+            except ParseBaseException:
+                tokens = FAILED
+            self.cache.set(key, tokens)
+        if tokens is FAILED:
+            # parse the statement itself, for an error at the right place
+            return run.parse_sql(sql_text).asList()
+        return fill(tokens, iter(literals), self.string_value)
+
+    def stats(self):
+        cache = self.cache
+        lookups = cache.hits + cache.misses
+        return {
+            'hits': cache.hits,
+            'misses': cache.misses,
+            'evictions': cache.evictions,
+            'templates': len(cache),
+            'hit_rate': cache.hits / lookups if lookups else 0.0,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--max-templates', type=int, default=DEFAULT_MAX_TEMPLATES)
+    parser.add_argument('files', nargs='+')
+    args = parser.parse_args(argv)
+    from pyparsing import ParseBaseException
+
+    templates = TemplateParser(args.max_templates)
+    statements = failed = 0
+    start = time.perf_counter()
+    for path in args.files:
+        with open(path) as script:
+            for offset, text in split_statements(script):
+                statements += 1
+                try:
+                    templates.parse(text)
+                except ParseBaseException as error:
+                    failed += 1
+                    print(f'{path}: {offset + error.loc}: {error.msg}')
+    seconds = time.perf_counter() - start
+    print(
+        f'{statements} statements in {seconds:.2f} s '
+        f'({statements / seconds:.0f}/s), {failed} failed'
+    )
+    print(templates.stats())
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+from pyparsing import ParseException
+
+import run
+from batch import main, parse_files, parse_texts
+
+TEXTS = ['select 1;', 'select from x;', 'select a, b from c;']
+
+
+class TestParseTexts:
+    def test_outcomes_are_in_input_order(self):
+        outcomes = parse_texts(TEXTS, max_workers=2)
+        assert [o.source for o in outcomes] == TEXTS
+        assert [o.error is None for o in outcomes] == [True, False, True]
+
+    def test_results_match_parse_sql(self):
+        outcomes = parse_texts(TEXTS, max_workers=2, chunksize=2)
+        assert outcomes[2].result.dump() == run.parse_sql(TEXTS[2]).dump()
+
+    def test_errors_are_parse_exceptions(self):
+        outcome = parse_texts(TEXTS[1:2], max_workers=1)[0]
+        assert isinstance(outcome.error, ParseException)
+        assert outcome.error.loc == len('select ')
+
+    def test_too_deep_a_script_is_an_error(self):
+        deep = 'select ' + '(' * 400 + 'x' + ')' * 400 + ' from t;'
+        outcomes = parse_texts([deep, TEXTS[0]], max_workers=1)
+        assert isinstance(outcomes[0].error, RecursionError)
+        assert outcomes[1].error is None
+
+    def test_workers_can_load_a_saved_grammar(self, tmp_path):
+        path = str(tmp_path / 'grammar.pickle')
+        run.save_grammar(path)
+        outcomes = parse_texts(TEXTS, max_workers=1, grammar_path=path)
+        assert [o.error is None for o in outcomes] == [True, False, True]
+
+
+    def test_workers_can_share_a_cache(self, tmp_path):
+        cache_dir = str(tmp_path / 'cache')
+        cold = parse_texts(TEXTS, max_workers=2, cache_dir=cache_dir)
+        warm = parse_texts(TEXTS, max_workers=2, cache_dir=cache_dir)
+        assert [o.result.dump() for o in warm if o.result] == [
+            o.result.dump() for o in cold if o.result
+        ]
+        assert [o.error is None for o in warm] == [True, False, True]
+
+
+class TestParseFiles:
+    def write_scripts(self, tmp_path):
+        paths = []
+        for number, text in enumerate(TEXTS):
+            path = tmp_path / f'{number}.sql'
+            path.write_text(text)
+            paths.append(str(path))
+        return paths
+
+    def test_it_parses_each_file(self, tmp_path):
+        paths = self.write_scripts(tmp_path)
+        outcomes = parse_files(paths, max_workers=2)
+        assert [o.source for o in outcomes] == paths
+        assert [o.error is None for o in outcomes] == [True, False, True]
+
+    def test_a_missing_file_is_an_error(self, tmp_path):
+        outcome = parse_files([str(tmp_path / 'missing.sql')], max_workers=1)[0]
+        assert isinstance(outcome.error, OSError)
+
+    def test_a_file_that_is_not_utf_8_is_an_error(self, tmp_path):
+        path = tmp_path / 'latin1.sql'
+        path.write_bytes("select 'caf\xe9';".encode('latin-1'))
+        paths = [str(path)] + self.write_scripts(tmp_path)
+        outcomes = parse_files(paths, max_workers=1, chunksize=2)
+        assert isinstance(outcomes[0].error, UnicodeDecodeError)
+        assert [o.error is None for o in outcomes[1:]] == [True, False, True]
+
+    def test_main_fails_if_any_file_fails(self, tmp_path, capsys):
+        paths = self.write_scripts(tmp_path)
+        assert main(['--workers', '1', paths[0], paths[2]]) == 0
+        assert main(['--workers', '1'] + paths) == 1
+        assert paths[1] in capsys.readouterr().out
@@ -0,0 +1,59 @@
+import pytest
+from pyparsing import ParseBaseException
+
+import run
+from budget import BudgetExceeded, budgeted
+from hooks import grammar_elements
+
+WIDE_SQL = 'select ' + ', '.join(f'c{i} + {i}' for i in range(200)) + ' from t;'
+
+
+class TestBudget:
+    def test_it_stops_after_max_steps(self):
+        with pytest.raises(BudgetExceeded, match='more than 100 steps'):
+            run.parse_sql(WIDE_SQL, max_steps=100)
+
+    def test_it_stops_after_max_seconds(self):
+        with pytest.raises(BudgetExceeded, match='took over 0 seconds'):
+            run.parse_sql(WIDE_SQL, max_seconds=0)
+
+    def test_it_stops_where_the_parse_had_got_to(self):
+        with budgeted(run.STATEMENTS) as budget:
+            run.parse_sql(WIDE_SQL)
+        steps = budget.steps
+        locs = []
+        for max_steps in (steps // 4, steps // 2):
+            with pytest.raises(BudgetExceeded) as error:
+                run.parse_sql(WIDE_SQL, max_steps=max_steps)
+            locs.append(error.value.loc)
+        assert locs[0] < locs[1]
+
+    def test_a_parse_within_budget_is_unchanged(self):
+        result = run.parse_sql(WIDE_SQL, max_seconds=60, max_steps=10**7)
+        assert result.asList() == run.parse_sql(WIDE_SQL).asList()
+
+    def test_alternatives_do_not_catch_it(self):
+        # a fatal exception, so callers catching ParseBaseException see it
+        # rather than a plain syntax error from a later alternative
+        with pytest.raises(ParseBaseException) as error:
+            run.parse_sql(WIDE_SQL, max_steps=1000)
+        assert isinstance(error.value, BudgetExceeded)
+
+    def test_it_counts_steps_across_the_block(self):
+        with budgeted(run.STATEMENTS) as budget:
+            run.parse_sql('select 1;')
+            once = budget.steps
+            run.parse_sql('select 1;')
+        assert once > 0
+        assert budget.steps == 2 * once
+
+    def test_it_removes_its_instrumentation(self):
+        run.parse_sql('select 1;', max_steps=10**6)
+        statements = run.get_grammar()['STATEMENTS']
+        assert all('_parse' not in vars(e) for e in grammar_elements(statements))
+
+    def test_it_works_with_memoize(self):
+        with pytest.raises(BudgetExceeded):
+            run.parse_sql(WIDE_SQL, memoize=True, max_steps=100)
+        result = run.parse_sql(WIDE_SQL, memoize=True, max_steps=10**7)
+        assert result.asList() == run.parse_sql(WIDE_SQL).asList()
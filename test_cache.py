@@ -0,0 +1,69 @@
+import os
+
+import pytest
+from pyparsing import ParseException
+
+import run
+from cache import DiskCache, parse_sql_cached
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskCache(str(tmp_path / 'cache'))
+
+
+class TestDiskCache:
+    def test_it_misses_unknown_sql(self, cache):
+        assert cache.get('select 1;') is None
+
+    def test_it_returns_what_was_put(self, cache):
+        result = run.parse_sql('select 1;')
+        cache.put('select 1;', result, None)
+        cached_result, error = cache.get('select 1;')
+        assert cached_result.dump() == result.dump()
+        assert error is None
+
+    def test_it_is_keyed_on_the_grammar_too(self, cache, monkeypatch):
+        cache.put('select 1;', run.parse_sql('select 1;'), None)
+        monkeypatch.setattr(run, 'grammar_fingerprint', lambda: 'changed')
+        other = DiskCache(cache.directory)
+        assert other.get('select 1;') is None
+
+    def test_it_leaves_no_temporary_files(self, cache):
+        cache.put('select 1;', run.parse_sql('select 1;'), None)
+        paths = [path for _, _, path in cache.entries()]
+        assert paths == [cache.path('select 1;')]
+        assert os.listdir(os.path.dirname(paths[0])) == [os.path.basename(paths[0])]
+
+    def test_it_evicts_the_least_recently_used_entries(self, cache):
+        for number in range(3):
+            sql = f'select {number};'
+            cache.put(sql, run.parse_sql(sql), None)
+            os.utime(cache.path(sql), (number, number))
+        cache.get('select 0;')
+        cache.max_bytes = os.path.getsize(cache.path('select 0;')) + os.path.getsize(
+            cache.path('select 2;')
+        )
+        cache.evict()
+        assert cache.get('select 1;') is None
+        assert cache.get('select 0;') is not None
+        assert cache.get('select 2;') is not None
+
+
+class TestParseSqlCached:
+    def test_it_parses_and_stores_on_a_miss(self, cache):
+        result = parse_sql_cached('select a from b;', cache)
+        assert result.dump() == run.parse_sql('select a from b;').dump()
+        assert cache.get('select a from b;') is not None
+
+    def test_it_does_not_parse_on_a_hit(self, cache, monkeypatch):
+        parse_sql_cached('select a from b;', cache)
+        monkeypatch.setattr(run, 'parse_sql', None)
+        assert parse_sql_cached('select a from b;', cache)
+
+    def test_errors_are_cached_too(self, cache, monkeypatch):
+        with pytest.raises(ParseException):
+            parse_sql_cached('select from b;', cache)
+        monkeypatch.setattr(run, 'parse_sql', None)
+        with pytest.raises(ParseException):
+            parse_sql_cached('select from b;', cache)
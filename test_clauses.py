@@ -0,0 +1,39 @@
+import pytest
+from pyparsing import CaselessKeyword, ParseException, Word, nums
+
+from clauses import ClauseDispatch
+
+NUMBER = Word(nums)
+CLAUSES = ClauseDispatch(
+    [
+        {'where': CaselessKeyword('where') + NUMBER},
+        {'limit': CaselessKeyword('limit') + NUMBER, 'fetch': CaselessKeyword('fetch')},
+    ]
+)
+
+
+def parse(text):
+    return CLAUSES.parseString(text, parseAll=True).asList()
+
+
+class TestClauseDispatch:
+    def test_every_clause_is_optional(self):
+        assert parse('') == []
+        assert parse('limit 1') == ['limit', '1']
+
+    def test_it_matches_clauses_in_order(self):
+        assert parse('WHERE 1 limit 2') == ['where', '1', 'limit', '2']
+
+    def test_it_stops_at_a_clause_out_of_order_or_repeated(self):
+        for text in ('limit 2 where 1', 'where 1 where 2', 'limit 1 fetch'):
+            with pytest.raises(ParseException):
+                parse(text)
+
+    def test_it_stops_at_a_word_that_starts_no_clause(self):
+        loc, tokens = CLAUSES._parse('where 1 other', 0)
+        assert (loc, tokens.asList()) == (len('where 1'), ['where', '1'])
+
+    def test_a_clause_that_has_started_must_match(self):
+        with pytest.raises(ParseException) as raised:
+            CLAUSES._parse('where 1 limit x', 0)
+        assert raised.value.loc == len('where 1 limit ')
@@ -0,0 +1,33 @@
+from run import parse_sql
+from corpus import CorpusGenerator, function_signatures, generate_corpus
+
+
+class TestGenerateCorpus:
+    def test_it_is_the_same_for_the_same_seed(self):
+        assert generate_corpus(5, seed=1) == generate_corpus(5, seed=1)
+        assert generate_corpus(5, seed=1) != generate_corpus(5, seed=2)
+
+    def test_it_makes_the_number_of_statements_asked_for(self):
+        assert generate_corpus(7).count(';') == 7
+
+    def test_it_parses(self):
+        for depth in range(4):
+            sql = generate_corpus(10, depth=depth, calls_per_family=2, seed=depth)
+            assert parse_sql(sql).asList().count(';') == 10
+
+    def test_each_statement_has_columns_plus_calls_per_family(self):
+        generator = CorpusGenerator(columns=3, calls_per_family=2)
+        families = sum(1 for signatures in generator.signatures.values() if signatures)
+        result = parse_sql(generator.statement())
+        assert len(result['column_list']) == 3 + 2 * families
+
+
+class TestFunctionSignatures:
+    def test_a_name_is_only_in_its_first_list(self):
+        signatures = function_signatures()
+        names = [
+            signature.name.upper()
+            for family in signatures.values()
+            for signature in family
+        ]
+        assert len(names) == len(set(names))
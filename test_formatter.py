@@ -0,0 +1,174 @@
+import pytest
+from pyparsing import ParseException
+
+import run
+from corpus import generate_corpus
+from formatter import format_files, format_sql, main
+
+
+def columns(sql):
+    """
+    The column lines format_sql writes for sql, without their indentation
+    and commas
+    """
+    lines = format_sql(sql).splitlines()[1:-1]
+    return [line.strip().rstrip(',') for line in lines]
+
+
+class TestFormatSql:
+    def test_it_writes_the_canonical_layout(self):
+        sql = 'SELECT DISTINCT a,Round(b,2) AS c FROM db.s.t;select * from t;'
+        assert format_sql(sql) == (
+            'select distinct\n'
+            '    a,\n'
+            '    round(b, 2) as c\n'
+            'from db.s.t;\n'
+            '\n'
+            'select *\n'
+            'from t;\n'
+        )
+
+    def test_it_writes_a_clause_per_line(self):
+        sql = (
+            'SELECT a FROM t WHERE a>1 GROUP BY a,b HAVING b QUALIFY a=1 '
+            'ORDER BY a DESC NULLS LAST,b OFFSET 5 FETCH FIRST 10 ROWS ONLY;'
+        )
+        assert format_sql(sql) == (
+            'select\n'
+            '    a\n'
+            'from t\n'
+            'where a > 1\n'
+            'group by a, b\n'
+            'having b\n'
+            'qualify a = 1\n'
+            'order by a desc nulls last, b\n'
+            'limit 10 offset 5;\n'
+        )
+
+    def test_it_keeps_only_the_parentheses_precedence_needs(self):
+        sql = (
+            'select ((a + b)) * c, a - (b - c), (a - b) - c, -(a + 1), '
+            '(a + 1) is null, not (a = 1) and (b or c) from t;'
+        )
+        assert columns(sql) == [
+            '(a + b) * c',
+            'a - (b - c)',
+            'a - b - c',
+            '-(a + 1)',
+            'a + 1 is null',
+            'not a = 1 and (b or c)',
+        ]
+
+    @pytest.mark.parametrize(
+        'sql',
+        [
+            'select (a = b) = c from t;',
+            'select a = (b = c) from t;',
+            'select (a < b) <> (c >= d) from t;',
+            'select (a - b) - c, a - (b - c) from t;',
+            'select (a = b) is null, not (a = b) = c from t;',
+        ],
+    )
+    def test_comparisons_keep_their_parentheses(self, sql):
+        formatted = format_sql(sql)
+        assert run.parse_ast(formatted) == run.parse_ast(sql)
+
+    def test_it_writes_casts_and_concatenation(self):
+        sql = (
+            "select (-a)::INT, -a::Number(38,2), (a || b) || 'c', a || (b || c) "
+            'from t;'
+        )
+        assert columns(sql) == [
+            '(-a)::int',
+            '-a::number(38, 2)',
+            "a || b || 'c'",
+            'a || (b || c)',
+        ]
+
+    def test_it_writes_in_lists(self):
+        sql = 'select a IN (1,2), not b NOT IN (c + 1), (a in (1)) in (true) from t;'
+        assert columns(sql) == [
+            'a in (1, 2)',
+            'not b not in (c + 1)',
+            'a in (1) in (true)',
+        ]
+
+    def test_it_does_not_write_a_comment(self):
+        assert columns('select - -a from t;') == ['- -a']
+
+    def test_it_writes_case_expressions_over_several_lines(self):
+        sql = 'select case when a > 1 then b when c then 2 else 0 end as d from t;'
+        assert format_sql(sql).splitlines()[1:-1] == [
+            '    case',
+            '        when a > 1 then b',
+            '        when c then 2',
+            '        else 0',
+            '    end as d',
+        ]
+
+    def test_it_writes_nested_case_expressions_on_one_line(self):
+        sql = 'select case when case when a then 1 end = 1 then b end from t;'
+        assert 'when case when a then 1 end = 1 then b' in format_sql(sql)
+
+    def test_context_functions_have_no_parentheses(self):
+        sql = 'select current_date(), pi(), random() from t;'
+        assert columns(sql) == ['current_date', 'pi()', 'random()']
+
+    def test_strings_keep_their_values(self):
+        sql = r"select 'a\tb', 'c\\d', 'e\', '' from t;"
+        formatted = format_sql(sql)
+        assert run.parse_ast(formatted) == run.parse_ast(sql)
+
+    def test_it_keeps_the_meaning_and_is_stable(self):
+        for seed in range(3):
+            sql = generate_corpus(10, seed=seed)
+            formatted = format_sql(sql)
+            assert run.parse_ast(formatted) == run.parse_ast(sql)
+            assert format_sql(formatted) == formatted
+
+    def test_it_raises_for_sql_that_does_not_parse(self):
+        with pytest.raises(ParseException):
+            format_sql('select from t;')
+
+
+class TestMain:
+    def write_tree(self, tmp_path):
+        (tmp_path / 'models').mkdir()
+        (tmp_path / 'models' / 'a.sql').write_text('SELECT a FROM t;')
+        (tmp_path / 'b.sql').write_text('select\n    b\nfrom t;\n')
+        (tmp_path / 'notes.txt').write_text('not sql')
+        return tmp_path
+
+    def test_check_lists_files_that_would_change(self, tmp_path, capsys):
+        tree = self.write_tree(tmp_path)
+        assert main(['--check', '--workers', '1', str(tree)]) == 1
+        assert capsys.readouterr().out == f'would reformat {tree}/models/a.sql\n'
+        assert (tree / 'models' / 'a.sql').read_text() == 'SELECT a FROM t;'
+
+    def test_it_rewrites_files_in_place(self, tmp_path, capsys):
+        tree = self.write_tree(tmp_path)
+        assert main(['--workers', '2', str(tree)]) == 0
+        assert (tree / 'models' / 'a.sql').read_text() == 'select\n    a\nfrom t;\n'
+        assert main(['--check', '--workers', '1', str(tree)]) == 0
+
+    def test_it_reports_files_that_do_not_parse(self, tmp_path):
+        path = tmp_path / 'bad.sql'
+        path.write_text('select from t;')
+        outcome = format_files([str(path)], max_workers=1)[0]
+        assert isinstance(outcome.error, ParseException)
+        assert main([str(path)]) == 1
+        assert path.read_text() == 'select from t;'
+
+    def test_it_reports_undecodable_and_too_deep_files(self, tmp_path):
+        latin1 = tmp_path / 'latin1.sql'
+        latin1.write_bytes("select 'caf\xe9';".encode('latin-1'))
+        deep = tmp_path / 'deep.sql'
+        deep.write_text('select ' + '(' * 400 + 'x' + ')' * 400 + ' from t;')
+        good = tmp_path / 'good.sql'
+        good.write_text('select a from t;')
+        paths = [str(latin1), str(deep), str(good)]
+        outcomes = format_files(paths, max_workers=1, chunksize=3)
+        assert isinstance(outcomes[0].error, UnicodeDecodeError)
+        assert isinstance(outcomes[1].error, RecursionError)
+        assert outcomes[2].error is None
+        assert main(paths) == 1
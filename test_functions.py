@@ -1,5 +1,5 @@
 import pytest
-from pyparsing import ParseException
+from pyparsing import ParseException, ParseFatalException
 
 from run import EXPRESSION
 from functions import (
@@ -12,6 +12,13 @@ from functions import (
     make_unary_function_with_two_optional_args,
     make_unary_function_with_three_optional_args,
     make_binary_function_with_one_optional_args,
+    get_function_alternatives,
+    get_function_expression,
+    CONTEXT_FUNCTION_NAMES,
+    UNARY_FUNCTION_NAMES,
+    UNARY_THREE_OPTIONAL_FUNCTION_NAMES,
+    BINARY_FOUR_OPTIONAL_FUNCTION_NAMES,
+    QUATERNARY_FUNCTION_NAMES,
 )
 
 
@@ -40,6 +47,10 @@ BINARY_FUNCTION_ONE_OPTIONAL = make_binary_function_with_one_optional_args(EXPRE
 # Quaternary Functions
 QUATERNARY_FUNCTION = make_n_ary_function('HAVERSINE', 4, EXPRESSION)
 
+# All Functions
+FUNCTION_ALTERNATIVES = get_function_alternatives(EXPRESSION)
+FUNCTION_DISPATCH = get_function_expression(EXPRESSION)
+
 
 class TestContextFunction:
     """
@@ -201,3 +212,73 @@ class TestBinaryFunctionWithOneOptionalArgs:
         assert_raises_parse_exception(
             BINARY_FUNCTION_ONE_OPTIONAL, 'CHARINDEX(1,2,3,4)'
         )
+
+
+class TestFunctionDispatch:
+    def assert_same_results(self, text):
+        expected = FUNCTION_ALTERNATIVES.parseString(text, parseAll=True)
+        actual = FUNCTION_DISPATCH.parseString(text, parseAll=True)
+        assert actual.asList() == expected.asList()
+
+    def test_it_matches_the_alternatives_for_context_functions(self):
+        for name in CONTEXT_FUNCTION_NAMES:
+            self.assert_same_results(name)
+            self.assert_same_results(name.lower() + '()')
+
+    def test_it_matches_the_alternatives_for_empty_argument_lists(self):
+        self.assert_same_results('current_date()')
+        self.assert_same_results('pi()')
+        self.assert_same_results('random()')
+        self.assert_same_results('random(1)')
+
+    def test_it_matches_the_alternatives_for_fixed_arity_functions(self):
+        for name in UNARY_FUNCTION_NAMES:
+            self.assert_same_results(name + '(x)')
+        for name in QUATERNARY_FUNCTION_NAMES:
+            self.assert_same_results(name + '(w, x, y, z)')
+
+    def test_it_matches_the_alternatives_for_optional_args(self):
+        for name in UNARY_THREE_OPTIONAL_FUNCTION_NAMES:
+            self.assert_same_results(name + '(x)')
+            self.assert_same_results(name + '(x, 1, 2, 3)')
+        for name in BINARY_FOUR_OPTIONAL_FUNCTION_NAMES:
+            self.assert_same_results(name + '(x, y, 1, 2, 3, 4)')
+
+    def test_a_name_in_two_lists_keeps_its_first_signature(self):
+        self.assert_same_results('trunc(x)')
+        self.assert_same_results('trunc(x, y)')
+
+    def test_it_rejects_unknown_functions(self):
+        assert_raises_parse_exception(FUNCTION_DISPATCH, 'NOT_A_FUNCTION(x)')
+
+    def test_it_rejects_a_function_name_prefix(self):
+        assert_raises_parse_exception(FUNCTION_DISPATCH, 'BITNOTS(x)')
+
+    def test_it_rejects_the_wrong_number_of_args(self):
+        with pytest.raises(ParseFatalException, match='BITNOT takes 1 argument, got 2'):
+            FUNCTION_DISPATCH.parseString('BITNOT(x, y)', parseAll=True)
+        with pytest.raises(ParseFatalException, match='PI takes no arguments, got 1'):
+            FUNCTION_DISPATCH.parseString('PI(1)', parseAll=True)
+
+    def test_it_reports_the_first_extra_arg(self):
+        with pytest.raises(ParseFatalException) as error:
+            FUNCTION_DISPATCH.parseString('round(x, 1,  2, 3)', parseAll=True)
+        assert error.value.loc == 13
+        assert 'ROUND takes 1 to 2 arguments, got 4' in str(error.value)
+
+    def test_it_reports_too_few_args_at_the_closing_paren(self):
+        with pytest.raises(ParseFatalException) as error:
+            FUNCTION_DISPATCH.parseString('datediff(day, x )', parseAll=True)
+        assert error.value.loc == 16
+        with pytest.raises(ParseFatalException, match='got 0'):
+            FUNCTION_DISPATCH.parseString('bitnot( )', parseAll=True)
+
+    def test_it_parses_nested_calls(self):
+        actual = FUNCTION_DISPATCH.parseString('round(upper(x), 2)', parseAll=True)
+        assert actual.asList() == ['ROUND', '(', 'UPPER', '(', 'x', ')', ',', '2', ')']
+
+    def test_it_needs_parens_unless_they_are_optional(self):
+        assert_raises_parse_exception(FUNCTION_DISPATCH, 'round')
+        assert FUNCTION_DISPATCH.parseString('current_date').asList() == [
+            'CURRENT_DATE'
+        ]
@@ -0,0 +1,35 @@
+import pytest
+from pyparsing import ParseException
+
+from run import IDENTIFIER, parse_sql
+from identifiers import SNOWFLAKE_RESERVED_WORDS, UnreservedWord
+
+
+class TestUnreservedWord:
+    def test_reserved_words_are_case_insensitive(self):
+        word = UnreservedWord(['select'])
+        for text in ('select', 'SELECT', 'SeLeCt'):
+            with pytest.raises(ParseException):
+                word.parseString(text, parseAll=True)
+
+    def test_words_starting_with_a_reserved_word_are_identifiers(self):
+        for text in ('selected', 'from_date', 'as$', 'end1'):
+            assert IDENTIFIER.parseString(text, parseAll=True).asList() == [text]
+
+    def test_it_matches_the_whole_name(self):
+        assert IDENTIFIER.parseString('x$1_y').asList() == ['x$1_y']
+
+    def test_it_takes_the_snowflake_reserved_words(self):
+        word = UnreservedWord(SNOWFLAKE_RESERVED_WORDS)
+        with pytest.raises(ParseException):
+            word.parseString('qualify', parseAll=True)
+        assert word.parseString('qualified', parseAll=True).asList() == ['qualified']
+
+    def test_keywords_still_end_a_column_list(self):
+        assert parse_sql('select a, b from t;').asList() == [
+            'select',
+            [['a'], ['b']],
+            'from',
+            't',
+            ';',
+        ]
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from incremental import IncrementalParser
+
+SCRIPT = "select a from t;\nselect 'x;y' as b;\nselect (c + 1) from s;\n"
+
+
+def summary(statements):
+    return [
+        (
+            s.offset,
+            s.text,
+            s.result.dump() if s.result is not None else None,
+            s.error.loc if s.error is not None else None,
+        )
+        for s in statements
+    ]
+
+
+def assert_matches_a_fresh_parse(parser):
+    fresh = IncrementalParser(parser.text)
+    assert summary(parser.statements) == summary(fresh.statements)
+
+
+class TestIncrementalParser:
+    def test_it_parses_the_initial_text(self):
+        parser = IncrementalParser(SCRIPT)
+        assert [s.offset for s in parser.statements] == [0, 16, 35]
+        assert all(s.error is None for s in parser.statements)
+
+    def test_an_edit_inside_a_statement_reparses_only_that_statement(self):
+        parser = IncrementalParser(SCRIPT)
+        third = parser.statements[2]
+        reparsed = parser.edit(7, 8, 'abc')
+        assert [s.text for s in reparsed] == ['select abc from t;']
+        assert parser.statements[2].result is third.result
+        assert parser.statements[2].offset == third.offset + 2
+        assert_matches_a_fresh_parse(parser)
+
+    def test_removing_a_semicolon_merges_statements(self):
+        parser = IncrementalParser(SCRIPT)
+        reparsed = parser.edit(15, 16, '')
+        assert len(reparsed) == 1
+        assert reparsed[0].error is not None
+        assert len(parser.statements) == 2
+        assert_matches_a_fresh_parse(parser)
+
+    def test_adding_a_semicolon_splits_a_statement(self):
+        parser = IncrementalParser('select a select b;')
+        parser.edit(8, 8, ';')
+        assert [s.text for s in parser.statements] == ['select a;', ' select b;']
+        assert all(s.error is None for s in parser.statements)
+
+    def test_a_new_quote_moves_the_boundaries_after_it(self):
+        parser = IncrementalParser(SCRIPT)
+        parser.edit(7, 7, "'")
+        assert parser.statements[0].text == "select 'a from t;\nselect 'x;"
+        assert_matches_a_fresh_parse(parser)
+
+    def test_it_can_start_empty(self):
+        parser = IncrementalParser()
+        assert parser.statements == []
+        parser.edit(0, 0, 'select 1;')
+        assert parser.statements[0].error is None
+
+    def test_a_too_deep_statement_is_an_error(self):
+        parser = IncrementalParser(SCRIPT)
+        parser.edit(7, 8, '(' * 400 + 'a' + ')' * 400)
+        assert isinstance(parser.statements[0].error, RecursionError)
+        assert all(s.error is None for s in parser.statements[1:])
+
+    def test_it_rejects_edits_outside_the_text(self):
+        with pytest.raises(ValueError):
+            IncrementalParser('select 1;').edit(5, 20, '')
+
+    def test_random_edits_match_a_fresh_parse(self):
+        generator = random.Random(0)
+        parser = IncrementalParser(SCRIPT * 3)
+        pieces = [';', "'", ' ', 'x', 'select ', '(', ')', '\n', '']
+        for _ in range(300):
+            start = generator.randint(0, len(parser.text))
+            end = min(len(parser.text), start + generator.randint(0, 5))
+            parser.edit(start, end, generator.choice(pieces))
+            assert_matches_a_fresh_parse(parser)
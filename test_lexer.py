@@ -0,0 +1,145 @@
+import pytest
+from pyparsing import ParseException
+
+from run import get_grammar, parse_sql
+from lexer import Lexeme, token_index, token_matching, tokenize
+
+
+def kinds_and_texts(text):
+    return [(token.kind, token.text) for token in tokenize(text)]
+
+
+class TestTokenize:
+    def test_it_splits_a_statement(self):
+        assert kinds_and_texts("select a, 'b' from t;") == [
+            ('word', 'select'),
+            ('word', 'a'),
+            ('operator', ','),
+            ('string', "'b'"),
+            ('word', 'from'),
+            ('word', 't'),
+            ('operator', ';'),
+        ]
+
+    def test_it_records_positions(self):
+        assert tokenize('  ab <= 1') == [
+            Lexeme('word', 'ab', 2, 4),
+            Lexeme('operator', '<=', 5, 7),
+            Lexeme('number', '1', 8, 9),
+        ]
+
+    def test_it_drops_comments(self):
+        sql = 'select -- one\n a /* two\n three */ // four\n;'
+        assert kinds_and_texts(sql) == [
+            ('word', 'select'),
+            ('word', 'a'),
+            ('operator', ';'),
+        ]
+
+    def test_strings_are_what_quoted_string_matches(self):
+        # no escaped quotes and no line breaks, as QuotedString("'")
+        assert kinds_and_texts(r"'a; \' 'it''s'") == [
+            ('string', r"'a; \'"),
+            ('string', "'it'"),
+            ('string', "'s'"),
+        ]
+        assert kinds_and_texts("'a\nb'")[0] == ('error', "'")
+
+    def test_it_reads_snowflake_operators(self):
+        assert [text for _, text in kinds_and_texts('a::int || b != c')] == [
+            'a',
+            '::',
+            'int',
+            '||',
+            'b',
+            '!=',
+            'c',
+        ]
+
+    def test_decimals_are_digits_around_a_dot(self):
+        assert kinds_and_texts('1.5') == [
+            ('number', '1'),
+            ('operator', '.'),
+            ('number', '5'),
+        ]
+
+    def test_quoted_identifiers_are_one_token(self):
+        assert kinds_and_texts('"My Column"') == [
+            ('quoted_identifier', '"My Column"')
+        ]
+
+    def test_unknown_characters_are_errors(self):
+        assert kinds_and_texts("a ? 'open") == [
+            ('word', 'a'),
+            ('error', '?'),
+            ('error', "'"),
+            ('word', 'open'),
+        ]
+
+
+class TestTokenMatching:
+    def test_it_gives_the_same_results(self):
+        sql = (
+            "select distinct a as b, -1.5 * c, 'x', regexp_count(d, 'y'), "
+            "case when e is not null then f else 2 end from db.s.t; select *;"
+        )
+        expected = parse_sql(sql).dump()
+        with token_matching(get_grammar()['STATEMENTS'].streamline()):
+            assert parse_sql(sql).dump() == expected
+
+    def test_function_calls_give_the_same_tokens(self):
+        sql = 'select pi(), pi( ), random(), random(1), current_date(), current_date;'
+        expected = parse_sql(sql).asList()
+        with token_matching(get_grammar()['STATEMENTS'].streamline()):
+            assert parse_sql(sql).asList() == expected
+        assert expected[1][0] == ['PI', '()']
+        assert expected[1][2] == ['RANDOM', '(', ')']
+
+    @pytest.mark.parametrize(
+        'sql', ["select 'it''s';", "select 'a\\' ;", "select 'a\\tb', 'a\\qb';"]
+    )
+    def test_strings_match_as_they_do_from_the_characters(self, sql):
+        def outcome():
+            try:
+                return parse_sql(sql).dump()
+            except ParseException as error:
+                return error.loc
+
+        expected = outcome()
+        with token_matching(get_grammar()['STATEMENTS'].streamline()):
+            assert outcome() == expected
+
+    def test_identifiers_match_whole_words_that_are_not_reserved(self):
+        statements = get_grammar()['STATEMENTS'].streamline()
+        with token_matching(statements):
+            assert parse_sql('select a$1 from s.t;').asList() == [
+                'select', [['a$1']], 'from', 's', '.', 't', ';'
+            ]
+            with pytest.raises(ParseException):
+                parse_sql('select _a from t;')
+            with pytest.raises(ParseException):
+                parse_sql('select a from select;')
+
+    def test_each_index_keeps_its_own_tokens(self):
+        first, second = token_index(), token_index()
+        text = 'select a;'
+        assert first(text) is first(text)
+        assert second(text) is not first(text)
+        assert second('select b;')[7].text == 'b'
+        assert first(text)[7].text == 'a'
+
+    def test_keywords_do_not_match_inside_longer_words(self):
+        with token_matching(get_grammar()['STATEMENTS'].streamline()):
+            assert parse_sql('select fromage from t;').asList() == [
+                'select',
+                [['fromage']],
+                'from',
+                't',
+                ';',
+            ]
+
+    def test_it_puts_the_grammar_back(self):
+        statements = get_grammar()['STATEMENTS'].streamline()
+        with token_matching(statements):
+            pass
+        assert parse_sql("select 'a';").asList() == ['select', [['a']], ';']
@@ -0,0 +1,88 @@
+import pytest
+from pyparsing import ParseException
+
+import run
+from corpus import generate_corpus
+from lineage import References, extract_references, main
+from nodes import FunctionCall, Identifier, TableRef
+
+
+def walked_references(select):
+    """
+    The References for a nodes.Select, found by walking its tree
+    """
+    found = {TableRef: [], Identifier: [], FunctionCall: []}
+    for node in select.walk():
+        if type(node) in found:
+            found[type(node)].append(node)
+    return References(
+        tuple(dict.fromkeys(tuple(table) for table in found[TableRef])),
+        tuple(dict.fromkeys(node.name for node in found[Identifier])),
+        tuple(dict.fromkeys(node.name for node in found[FunctionCall])),
+    )
+
+
+class TestExtractReferences:
+    def test_it_finds_tables_columns_and_functions(self):
+        sql = (
+            'select a, round(b, 2) + c as d, '
+            'case when e > 1 then f else 0 end, current_date '
+            'from db.s.t;'
+        )
+        assert extract_references(sql) == (
+            References(
+                (('db', 's', 't'),),
+                ('a', 'b', 'c', 'e', 'f'),
+                ('ROUND', 'CURRENT_DATE'),
+            ),
+        )
+
+    def test_it_gives_one_references_per_statement(self):
+        sql = 'select * from t; select x, upper(x), x from s.t; select 1;'
+        assert extract_references(sql) == (
+            References(((None, None, 't'),), (), ()),
+            References(((None, 's', 't'),), ('x',), ('UPPER',)),
+            References((), (), ()),
+        )
+
+    def test_it_finds_columns_in_every_clause(self):
+        sql = 'select a from t where b group by c having d qualify e order by f;'
+        (references,) = extract_references(sql)
+        assert references.columns == ('a', 'b', 'c', 'd', 'e', 'f')
+
+    def test_aliases_are_not_columns(self):
+        (references,) = extract_references('select a as b, c d from t;')
+        assert references.columns == ('a', 'c')
+
+    def test_it_matches_walking_the_tree(self):
+        for seed in range(3):
+            sql = generate_corpus(10, seed=seed)
+            assert extract_references(sql) == tuple(
+                walked_references(select) for select in run.parse_ast(sql)
+            )
+
+    def test_it_leaves_the_grammar_as_it_was(self):
+        sql = 'select a + 1 from t;'
+        expected = run.parse_sql(sql).asList()
+        extract_references(sql)
+        assert run.parse_sql(sql).asList() == expected
+
+    def test_it_raises_for_sql_that_does_not_parse(self):
+        with pytest.raises(ParseException):
+            extract_references('select a from t; select from t;')
+        assert extract_references('select a from t;') == (
+            References(((None, None, 't'),), ('a',), ()),
+        )
+
+
+def test_main_lists_references_per_statement(tmp_path, capsys):
+    path = tmp_path / 'model.sql'
+    path.write_text('select a, trim(b) from db.s.t;')
+    main([str(path)])
+    assert capsys.readouterr().out == (
+        f'{path}:1\n'
+        '    table    db.s.t\n'
+        '    column   a\n'
+        '    column   b\n'
+        '    function TRIM\n'
+    )
@@ -0,0 +1,175 @@
+import pickle
+
+import pytest
+from pyparsing import ParseException
+
+from run import get_grammar, parse_ast, parse_sql
+from hooks import grammar_elements
+from nodes import (
+    NODE_ACTIONS,
+    Alias,
+    BinaryOp,
+    Case,
+    Cast,
+    Column,
+    FunctionCall,
+    Identifier,
+    InList,
+    Limit,
+    Literal,
+    OrderItem,
+    Select,
+    Star,
+    TableRef,
+    UnaryOp,
+)
+
+
+def parse_expression(text):
+    (select,) = parse_ast(f'select {text};')
+    (column,) = select.columns
+    return column.expression
+
+
+class TestNodes:
+    def test_nodes_have_no_instance_dict(self):
+        assert not hasattr(Identifier('a'), '__dict__')
+
+    def test_nodes_of_different_types_are_not_equal(self):
+        assert Identifier('a') != Alias('a')
+        assert Identifier('a') != ('a',)
+        assert Identifier('a') == Identifier('a')
+
+    def test_walk_visits_every_node_in_source_order(self):
+        node = BinaryOp('+', Identifier('a'), FunctionCall('ABS', (Identifier('b'),)))
+        assert [type(n).__name__ for n in node.walk()] == [
+            'BinaryOp',
+            'Identifier',
+            'FunctionCall',
+            'Identifier',
+        ]
+
+    def test_children_looks_inside_case_pairs(self):
+        case = Case(((Identifier('a'), Identifier('b')),), Literal('1', 'number'))
+        assert list(case.children()) == [
+            Identifier('a'),
+            Identifier('b'),
+            Literal('1', 'number'),
+        ]
+
+    def test_nodes_pickle(self):
+        node = Column(UnaryOp('not', Identifier('a')), Alias('b'))
+        assert pickle.loads(pickle.dumps(node)) == node
+
+
+class TestParseAst:
+    def test_it_builds_a_select(self):
+        assert parse_ast('select distinct a as b, 1 from d.s.t;') == (
+            Select(
+                'distinct',
+                (
+                    Column(Identifier('a'), Alias('b')),
+                    Column(Literal('1', 'number'), None),
+                ),
+                TableRef('d', 's', 't'),
+            ),
+        )
+
+    def test_it_builds_one_select_per_statement(self):
+        assert parse_ast('select *; select * from t;') == (
+            Select(None, (Star(),), None),
+            Select(None, (Star(),), TableRef(None, None, 't')),
+        )
+
+    def test_it_builds_the_clauses_of_a_select(self):
+        (select,) = parse_ast(
+            'select a from t where a > 1 group by a, b having b qualify a '
+            'order by a desc, b nulls first limit 10 offset 5;'
+        )
+        assert select.where == BinaryOp('>', Identifier('a'), Literal('1', 'number'))
+        assert select.group_by == (Identifier('a'), Identifier('b'))
+        assert (select.having, select.qualify) == (Identifier('b'), Identifier('a'))
+        assert select.order_by == (
+            OrderItem(Identifier('a'), 'desc', None),
+            OrderItem(Identifier('b'), None, 'first'),
+        )
+        assert select.limit == Limit('10', '5')
+
+    def test_fetch_builds_a_limit(self):
+        (select,) = parse_ast('select a from t offset 5 rows fetch first 10 rows;')
+        assert select.limit == Limit('10', '5')
+        (select,) = parse_ast('select a from t fetch 3;')
+        assert select.limit == Limit('3', None)
+
+    def test_left_associative_chains_fold_to_the_left(self):
+        assert parse_expression('a - b - c') == BinaryOp(
+            '-', BinaryOp('-', Identifier('a'), Identifier('b')), Identifier('c')
+        )
+
+    def test_it_respects_precedence_and_parentheses(self):
+        assert parse_expression('not a and (b or c = 1.5)') == BinaryOp(
+            'and',
+            UnaryOp('not', Identifier('a')),
+            BinaryOp(
+                'or',
+                Identifier('b'),
+                BinaryOp('=', Identifier('c'), Literal('1.5', 'number')),
+            ),
+        )
+
+    def test_postfix_operators_are_unary(self):
+        assert parse_expression('x is not null') == UnaryOp(
+            'is not null', Identifier('x')
+        )
+
+    def test_it_builds_casts(self):
+        assert parse_expression('-x::NUMBER(38,2)::varchar') == UnaryOp(
+            '-', Cast(Cast(Identifier('x'), 'number(38, 2)'), 'varchar')
+        )
+
+    def test_concatenation_is_a_binary_operator(self):
+        assert parse_expression("a || '_' || b") == BinaryOp(
+            '||',
+            BinaryOp('||', Identifier('a'), Literal('_', 'string')),
+            Identifier('b'),
+        )
+
+    def test_it_builds_in_lists(self):
+        assert parse_expression('not a not in (1, b)') == UnaryOp(
+            'not',
+            InList(Identifier('a'), True, (Literal('1', 'number'), Identifier('b'))),
+        )
+
+    def test_it_builds_function_calls(self):
+        assert parse_expression("regexp_count(a, 'x')") == FunctionCall(
+            'REGEXP_COUNT', (Identifier('a'), Literal('x', 'string'))
+        )
+        assert parse_expression('current_date') == FunctionCall('CURRENT_DATE', ())
+
+    def test_it_builds_case_expressions(self):
+        sql = 'case when a then b when true then 2 else c end'
+        assert parse_expression(sql) == Case(
+            (
+                (Identifier('a'), Identifier('b')),
+                (Literal(True, 'boolean'), Literal('2', 'number')),
+            ),
+            Identifier('c'),
+        )
+
+    def test_it_leaves_parse_sql_unchanged(self):
+        sql = 'select a + 1 as b from t;'
+        expected = parse_sql(sql).dump()
+        parse_ast(sql)
+        assert parse_sql(sql).dump() == expected
+
+    def test_it_leaves_the_grammar_unchanged_after_an_error(self):
+        with pytest.raises(ParseException):
+            parse_ast('select from;')
+        assert parse_sql('select a;').asList() == ['select', [['a']], ';']
+
+    def test_every_action_is_reachable_from_the_statements(self):
+        grammar = get_grammar()
+        grammar['STATEMENTS'].streamline()
+        reachable = {id(e) for e in grammar_elements(grammar['STATEMENTS'])}
+        for name in NODE_ACTIONS:
+            assert id(grammar[name]) in reachable, name
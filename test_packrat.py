@@ -0,0 +1,66 @@
+from pyparsing import ParserElement
+
+from run import parse_sql, STATEMENTS
+from hooks import grammar_elements
+from packrat import ParseCache, memoized
+
+# under the prefix '-', an operator after (x + 1) is tried twice in one place
+NESTED_SQL = 'select (-(x + 1) * y > 2) and (z < 3 or not w) as b from t;'
+
+
+class TestParseCache:
+    def test_it_counts_hits_and_misses(self):
+        cache = ParseCache()
+        assert cache.get('a') is None
+        cache.set('a', 1)
+        assert cache.get('a') == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_it_evicts_the_least_recently_used_entry(self):
+        cache = ParseCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.evictions == 1
+
+    def test_it_can_be_unbounded(self):
+        cache = ParseCache(max_size=None)
+        for key in range(10000):
+            cache.set(key, key)
+        assert len(cache) == 10000
+
+
+class TestMemoizedParsing:
+    def test_it_gives_the_same_results(self):
+        expected = parse_sql(NESTED_SQL)
+        assert parse_sql(NESTED_SQL, memoize=True).dump() == expected.dump()
+
+    def test_it_gives_the_same_results_with_a_tiny_cache(self):
+        expected = parse_sql(NESTED_SQL)
+        actual = parse_sql(NESTED_SQL, memoize=True, cache_size=8)
+        assert actual.dump() == expected.dump()
+
+    def test_it_reuses_results(self):
+        with memoized(STATEMENTS) as cache:
+            STATEMENTS.parseString(NESTED_SQL, parseAll=True)
+        assert cache.hits > 0
+        assert len(cache) <= cache.max_size
+
+    def test_results_are_kept_per_text(self):
+        with memoized(STATEMENTS):
+            first = STATEMENTS.parseString('select a from t;', parseAll=True)
+            second = STATEMENTS.parseString('select b from u;', parseAll=True)
+        assert first.asList() == ['select', [['a']], 'from', 't', ';']
+        assert second.asList() == ['select', [['b']], 'from', 'u', ';']
+
+    def test_it_restores_the_grammar_afterwards(self):
+        parse_sql(NESTED_SQL, memoize=True)
+        for element in grammar_elements(STATEMENTS):
+            assert '_parse' not in element.__dict__
+
+    def test_it_does_not_enable_pyparsing_packrat(self):
+        parse_sql(NESTED_SQL, memoize=True)
+        assert not ParserElement._packratEnabled
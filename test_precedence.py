@@ -0,0 +1,262 @@
+from pyparsing import (
+    CaselessKeyword,
+    Optional,
+    ParseException,
+    infixNotation,
+    opAssoc,
+    oneOf,
+    Word,
+    alphas,
+    nums,
+)
+import pytest
+
+from run import (
+    ARITHMETIC_EXPRESSION,
+    BOOLEAN_EXPRESSION,
+    FUNCTION_EXPRESSION,
+    IDENTIFIER,
+    NUMBER,
+    STATEMENTS,
+)
+from hooks import grammar_elements, overrides, wrap_parse
+from precedence import OperatorPrecedence
+
+OPERAND = Word(alphas) | Word(nums)
+EXPRESSION = OperatorPrecedence(
+    OPERAND,
+    [
+        (oneOf('- +'), 1, opAssoc.RIGHT),
+        ('^', 2, opAssoc.RIGHT),
+        (oneOf('* /'), 2, opAssoc.LEFT),
+        (oneOf('+ -'), 2, opAssoc.LEFT),
+        ('!', 1, opAssoc.LEFT),
+        ('=', 2, opAssoc.LEFT),
+    ],
+)
+
+
+def parse(text):
+    return EXPRESSION.parseString(text, parseAll=True).asList()
+
+
+## The expressions as they were written with infixNotation
+INFIX_ARITHMETIC_OPERATORS = [
+    (oneOf('- +'), 1, opAssoc.RIGHT),
+    (oneOf('* / %'), 2, opAssoc.LEFT),
+    (oneOf('+ -'), 2, opAssoc.LEFT),
+]
+INFIX_ARITHMETIC = infixNotation(
+    FUNCTION_EXPRESSION | NUMBER | IDENTIFIER, INFIX_ARITHMETIC_OPERATORS
+)
+INFIX_COMPARISON = (
+    INFIX_ARITHMETIC + CaselessKeyword('is') + Optional(CaselessKeyword('not'))
+    + CaselessKeyword('null')
+) | (INFIX_ARITHMETIC + oneOf('= != <> > < <= >=') + INFIX_ARITHMETIC)
+INFIX_BOOLEAN = infixNotation(
+    CaselessKeyword('true') | CaselessKeyword('false') | INFIX_COMPARISON | IDENTIFIER,
+    [
+        (CaselessKeyword('not'), 1, opAssoc.RIGHT),
+        (CaselessKeyword('and'), 2, opAssoc.LEFT),
+        (CaselessKeyword('or'), 2, opAssoc.LEFT),
+    ],
+)
+
+
+def count_parse_attempts(sql_text):
+    attempts = [0]
+
+    def counting(element, parse):
+        def counted_parse(*args, **kwargs):
+            attempts[0] += 1
+            return parse(*args, **kwargs)
+
+        return counted_parse
+
+    with wrap_parse(STATEMENTS, counting):
+        STATEMENTS.parseString(sql_text, parseAll=True)
+    return attempts[0]
+
+
+def nested_condition(depth):
+    text = 'x > 1'
+    for level in range(depth):
+        text = f'(({text} and (y + {level}) * z < w) or not v is null)'
+    return text
+
+
+def nested_predicate(depth):
+    return f'select {nested_condition(depth)} as b from t;'
+
+
+def nested_case(depth):
+    return f'select case when {nested_condition(depth)} then a end from t;'
+
+
+class TestOperatorPrecedence:
+    def test_a_single_operand_is_not_grouped(self):
+        assert parse('x') == ['x']
+
+    def test_a_left_associative_chain_is_one_flat_group(self):
+        assert parse('a + b - c') == [['a', '+', 'b', '-', 'c']]
+
+    def test_tighter_operators_are_grouped_first(self):
+        assert parse('a + b * c') == [['a', '+', ['b', '*', 'c']]]
+        assert parse('a * b + c') == [[['a', '*', 'b'], '+', 'c']]
+
+    def test_right_associative_operators_nest_to_the_right(self):
+        assert parse('a ^ b ^ c') == [['a', '^', ['b', '^', 'c']]]
+
+    def test_prefix_operators(self):
+        assert parse('-a * b') == [[['-', 'a'], '*', 'b']]
+        assert parse('- - a') == [['-', ['-', 'a']]]
+
+    def test_postfix_operators(self):
+        assert parse('a + b !') == [[['a', '+', 'b'], '!']]
+        assert parse('a ! = b') == [[['a', '!'], '=', 'b']]
+
+    def test_parentheses_are_suppressed(self):
+        assert parse('(a + b) * c') == [[['a', '+', 'b'], '*', 'c']]
+        assert parse('((a))') == ['a']
+
+    def test_it_stops_before_a_dangling_operator(self):
+        loc, tokens = EXPRESSION._parse('a + b *', 0)
+        assert tokens.asList() == [['a', '+', 'b']]
+        assert loc == len('a + b')
+
+    def test_it_requires_balanced_parentheses(self):
+        with pytest.raises(ParseException):
+            parse('(a + b')
+
+    def test_an_operand_of_several_tokens_is_grouped(self):
+        operand = Word(alphas) + '.' + Word(alphas)
+        expression = OperatorPrecedence(operand, [('+', 2, opAssoc.LEFT)])
+        assert expression.parseString('a.b').asList() == [['a', '.', 'b']]
+        assert expression.parseString('a.b + c.d').asList() == [
+            [['a', '.', 'b'], '+', ['c', '.', 'd']]
+        ]
+
+    def test_a_non_associative_operator_does_not_chain(self):
+        expression = OperatorPrecedence(
+            OPERAND, [('+', 2, opAssoc.LEFT), ('<', 2, None), ('&', 2, opAssoc.LEFT)]
+        )
+        assert expression.parseString('a + b < c').asList() == [
+            [['a', '+', 'b'], '<', 'c']
+        ]
+        assert expression.parseString('a < b & c < d').asList() == [
+            [['a', '<', 'b'], '&', ['c', '<', 'd']]
+        ]
+        with pytest.raises(ParseException):
+            expression.parseString('a < b < c', parseAll=True)
+
+    def test_a_required_operator_must_be_applied(self):
+        expression = OperatorPrecedence(
+            OPERAND, [('+', 2, opAssoc.LEFT), ('<', 2, None)], required=1
+        )
+        assert expression.parseString('(a) < b + c').asList() == [
+            ['a', '<', ['b', '+', 'c']]
+        ]
+        assert expression.parseString('((a < b))').asList() == [['a', '<', 'b']]
+        for text in ['a', 'a + b', '(a + b)']:
+            with pytest.raises(ParseException):
+                expression.parseString(text, parseAll=True)
+
+    def test_logical_operators_take_conditions(self):
+        expression = OperatorPrecedence(
+            OPERAND,
+            [('+', 2, opAssoc.LEFT), ('<', 2, None), ('&', 2, opAssoc.LEFT)],
+            required=1,
+            logical=2,
+            atom=Word(alphas),
+        )
+        assert expression.parseString('a & (b < 1 + c)').asList() == [
+            ['a', '&', ['b', '<', ['1', '+', 'c']]]
+        ]
+        for text in ['1', 'a & 1', '1 & a', 'a & b + c', '(a + b) & c']:
+            with pytest.raises(ParseException):
+                expression.parseString(text, parseAll=True)
+
+
+class TestInfixNotationShape:
+    @pytest.mark.parametrize(
+        'text',
+        [
+            '1.5',
+            '1.5 + 1',
+            '-1.5 * x',
+            '(1.5 + x) * 2.25',
+            'sqrt(x) + 1',
+            '1 - round(x, 2) * sign(y)',
+            '-sqrt(x)',
+        ],
+    )
+    def test_arithmetic_is_shaped_as_by_infix_notation(self, text):
+        expected = INFIX_ARITHMETIC.parseString(text, parseAll=True).asList()
+        result = ARITHMETIC_EXPRESSION.parseString(text, parseAll=True)
+        assert result.asList() == expected
+
+    @pytest.mark.parametrize(
+        'text',
+        [
+            'x',
+            '1 < 2',
+            '1.5 + 1 > x',
+            'sqrt(x) >= 1.5',
+            'x is not null and y',
+            'not x + 1 is null or 1.5 = y',
+            '(x = y) and false',
+        ],
+    )
+    def test_booleans_are_shaped_as_by_infix_notation(self, text):
+        expected = INFIX_BOOLEAN.parseString(text, parseAll=True).asList()
+        assert BOOLEAN_EXPRESSION.parseString(text, parseAll=True).asList() == expected
+
+    @pytest.mark.parametrize(
+        'text',
+        [
+            '1.5',
+            '1 + 1',
+            '1.5 + 1',
+            '-1.5 * x',
+            '(1.5 + x) * 2.25',
+            '1 - 2.5 * 3',
+        ],
+    )
+    def test_results_names_are_kept_as_by_infix_notation(self, text):
+        expected = INFIX_ARITHMETIC.parseString(text, parseAll=True)
+        result = ARITHMETIC_EXPRESSION.parseString(text, parseAll=True)
+        assert result.asDict() == expected.asDict()
+        assert result.dump() == expected.dump()
+
+    @pytest.mark.parametrize('text', ['x > 1 and y', '1.5 = x or not 2 < y'])
+    def test_boolean_results_names_are_kept_as_by_infix_notation(self, text):
+        expected = INFIX_BOOLEAN.parseString(text, parseAll=True)
+        result = BOOLEAN_EXPRESSION.parseString(text, parseAll=True)
+        assert result.asDict() == expected.asDict()
+        assert result.dump() == expected.dump()
+
+
+class TestNestingDepth:
+    def test_parse_attempts_grow_linearly_with_nesting_depth(self):
+        shallow = count_parse_attempts(nested_predicate(10))
+        deep = count_parse_attempts(nested_predicate(20))
+        assert deep < 2.2 * shallow
+
+    def test_case_conditions_grow_linearly_with_nesting_depth(self):
+        shallow = count_parse_attempts(nested_case(10))
+        deep = count_parse_attempts(nested_case(20))
+        assert deep < 2.2 * shallow
+
+    def test_no_operator_is_tried_after_a_plain_column(self):
+        no_stop = [
+            (element, 'stop', None)
+            for element in grammar_elements(STATEMENTS)
+            if isinstance(element, OperatorPrecedence)
+        ]
+        sql = 'select ' + ', '.join(f'c{number}' for number in range(100)) + ';'
+        with overrides(no_stop):
+            before = count_parse_attempts(sql)
+        assert count_parse_attempts(sql) < 0.8 * before
+
+    def test_deep_nesting_parses(self):
+        assert STATEMENTS.parseString(nested_predicate(40), parseAll=True)
@@ -0,0 +1,72 @@
+import pytest
+from pyparsing import ParseException
+
+from run import parse_sql
+from prescan import Problem, check, find_problems, line_and_column, main
+
+
+class TestFindProblems:
+    def test_a_well_formed_script_has_none(self):
+        sql = "select (a + (b)), 'x;)(' from t;\n SELECT 1;\n"
+        assert find_problems(sql) == []
+
+    def test_it_finds_an_unmatched_close_paren(self):
+        assert find_problems('select a) from t;') == [Problem(8, "Unmatched ')'")]
+
+    def test_it_finds_unclosed_parens_at_the_end_of_the_statement(self):
+        assert find_problems('select ((a from t; select 1;') == [
+            Problem(7, "Unclosed '('"),
+            Problem(8, "Unclosed '('"),
+        ]
+
+    def test_it_finds_an_unterminated_string(self):
+        assert find_problems("select 'abc; select 1;") == [
+            Problem(7, 'Unterminated string')
+        ]
+
+    def test_it_finds_a_missing_final_semicolon(self):
+        assert find_problems('select 1; select 2  ') == [
+            Problem(20, "Expected ';' at end of statement")
+        ]
+
+    def test_trailing_whitespace_needs_no_semicolon(self):
+        assert find_problems('select 1;\n\n') == []
+
+    def test_statements_must_start_with_select(self):
+        assert find_problems('select 1;\n  selec 2;') == [
+            Problem(12, "Expected statement to start with 'select'")
+        ]
+        assert find_problems('selected;') == [
+            Problem(0, "Expected statement to start with 'select'")
+        ]
+
+    def test_an_empty_script_is_a_problem(self):
+        assert find_problems('  ') == [Problem(2, 'Expected a statement')]
+
+
+class TestCheck:
+    def test_it_raises_at_the_first_problem(self):
+        with pytest.raises(ParseException) as error:
+            check('select (a;\nselect b)')
+        assert error.value.loc == 7
+
+    def test_parse_sql_can_prescan(self):
+        with pytest.raises(ParseException) as error:
+            parse_sql("select 'a from t;", prescan=True)
+        assert error.value.msg == 'Unterminated string'
+        assert parse_sql('select a;', prescan=True).asList() == [
+            'select',
+            [['a']],
+            ';',
+        ]
+
+
+class TestMain:
+    def test_it_prints_lines_and_columns(self, tmp_path, capsys):
+        path = tmp_path / 'broken.sql'
+        path.write_text('select 1;\nselect (2;\n')
+        assert main([str(path)]) == 1
+        assert capsys.readouterr().out == f"{path}:2:8: Unclosed '('\n"
+
+    def test_line_and_column_are_one_based(self):
+        assert line_and_column('ab\ncd', 4) == (2, 2)
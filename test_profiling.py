@@ -0,0 +1,62 @@
+import io
+import json
+
+import pytest
+from pyparsing import ParseException
+
+from run import get_grammar, parse_sql
+from hooks import grammar_elements
+from profiling import profiled
+
+SQL = (
+    "select regexp_count(a, 'x'), upper(b) as c, "
+    "case when d > 1 then e else 0 end from t;"
+)
+
+
+class TestProfiled:
+    def test_it_counts_attempts_matches_and_failures(self):
+        with profiled() as profile:
+            parse_sql(SQL)
+        stats = profile.stats['FUNCTION_EXPRESSION']
+        assert stats.successes == 2
+        assert stats.attempts == stats.successes + stats.failures
+        assert profile.stats['STATEMENT_DEF'].successes == 1
+        assert profile.stats['CASE_EXPRESSION'].successes == 1
+
+    def test_function_argument_lists_are_named_after_their_name_list(self):
+        with profiled() as profile:
+            parse_sql(SQL)
+        assert profile.stats['UNARY_FUNCTION_NAMES arguments'].successes == 1
+        family = 'BINARY_TWO_OPTIONAL_FUNCTION_NAMES arguments'
+        assert profile.stats[family].attempts == 1
+
+    def test_self_time_is_within_total_time(self):
+        with profiled() as profile:
+            parse_sql(SQL)
+        for stats in profile.stats.values():
+            assert 0 <= stats.self_seconds <= stats.seconds + 1e-9
+
+    def test_it_counts_failed_parses(self):
+        with profiled() as profile:
+            with pytest.raises(ParseException):
+                parse_sql('select from t;')
+        assert profile.stats['STATEMENT_DEF'].failures == 1
+
+    def test_it_removes_its_instrumentation(self):
+        with profiled():
+            parse_sql(SQL)
+        statements = get_grammar()['STATEMENTS']
+        assert all('_parse' not in vars(e) for e in grammar_elements(statements))
+
+    def test_it_reports_and_dumps_json(self, tmp_path):
+        with profiled() as profile:
+            parse_sql(SQL)
+        output = io.StringIO()
+        profile.report(file=output)
+        assert 'FUNCTION_EXPRESSION' in output.getvalue()
+        path = tmp_path / 'profile.json'
+        profile.dump(path, key='attempts')
+        counts = json.loads(path.read_text())
+        attempts = [stats['attempts'] for stats in counts.values()]
+        assert attempts == sorted(attempts, reverse=True)
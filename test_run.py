@@ -1,6 +1,11 @@
+import os
+import subprocess
+import sys
+
 import pytest
 from pyparsing import ParseException
 
+import run
 from run import (
     parse_sql,
     IDENTIFIER,
@@ -132,6 +137,33 @@ class TestArithmeticExpression:
         assert_raises_parse_exception(ARITHMETIC_EXPRESSION, '(1 + 1')
         assert_raises_parse_exception(ARITHMETIC_EXPRESSION, '1 + 1)')
 
+    def test_it_parses_casts(self):
+        assert_parses(ARITHMETIC_EXPRESSION, 'x::varchar')
+        assert_parses(ARITHMETIC_EXPRESSION, "'2020-01-01'::date")
+        assert_parses(ARITHMETIC_EXPRESSION, '-x::number(38, 2)::varchar(10)')
+
+    def test_a_cast_binds_tighter_than_unary_minus(self):
+        assert ARITHMETIC_EXPRESSION.parseString('-x::int').asList() == [
+            ['-', ['x', '::', 'int']]
+        ]
+
+    def test_it_parses_concatenation(self):
+        assert_parses(ARITHMETIC_EXPRESSION, "x::varchar || '_' || id")
+
+    def test_concatenation_binds_looser_than_addition(self):
+        assert ARITHMETIC_EXPRESSION.parseString('a || b + 1 || c').asList() == [
+            ['a', '||', ['b', '+', '1'], '||', 'c']
+        ]
+
+    def test_a_long_concatenation_parses(self):
+        text = ' || '.join(f'x{number}' for number in range(2000))
+        assert_parses(ARITHMETIC_EXPRESSION, text)
+
+    def test_a_cast_requires_a_type_and_concatenation_two_operands(self):
+        assert_raises_parse_exception(ARITHMETIC_EXPRESSION, 'x::')
+        assert_raises_parse_exception(ARITHMETIC_EXPRESSION, 'x::1')
+        assert_raises_parse_exception(ARITHMETIC_EXPRESSION, 'x ||')
+
 
 class TestComparisonExpression:
     def test_it_parses_operands_that_are_numeric(self):
@@ -153,10 +185,37 @@ class TestComparisonExpression:
         assert_parses(COMPARISON_EXPRESSION, 'x is null')
         assert_parses(COMPARISON_EXPRESSION, 'x is not null')
 
+    def test_it_parses_in_lists(self):
+        assert_parses(COMPARISON_EXPRESSION, "x in (1, 'a', y + 1)")
+        assert_parses(COMPARISON_EXPRESSION, 'x not in (1)')
+        assert_parses(COMPARISON_EXPRESSION, 'x + 1 in (2) is null')
+
+    def test_an_in_list_is_grouped(self):
+        assert COMPARISON_EXPRESSION.parseString('x not in (1, y)').asList() == [
+            ['x', 'not', 'in', ['1', 'y']]
+        ]
+
+    def test_a_long_in_list_parses(self):
+        items = ', '.join(str(number) for number in range(5000))
+        assert_parses(COMPARISON_EXPRESSION, f'x in ({items})')
+
+    def test_an_in_list_cannot_be_empty(self):
+        assert_raises_parse_exception(COMPARISON_EXPRESSION, 'x in ()')
+        assert_raises_parse_exception(COMPARISON_EXPRESSION, 'x in (1,)')
+
     def test_a_comparison_requires_two_operands(self):
         assert_raises_parse_exception(COMPARISON_EXPRESSION, '1 >=')
         assert_raises_parse_exception(COMPARISON_EXPRESSION, '1=')
 
+    def test_it_requires_a_comparison(self):
+        assert_raises_parse_exception(COMPARISON_EXPRESSION, 'x')
+        assert_raises_parse_exception(COMPARISON_EXPRESSION, "'a'")
+        assert_raises_parse_exception(COMPARISON_EXPRESSION, '1 + 1')
+
+    def test_comparisons_do_not_chain(self):
+        assert_raises_parse_exception(COMPARISON_EXPRESSION, '1 < 2 < 3')
+        assert_raises_parse_exception(COMPARISON_EXPRESSION, 'x = y = z')
+
 
 class TestBooleanExpression:
     def test_it_parses_boolean_keywords(self):
@@ -184,6 +243,12 @@ class TestBooleanExpression:
         assert_parses(BOOLEAN_EXPRESSION, 'not true')
         assert_parses(BOOLEAN_EXPRESSION, 'not (false and true)')
 
+    def test_its_operands_are_boolean(self):
+        assert_raises_parse_exception(BOOLEAN_EXPRESSION, '1')
+        assert_raises_parse_exception(BOOLEAN_EXPRESSION, "'a'")
+        assert_raises_parse_exception(BOOLEAN_EXPRESSION, '1 + 1')
+        assert_raises_parse_exception(BOOLEAN_EXPRESSION, 'x and 1')
+
 
 class TestCaseExpression:
     def test_it_parses_boolean_expressions_and_evaluates_to_identifiers(self):
@@ -279,6 +344,12 @@ class TestParseSqlSelect:
     def test_it_parses_boolean_expressions_as_columns(self):
         assert parse_sql('select 1 > 2 AND not x as boop,that from hornswoggler;')
 
+    def test_it_parses_operator_expressions_starting_with_an_identifier(self):
+        assert parse_sql('select x + 1 as y, a and b, c is null from hornswoggler;')
+
+    def test_it_parses_function_calls_inside_operator_expressions(self):
+        assert parse_sql('select 1 + BITNOT(x) * 2 as y from hornswoggler;')
+
     def test_it_parses_case_expressions_as_columns(self):
         assert parse_sql(
             'select case when x then y end as boop,that from hornswoggler;'
@@ -297,14 +368,183 @@ class TestParseSqlSelect:
     def test_it_parses_binary_function_expressions_as_columns(self):
         assert parse_sql('select BITAND(x, y) as x,that from hornswoggler;')
 
+    def test_it_parses_a_wide_column_list(self):
+        columns = ', '.join(f'c{number}' for number in range(5000))
+        result = parse_sql(f'select {columns}, 1, c + 1 as d from t;')
+        assert len(result['column_list']) == 5002
+
+    def test_a_column_ending_at_a_keyword_gets_its_alias(self):
+        assert parse_sql('select a as b, c d, e from t;').asList() == [
+            'select',
+            [['a', 'as', 'b'], ['c', 'd'], ['e']],
+            'from',
+            't',
+            ';',
+        ]
+
     def test_it_parses_unary_function_expressions_with_optional_second_arg(self):
         assert parse_sql('select CEIL(x) as x,that from hornswoggler;')
         assert parse_sql('select CEIL(x, y) as x,that from hornswoggler;')
 
 
+class TestParseSqlClauses:
+    def test_it_parses_every_clause(self):
+        assert parse_sql(
+            'select a, b from t where a > 1 group by a, b having b in (1, 2) '
+            'qualify a = 1 order by a desc nulls last, b limit 10 offset 5;'
+        )
+
+    def test_each_clause_is_optional(self):
+        assert parse_sql('select a from t where a;')
+        assert parse_sql('select a from t group by a order by a;')
+        assert parse_sql('select a from t qualify a limit 1;')
+        assert parse_sql('select a limit 1;')
+
+    def test_it_parses_offset_and_fetch(self):
+        assert parse_sql('select a from t fetch 10;')
+        assert parse_sql('select a from t order by a fetch first 10 rows only;')
+        assert parse_sql('select a from t offset 5 rows fetch next 1 row;')
+
+    def test_order_by_items_are_grouped(self):
+        assert parse_sql('select a from t order by a + 1 asc, b;').asList()[-2] == [
+            [['a', '+', '1'], 'asc'],
+            ['b'],
+        ]
+
+    def test_clauses_must_be_in_order(self):
+        with pytest.raises(ParseException):
+            parse_sql('select a from t order by a where a;')
+        with pytest.raises(ParseException):
+            parse_sql('select a from t limit 1 fetch 1;')
+
+    def test_a_clause_cannot_be_repeated(self):
+        with pytest.raises(ParseException):
+            parse_sql('select a from t where a where b;')
+
+    def test_a_clause_needs_its_contents(self):
+        with pytest.raises(ParseException):
+            parse_sql('select a from t where;')
+        with pytest.raises(ParseException):
+            parse_sql('select a from t group a;')
+        with pytest.raises(ParseException):
+            parse_sql('select a from t limit a;')
+
+    def test_clause_keywords_are_not_aliases(self):
+        assert parse_sql('select a order by a;').asList()[1] == [['a']]
+
+
 class TestParseSqlColumnAliases:
     def test_select_column_names_with_as_alias_parses(self):
         assert parse_sql('select quogwinkle as x from bip.boop.hornswoggler;')
 
     def test_select_column_names_with_non_as_alias_parses(self):
         assert parse_sql('select quogwinkle x from hornswoggler;')
+
+
+class TestGrammarLoading:
+    def test_importing_run_does_not_build_the_grammar(self):
+        code = 'import run, sys; assert "pyparsing" not in sys.modules'
+        here = os.path.dirname(os.path.abspath(__file__))
+        subprocess.run([sys.executable, '-c', code], cwd=here, check=True)
+
+    def test_grammar_elements_are_module_attributes(self):
+        assert run.IDENTIFIER is run.get_grammar()['IDENTIFIER']
+
+    def test_unknown_attributes_raise_attribute_error(self):
+        with pytest.raises(AttributeError):
+            run.NOT_A_GRAMMAR_ELEMENT
+
+    def test_a_saved_grammar_parses_the_same(self, tmp_path, monkeypatch):
+        sql = 'select distinct 1 as x, current_date, trunc(y) from a.b;'
+        expected = parse_sql(sql).dump()
+        path = str(tmp_path / 'grammar.pickle')
+        run.save_grammar(path)
+        monkeypatch.setattr(run, '_grammar', None)
+        run.load_grammar(path)
+        assert run.get_grammar()['IDENTIFIER'] is not IDENTIFIER
+        assert parse_sql(sql).dump() == expected
+
+    def test_a_failed_save_leaves_the_saved_grammar(self, tmp_path, monkeypatch):
+        path = tmp_path / 'grammar.pickle'
+        run.save_grammar(str(path))
+        saved = path.read_bytes()
+        monkeypatch.setattr(run, 'get_grammar', lambda: lambda: None)
+        with pytest.raises(Exception):
+            run.save_grammar(str(path))
+        assert path.read_bytes() == saved
+        assert os.listdir(tmp_path) == ['grammar.pickle']
+
+    def test_loading_a_missing_grammar_saves_one(self, tmp_path):
+        path = str(tmp_path / 'grammar.pickle')
+        assert run.load_grammar(path) is run.get_grammar()
+        assert os.path.exists(path)
+
+    def test_a_stale_grammar_is_rebuilt(self, tmp_path, monkeypatch):
+        path = str(tmp_path / 'grammar.pickle')
+        run.save_grammar(path)
+        monkeypatch.setattr(run, 'grammar_fingerprint', lambda: 'changed')
+        monkeypatch.setattr(run, '_grammar', None)
+        grammar = run.load_grammar(path)
+        assert grammar['IDENTIFIER'] is IDENTIFIER
+
+
+class TestIterStatements:
+    def test_it_parses_each_statement(self):
+        statements = list(run.iter_statements('select 1; select x from y;'))
+        assert [s.offset for s in statements] == [0, 9]
+        assert all(s.error is None for s in statements)
+        assert statements[1].result['table'].asList() == ['y']
+
+    def test_a_bad_statement_does_not_stop_the_rest(self):
+        statements = list(run.iter_statements('select 1; select from y; select 3;'))
+        assert [s.error is None for s in statements] == [True, False, True]
+        assert isinstance(statements[1].error, ParseException)
+
+    def test_a_too_deep_statement_does_not_stop_the_rest(self):
+        deep = 'select ' + '(' * 400 + 'x' + ')' * 400 + ';'
+        statements = list(run.iter_statements('select 1; ' + deep + ' select 3;'))
+        assert [s.error is None for s in statements] == [True, False, True]
+        assert isinstance(statements[1].error, RecursionError)
+
+    def test_a_missing_final_semicolon_is_an_error(self):
+        *_, last = run.iter_statements('select 1; select 2')
+        assert last.text == ' select 2'
+        assert last.error is not None
+
+    def test_it_reads_files(self, tmp_path):
+        path = tmp_path / 'script.sql'
+        path.write_text("select 'a;b'; select 2;")
+        with open(path) as script:
+            statements = list(run.iter_statements(script))
+        assert [s.text for s in statements] == ["select 'a;b';", ' select 2;']
+
+
+class TestParseFile:
+    def test_it_matches_iter_statements(self, tmp_path):
+        text = "select a from t;\nselect 'é;x' as b;\nselect (c from s;\nselect d"
+        path = tmp_path / 'script.sql'
+        path.write_text(text, encoding='utf-8')
+
+        def summary(statements):
+            return [(s.offset, s.text, s.error is None) for s in statements]
+
+        assert summary(run.parse_file(path)) == summary(run.iter_statements(text))
+
+    def test_offsets_count_characters_not_bytes(self, tmp_path):
+        path = tmp_path / 'script.sql'
+        path.write_text("select 'ééé'; select 2;", encoding='utf-8')
+        statements = list(run.parse_file(path))
+        assert statements[1].offset == 13
+        assert statements[1].text == ' select 2;'
+
+    def test_a_too_deep_statement_does_not_stop_the_rest(self, tmp_path):
+        path = tmp_path / 'script.sql'
+        path.write_text('select ' + '(' * 400 + 'x' + ')' * 400 + '; select 2;')
+        statements = list(run.parse_file(path))
+        assert isinstance(statements[0].error, RecursionError)
+        assert statements[1].error is None
+
+    def test_an_empty_file_has_no_statements(self, tmp_path):
+        path = tmp_path / 'empty.sql'
+        path.write_text('')
+        assert list(run.parse_file(path)) == []
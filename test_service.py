@@ -0,0 +1,130 @@
+import asyncio
+import time
+
+from service import Metrics, ParseService, http_request, percentile, start_server
+
+
+def sleep_for(text):
+    time.sleep(float(text))
+    return 200, {'result': text}
+
+
+def run_service(test, **options):
+    async def run():
+        service = ParseService(workers=1, **options)
+        await service.start()
+        try:
+            return await test(service)
+        finally:
+            await service.close()
+
+    return asyncio.run(run())
+
+
+class TestParseService:
+    def test_it_parses_in_a_worker(self):
+        async def test(service):
+            return await service.parse('select a from t;')
+
+        status, response = run_service(test)
+        assert status == 200
+        assert response['result'] == ['select', [['a']], 'from', 't', ';']
+
+    def test_parse_errors_say_where(self):
+        async def test(service):
+            return await service.parse('select round(a, 1, 2) from t;')
+
+        status, response = run_service(test)
+        assert status == 422
+        assert response['error'] == {
+            'message': 'ROUND takes 1 to 2 arguments, got 3',
+            'loc': 19,
+            'line': 1,
+            'column': 20,
+        }
+
+    def test_too_deep_sql_is_an_error_not_a_crash(self):
+        async def test(service):
+            deep = 'select ' + '(' * 400 + 'x' + ')' * 400 + ';'
+            return await service.parse(deep), await service.parse('select 1;')
+
+        deep, after = run_service(test)
+        assert deep == (
+            422, {'error': {'message': 'The SQL is nested too deeply to parse'}}
+        )
+        assert after[0] == 200
+
+    def test_it_rejects_requests_when_the_queue_is_full(self):
+        async def test(service):
+            first = asyncio.create_task(service.parse('0.2'))
+            await asyncio.sleep(0.05)
+            requests = [first] + [service.parse('0.2') for _ in range(3)]
+            return [status for status, _ in await asyncio.gather(*requests)]
+
+        # one request with the worker, one queued, the rest turned away
+        statuses = run_service(test, queue_size=1, handler=sleep_for)
+        assert sorted(statuses) == [200, 200, 503, 503]
+
+    def test_a_slow_parse_times_out_and_its_worker_is_replaced(self):
+        async def test(service):
+            slow = await service.parse('10')
+            quick = await service.parse('0')
+            return slow, quick
+
+        slow, quick = run_service(test, timeout=0.5, handler=sleep_for)
+        assert slow[0] == 504
+        assert quick == (200, {'result': '0'})
+
+    def test_it_counts_outcomes(self):
+        async def test(service):
+            await service.parse('select 1;')
+            await service.parse('select from t;')
+            return service.snapshot()
+
+        metrics = run_service(test)
+        assert metrics['requests'] == {'parsed': 1, 'failed': 1}
+        assert metrics['latency_ms']['max'] > 0
+        assert metrics['queued'] == 0
+
+
+class TestServer:
+    def test_it_serves_http_on_a_unix_socket(self, tmp_path):
+        path = str(tmp_path / 'service.sock')
+
+        async def test(service):
+            server = await start_server(service, path=path)
+            reader, writer = await asyncio.open_unix_connection(path)
+            try:
+                parsed = await http_request(
+                    reader, writer, 'POST', '/parse', b'select 1;'
+                )
+                metrics = await http_request(reader, writer, 'GET', '/metrics')
+                missing = await http_request(reader, writer, 'GET', '/missing')
+                wrong_method = await http_request(reader, writer, 'GET', '/parse')
+            finally:
+                writer.close()
+                server.close()
+            return parsed, metrics, missing, wrong_method
+
+        parsed, metrics, missing, wrong_method = run_service(test)
+        assert parsed == (200, {'result': ['select', [['1']], ';']})
+        assert metrics[1]['requests'] == {'parsed': 1}
+        assert missing[0] == 404
+        assert wrong_method[0] == 405
+
+
+class TestMetrics:
+    def test_percentiles_are_nearest_rank(self):
+        values = list(range(1, 101))
+        assert percentile(values, 0.5) == 50
+        assert percentile(values, 0.99) == 99
+        assert percentile(values, 1) == 100
+        assert percentile([], 0.5) is None
+
+    def test_it_keeps_a_window_of_latencies(self):
+        metrics = Metrics(window=2)
+        for seconds in (5.0, 0.001, 0.002):
+            metrics.record('parsed', seconds)
+        snapshot = metrics.snapshot()
+        assert snapshot['requests'] == {'parsed': 3}
+        assert snapshot['latency_ms']['max'] == 2.0
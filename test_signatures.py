@@ -0,0 +1,80 @@
+import subprocess
+import sys
+
+from run import parse_sql
+from signatures import (
+    SIGNATURES,
+    TABLE_PATH,
+    Signature,
+    arity_error,
+    complete,
+    generate_table,
+    lookup,
+)
+
+
+class TestSignatureTable:
+    def test_it_is_up_to_date_with_functions(self):
+        with open(TABLE_PATH) as table:
+            assert table.read() == generate_table()
+
+    def test_it_loads_without_pyparsing(self):
+        code = (
+            'import sys, signatures; '
+            "assert 'pyparsing' not in sys.modules; "
+            "assert 'functions' not in sys.modules"
+        )
+        subprocess.run([sys.executable, '-c', code], check=True)
+
+    def test_a_name_in_two_lists_takes_either_arity(self):
+        signature = lookup('trunc')
+        assert (signature.min_args, signature.max_args) == (1, 2)
+        assert signature.families == (
+            'UNARY_ONE_OPTIONAL_FUNCTION_NAMES',
+            'BINARY_FUNCTION_NAMES',
+        )
+        parse_sql('select trunc(x), trunc(x, 2) from t;')
+
+    def test_it_drives_the_grammar(self):
+        families = ('NULLARY_ONE_OPTIONAL_FUNCTION_NAMES',)
+        assert lookup('RANDOM') == Signature('RANDOM', 0, 1, False, families)
+        parse_sql('select random(), random(1), current_date, pi() from t;')
+
+
+class TestLookup:
+    def test_it_is_case_insensitive(self):
+        assert lookup('Regexp_Instr') is SIGNATURES['REGEXP_INSTR']
+        assert lookup('regexp_instr').max_args == 6
+
+    def test_unknown_functions_have_no_signature(self):
+        assert lookup('no_such_function') is None
+
+
+class TestComplete:
+    def test_it_finds_names_by_prefix_in_order(self):
+        names = [signature.name for signature in complete('regexp_')]
+        assert names == sorted(names)
+        assert 'REGEXP_COUNT' in names and 'REGEXP_INSTR' in names
+        assert all(name.startswith('REGEXP_') for name in names)
+
+    def test_it_finds_nothing_for_an_unknown_prefix(self):
+        assert complete('zzz') == []
+
+    def test_an_empty_prefix_finds_everything(self):
+        assert len(complete('')) == len(SIGNATURES)
+
+
+class TestArityError:
+    def test_it_accepts_counts_in_range(self):
+        assert arity_error(lookup('round'), 1) is None
+        assert arity_error(lookup('round'), 2) is None
+
+    def test_it_says_what_the_function_takes(self):
+        assert arity_error(lookup('pi'), 1) == 'PI takes no arguments, got 1'
+        assert arity_error(lookup('bitnot'), 0) == 'BITNOT takes 1 argument, got 0'
+        assert arity_error(lookup('haversine'), 3) == (
+            'HAVERSINE takes 4 arguments, got 3'
+        )
+        assert arity_error(lookup('round'), 3) == (
+            'ROUND takes 1 to 2 arguments, got 3'
+        )
@@ -0,0 +1,79 @@
+import io
+
+from statements import (
+    chunk_ends,
+    statement_end,
+    statement_spans,
+    split_statements,
+    split_text,
+)
+
+
+class TestStatementEnd:
+    def test_it_ends_after_the_semicolon(self):
+        assert statement_end('select 1; select 2;', 0) == len('select 1;')
+
+    def test_it_ignores_semicolons_in_strings(self):
+        text = "select 'a;b', 'c'; select 2;"
+        assert statement_end(text, 0) == len("select 'a;b', 'c';")
+
+    def test_it_handles_escaped_quotes(self):
+        text = "select 'it''s; fine'; select 2;"
+        assert statement_end(text, 0) == len("select 'it''s; fine';")
+
+    def test_it_needs_a_semicolon(self):
+        assert statement_end('select 1', 0) == -1
+
+    def test_it_needs_strings_to_be_terminated(self):
+        assert statement_end("select 'a;", 0) == -1
+
+    def test_it_works_on_bytes(self):
+        assert statement_end(b"select ';'; x", 0, b';', b"'") == len(b"select ';';")
+
+
+class TestSplitStatements:
+    TEXT = "select 1; select 'x;y' ;\n select 3"
+
+    def test_it_yields_each_statement_with_its_offset(self):
+        assert list(split_text(self.TEXT)) == [
+            (0, 'select 1;'),
+            (9, " select 'x;y' ;"),
+            (24, '\n select 3'),
+        ]
+
+    def test_it_skips_trailing_whitespace(self):
+        assert list(split_text('select 1;  \n')) == [(0, 'select 1;')]
+
+    def test_files_split_the_same_as_text_whatever_the_chunk_size(self):
+        for chunk_size in (1, 2, 5, 100):
+            statements = split_statements(io.StringIO(self.TEXT), chunk_size)
+            assert list(statements) == list(split_text(self.TEXT))
+
+
+    def test_strings_and_escaped_quotes_can_span_chunks(self):
+        text = "select 'it''s;\n fine' ; select ';';select 'a;"
+        for chunk_size in (1, 2, 3, 7):
+            statements = split_statements(io.StringIO(text), chunk_size)
+            assert list(statements) == list(split_text(text))
+
+
+class TestChunkEnds:
+    def test_it_finds_each_statement_end(self):
+        assert chunk_ends('a; b; c', False) == ([2, 5], False)
+
+    def test_it_skips_semicolons_in_strings(self):
+        assert chunk_ends("a ';'; b", False) == ([6], False)
+
+    def test_it_carries_a_string_over_chunks(self):
+        assert chunk_ends("a 'b;", False) == ([], True)
+        assert chunk_ends("c;' d; e", True) == ([6], False)
+        assert chunk_ends("x; y", True) == ([], True)
+
+
+class TestStatementSpans:
+    def test_it_works_on_bytes(self):
+        text = "select ';'; select 2".encode()
+        assert list(statement_spans(text, b';', b"'")) == [(0, 11), (11, 20)]
+
+    def test_trailing_whitespace_is_not_a_statement(self):
+        assert list(statement_spans('select 1;  \n')) == [(0, 9)]
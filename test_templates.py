@@ -0,0 +1,80 @@
+import pytest
+from pyparsing import ParseException
+
+import run
+from corpus import generate_corpus
+from statements import split_text
+from templates import TemplateParser, main, normalize
+
+
+class TestNormalize:
+    def test_it_replaces_numbers_and_strings(self):
+        template, literals = normalize("select 12, 'a b', 1.5 from t;")
+        assert template == "select 0, '', 0.0 from t;"
+        assert literals == ['12', "'a b'", '1', '5']
+
+    def test_it_collapses_whitespace(self):
+        assert normalize('\n  select\ta,\n\n b from t;\n')[0] == (
+            'select a, b from t;'
+        )
+
+    def test_it_leaves_digits_in_words_alone(self):
+        assert normalize('select c1, x$2 from t_3;') == (
+            'select c1, x$2 from t_3;',
+            [],
+        )
+
+
+class TestTemplateParser:
+    def test_results_match_parse_sql(self):
+        parser = TemplateParser()
+        for _, text in split_text(generate_corpus(20, seed=1)):
+            assert parser.parse(text) == run.parse_sql(text).asList()
+
+    def test_statements_differing_in_literals_share_a_template(self):
+        parser = TemplateParser()
+        first = parser.parse("select a + 1, 'x' from t;")
+        second = parser.parse("select a + 22, 'yy' from t;")
+        assert first == ['select', [[['a', '+', '1']], ['x']], 'from', 't', ';']
+        assert second == ['select', [[['a', '+', '22']], ['yy']], 'from', 't', ';']
+        assert parser.stats() == {
+            'hits': 1,
+            'misses': 1,
+            'evictions': 0,
+            'templates': 1,
+            'hit_rate': 0.5,
+        }
+
+    def test_strings_get_the_grammars_escapes(self):
+        text = r"select 'a\tb', '' from t;"
+        assert TemplateParser().parse(text) == run.parse_sql(text).asList()
+
+    def test_errors_are_at_the_right_place(self):
+        parser = TemplateParser()
+        text = "select 'long string' 'another', 1 from t;"
+        with pytest.raises(ParseException) as expected:
+            run.parse_sql(text)
+        for _ in range(2):
+            with pytest.raises(ParseException) as error:
+                parser.parse(text)
+            assert error.value.loc == expected.value.loc == len("select 'long string' ")
+
+    def test_it_keeps_at_most_max_templates(self):
+        parser = TemplateParser(max_templates=2)
+        for column in ('a', 'b', 'c', 'a'):
+            parser.parse(f'select {column} from t;')
+        stats = parser.stats()
+        assert stats['templates'] == 2
+        assert stats['evictions'] == 2
+        assert stats['hits'] == 0
+
+
+class TestMain:
+    def test_it_reports_failures_and_the_hit_rate(self, tmp_path, capsys):
+        path = tmp_path / 'log.sql'
+        text = 'select 1;\nselect 2;\nselect from t;\n'
+        path.write_text(text)
+        assert main([str(path)]) == 1
+        output = capsys.readouterr().out
+        assert f'{path}: {text.index("from")}: ' in output
+        assert "'hit_rate': 0.333" in output